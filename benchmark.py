@@ -0,0 +1,440 @@
+"""Offline micro-benchmarks for the recognition pipeline (no camera, no server).
+
+Every building block runs on fixed inputs - frames from the bundled alphabet
+clips and seeded synthetic landmark arrays - so two runs on the same machine
+measure the code, not the scene:
+
+- landmarks.*  proto -> array conversion (server process_frame_for_prediction,
+               tester safe_extract_landmarks including MediaPipe)
+- hands.*      MediaPipe Hands.process at several resolutions
+- predict.*    model.predict per backend at batch sizes 1..256
+- smoothing.*  tester and server smooth_prediction, BatchTemporalSmoother over
+               many streams
+- ui.*         draw_ui_elements (steady and changing prediction)
+- jpeg.*       cv2.imdecode at several resolutions
+
+Each benchmark is timed timeit-style: calls are grouped so one sample lasts at
+least --min-sample-ms, and samples are collected until --min-time has passed.
+Per-call median / min / p95 / mean go to JSON; `compare` flags regressions.
+
+    python benchmark.py run --output bench_baseline.json
+    python benchmark.py run --filter predict --compare bench_baseline.json
+    python benchmark.py compare bench_baseline.json bench_current.json --threshold 0.1
+"""
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from model_registry import ModelRegistry
+from temporal_smoothing import BatchTemporalSmoother
+from warmup import DEFAULT_WARMUP_VIDEO, scheduler_batch_sizes
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOLUTIONS = ((320, 240), (640, 480), (1280, 720))
+BATCH_SIZES = scheduler_batch_sizes(256)  # 1, 2, 4, ..., 256
+BENCH_BACKENDS = ('keras', 'numpy', 'tflite', 'onnx')
+CLIP_FRAMES = range(20, 80)  # Part of A.mp4 where the hand is in view
+DEFAULT_THRESHOLD = 0.10
+
+
+class BenchmarkSuite:
+    """Collects (name, callable) pairs and times them."""
+
+    def __init__(self, min_time=1.0, min_sample_ms=5.0, min_samples=5, max_samples=200, name_filter=None):
+        self.min_time = min_time
+        self.min_sample = min_sample_ms / 1000
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.name_filter = name_filter
+        self.results = {}
+
+    def selected(self, name):
+        return not self.name_filter or any(fnmatch.fnmatch(name, f'*{pattern}*')
+                                           for pattern in self.name_filter.split(','))
+
+    def _calibrate(self, fn):
+        """Calls per sample so one sample lasts at least min_sample."""
+        number = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.min_sample or number >= 1 << 16:
+                return number
+            number *= 2
+
+    def bench(self, name, fn, **info):
+        """Time fn() (no arguments); fn is called a few times first as warm-up."""
+        if not self.selected(name):
+            return None
+        try:
+            for _ in range(3):
+                fn()
+            number = self._calibrate(fn)
+
+            samples = []
+            deadline = time.perf_counter() + self.min_time
+            while len(samples) < self.max_samples and (len(samples) < self.min_samples
+                                                       or time.perf_counter() < deadline):
+                started = time.perf_counter()
+                for _ in range(number):
+                    fn()
+                samples.append((time.perf_counter() - started) / number)
+        except Exception as e:
+            print(f"   ⚠️ {name}: skipped ({e})")
+            return None
+
+        per_call_us = np.asarray(samples) * 1e6
+        result = {
+            'median_us': round(float(np.median(per_call_us)), 3),
+            'min_us': round(float(per_call_us.min()), 3),
+            'p95_us': round(float(np.percentile(per_call_us, 95)), 3),
+            'mean_us': round(float(per_call_us.mean()), 3),
+            'stdev_us': round(float(per_call_us.std()), 3),
+            'samples': len(samples),
+            'calls_per_sample': number,
+            **info
+        }
+        self.results[name] = result
+        print(f"   {name:<48} {_format_us(result['median_us']):>10}  (min {_format_us(result['min_us'])}, "
+              f"p95 {_format_us(result['p95_us'])}, n={len(samples)}x{number})")
+        return result
+
+
+def _format_us(value):
+    if value >= 1000:
+        return f"{value / 1000:.2f} ms"
+    return f"{value:.1f} us"
+
+
+def _cycle(items):
+    """Zero-argument callable returning the next item, round-robin."""
+    state = {'index': 0}
+
+    def next_item():
+        item = items[state['index'] % len(items)]
+        state['index'] += 1
+        return item
+    return next_item
+
+
+def load_clip_frames(video_path=DEFAULT_WARMUP_VIDEO, frame_indices=CLIP_FRAMES):
+    frames = []
+    cap = cv2.VideoCapture(video_path)
+    try:
+        index = 0
+        while index <= frame_indices[-1]:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if index in frame_indices:
+                frames.append(frame)
+            index += 1
+    finally:
+        cap.release()
+    if not frames:
+        raise RuntimeError(f"No frames could be read from {video_path}")
+    return frames
+
+
+def synthetic_landmarks(count, seed=0):
+    """Hand-like landmark rows: 21 points scattered around a random centre, z small."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(0.3, 0.7, (count, 1, 2))
+    xy = centres + rng.normal(0, 0.08, (count, 21, 2))
+    z = rng.normal(0, 0.03, (count, 21, 1))
+    return np.concatenate([xy, z], axis=2).reshape(count, 63).astype(np.float32)
+
+
+def resized(frames, size):
+    return [cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR) for frame in frames]
+
+
+# ----- Benchmark groups -----
+
+def bench_landmarks(suite, tester, server, frames):
+    hands = tester.mp_hands.Hands(static_image_mode=True, max_num_hands=1, model_complexity=0,
+                                  min_detection_confidence=0.5)
+    try:
+        protos = []
+        for frame in frames[::6]:
+            results = hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+            if results.multi_hand_landmarks:
+                protos.append(results.multi_hand_landmarks[0])
+    finally:
+        hands.close()
+
+    if server is not None and protos:
+        next_proto = _cycle(protos)
+        suite.bench('landmarks.process_frame_for_prediction',
+                    lambda: server.process_frame_for_prediction(next_proto()), inputs=len(protos))
+
+    for size in ((640, 480),):
+        next_frame = _cycle(resized(frames, size))
+        suite.bench(f'landmarks.safe_extract_landmarks[{size[0]}x{size[1]}]',
+                    lambda: tester.safe_extract_landmarks(next_frame().copy()), inputs=len(frames))
+
+
+def bench_hands(suite, tester, frames):
+    for size in RESOLUTIONS:
+        name = f'hands.process[{size[0]}x{size[1]}]'
+        if not suite.selected(name):
+            continue
+        hands = tester.mp_hands.Hands(static_image_mode=False, max_num_hands=1, model_complexity=0,
+                                      min_detection_confidence=tester.min_hand_detection_confidence,
+                                      min_tracking_confidence=tester.min_tracking_confidence)
+        try:
+            rgb_frames = [cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB) for frame in resized(frames, size)]
+            next_frame = _cycle(rgb_frames)
+            suite.bench(name, lambda: hands.process(next_frame()), inputs=len(rgb_frames))
+        finally:
+            hands.close()
+
+
+def bench_predict(suite, backends):
+    registry = ModelRegistry.locate()
+    rows = synthetic_landmarks(max(BATCH_SIZES))
+    for backend in backends:
+        if not any(suite.selected(f'predict.{backend}[b={size}]') for size in BATCH_SIZES):
+            continue
+        try:
+            model, record = registry.load(backend)
+        except Exception as e:
+            print(f"   ⚠️ predict.{backend}: skipped ({e})")
+            continue
+        for size in BATCH_SIZES:
+            batch = rows[:size]
+            suite.bench(f'predict.{backend}[b={size}]', lambda: model.predict(batch, verbose=0),
+                        batch_size=size, model=record['name'])
+
+
+def bench_smoothing(suite, tester, server):
+    rng = np.random.default_rng(0)
+    # Mostly-stable label stream with some flicker, like a held sign
+    labels = np.where(rng.random(1000) < 0.8, 1, rng.integers(0, 6, 1000))
+    confidences = rng.uniform(0.5, 1.0, 1000)
+    stream = _cycle(list(zip(labels.tolist(), confidences.tolist())))
+
+    def tester_step():
+        label, confidence = stream()
+        tester.smooth_prediction(label, confidence)
+    tester.smoother.reset()
+    suite.bench('smoothing.tester', tester_step)
+
+    if server is not None:
+        class_names = server.DEFAULT_CLASS_NAMES
+        def server_step():
+            label, confidence = stream()
+            server.smooth_prediction('benchmark', class_names, label, confidence)
+        suite.bench('smoothing.server', server_step)
+
+    # One frame for each of many concurrent streams per update
+    for streams in (16, 256):
+        smoother = BatchTemporalSmoother(streams, 6)
+        rows = np.arange(streams)
+        batches = _cycle([(np.roll(labels, shift)[:streams], np.roll(confidences, shift)[:streams])
+                          for shift in range(0, 1000, 37)])
+        def batch_step(smoother=smoother, rows=rows, batches=batches):
+            batch_labels, batch_confidences = batches()
+            smoother.update(rows, batch_labels, batch_confidences)
+        suite.bench(f'smoothing.batch[s={streams}]', batch_step, batch_size=streams)
+
+
+def bench_ui(suite, tester, frames):
+    frame = cv2.resize(frames[0], (640, 480))
+    canvas = frame.copy()
+
+    def draw():
+        np.copyto(canvas, frame)
+        tester.draw_ui_elements(canvas, 'hello', 0.93, True, 29.7)
+    suite.bench('ui.draw_ui_elements[640x480]', draw)
+
+    # A moving hand: the prediction text and confidence bar change on every frame
+    next_confidence = _cycle([0.75 + i * 0.002 for i in range(100)])
+    def draw_changing():
+        np.copyto(canvas, frame)
+        tester.draw_ui_elements(canvas, 'hello', next_confidence(), True, 29.7)
+    suite.bench('ui.draw_ui_elements[640x480,changing]', draw_changing)
+
+    suite.bench('ui.frame_copy[640x480]', lambda: np.copyto(canvas, frame))  # Baseline for the copy above
+
+
+def bench_jpeg(suite, frames):
+    for size in RESOLUTIONS:
+        encoded = [cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1]
+                   for frame in resized(frames[::10], size)]
+        next_buffer = _cycle(encoded)
+        suite.bench(f'jpeg.decode[{size[0]}x{size[1]}]', lambda: cv2.imdecode(next_buffer(), cv2.IMREAD_COLOR),
+                    bytes=int(np.mean([len(buffer) for buffer in encoded])))
+
+
+# ----- Environment, results and comparison -----
+
+def environment():
+    versions = {'numpy': np.__version__, 'opencv': cv2.__version__}
+    for module in ('mediapipe', 'tensorflow'):
+        if module in sys.modules:
+            versions[module] = getattr(sys.modules[module], '__version__', 'unknown')
+
+    commit = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        pass
+
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'versions': versions,
+        'commit': commit
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Benchmarks whose median got slower than baseline * (1 + threshold).
+
+    A slowdown only counts when even the fastest current sample is slower than
+    the baseline median, so noisy single samples do not flag regressions.
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name], current[name]
+        ratio = after['median_us'] / before['median_us'] if before['median_us'] else float('inf')
+        if ratio > 1 + threshold and after['min_us'] > before['median_us']:
+            verdict = 'regression'
+        elif ratio < 1 / (1 + threshold) and after['median_us'] < before['min_us']:
+            verdict = 'improvement'
+        else:
+            verdict = 'unchanged'
+        rows.append({'name': name, 'baseline_us': before['median_us'], 'current_us': after['median_us'],
+                     'ratio': round(ratio, 3), 'verdict': verdict})
+    return rows
+
+
+def print_comparison(rows, baseline_only=(), current_only=()):
+    icons = {'regression': '🔴', 'improvement': '🟢', 'unchanged': '⚪'}
+    print(f"\n📊 {'benchmark':<48} {'baseline':>10} {'current':>10}  ratio")
+    for row in rows:
+        print(f"{icons[row['verdict']]} {row['name']:<48} {_format_us(row['baseline_us']):>10} "
+              f"{_format_us(row['current_us']):>10}  {row['ratio']:.2f}x")
+    for name in baseline_only:
+        print(f"   {name}: only in baseline")
+    for name in current_only:
+        print(f"   {name}: new")
+
+    regressions = [row for row in rows if row['verdict'] == 'regression']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s)")
+    else:
+        print("\n✅ No regressions")
+    return regressions
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_files(baseline_path, current, threshold):
+    baseline = load_results(baseline_path)
+    if baseline.get('environment', {}).get('platform') != current.get('environment', {}).get('platform'):
+        print("⚠️ Baseline was recorded on a different platform - timings are not directly comparable")
+    rows = compare_results(baseline['benchmarks'], current['benchmarks'], threshold)
+    return print_comparison(rows,
+                            sorted(set(baseline['benchmarks']) - set(current['benchmarks'])),
+                            sorted(set(current['benchmarks']) - set(baseline['benchmarks'])))
+
+
+def run(args):
+    if not args.verbose:
+        logging.disable(logging.INFO)  # The tester and server log every model / MediaPipe step
+
+    from real_time_tester import UltraRobustASLTester
+
+    server = None
+    if not args.no_server:
+        sys.path.insert(0, os.path.join(PROJECT_DIR, 'website'))
+        try:
+            import app as server
+        except Exception as e:
+            print(f"⚠️ Server module unavailable, skipping server benchmarks: {e}")
+
+    print("🔄 Loading MediaPipe, the model and the sample clip...")
+    tester = UltraRobustASLTester(backend=args.backend, camera=False, warmup=False)
+    frames = load_clip_frames(args.video)
+
+    suite = BenchmarkSuite(min_time=args.min_time, min_sample_ms=args.min_sample_ms, name_filter=args.filter)
+    print(f"⏱️ Running benchmarks ({len(frames)} clip frames, min {args.min_time}s each)\n")
+
+    bench_landmarks(suite, tester, server, frames)
+    bench_hands(suite, tester, frames)
+    bench_predict(suite, args.backends.split(','))
+    bench_smoothing(suite, tester, server)
+    bench_ui(suite, tester, frames)
+    bench_jpeg(suite, frames)
+    tester.cleanup()
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'config': {'min_time_s': args.min_time, 'min_sample_ms': args.min_sample_ms,
+                   'tester_backend': tester.backend, 'video': args.video},
+        'benchmarks': suite.results
+    }
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 {len(suite.results)} results saved to {output}")
+
+    if args.compare:
+        return 1 if compare_files(args.compare, report, args.threshold) else 0
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks for the ASL recognition pipeline")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the benchmarks and save JSON")
+    run_parser.add_argument('--output', help="Result path (default: benchmark_<timestamp>.json)")
+    run_parser.add_argument('--filter', help="Comma-separated name substrings / globs, e.g. predict,jpeg")
+    run_parser.add_argument('--backend', default=None, help="Tester backend (default: ASL_INFERENCE_BACKEND or keras)")
+    run_parser.add_argument('--backends', default=','.join(BENCH_BACKENDS), help="Backends for the predict.* benchmarks")
+    run_parser.add_argument('--video', default=DEFAULT_WARMUP_VIDEO)
+    run_parser.add_argument('--min-time', type=float, default=1.0, help="Seconds of samples per benchmark")
+    run_parser.add_argument('--min-sample-ms', type=float, default=5.0)
+    run_parser.add_argument('--no-server', action='store_true', help="Skip benchmarks that import website/app.py")
+    run_parser.add_argument('--compare', help="Baseline JSON to compare the new results against")
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    run_parser.add_argument('--verbose', action='store_true')
+
+    compare_parser = commands.add_parser('compare', help="Compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Relative slowdown that counts as a regression (0.1 = 10%%)")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run(args))
+
+    regressions = compare_files(args.baseline, load_results(args.current), args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Skip work on frames that cannot change the result.
+
+Two cheap checks sit in front of MediaPipe and the classifier:
+
+- Motion gate: while the last detection found no hand, a frame that barely differs
+  from the last frame MediaPipe saw (mean absolute difference of a 32x24 grey
+  thumbnail) skips hand detection entirely.
+- Landmark-delta gate: while a hand is held steady, landmarks that moved less
+  than a threshold since the last inference reuse that inference's prediction.
+
+Both compare against the last frame / landmarks that were actually processed, so
+slow drift still accumulates and eventually triggers a fresh run.
+"""
+import threading
+import time
+
+import numpy as np
+
+# Mean absolute grey-level difference (0-255) below which a no-hand frame is skipped
+DEFAULT_MOTION_THRESHOLD = 2.5
+# Largest per-landmark x/y movement (normalized) that still reuses the last prediction
+DEFAULT_LANDMARK_THRESHOLD = 0.008
+# Force a real detection / inference at least this often
+DEFAULT_MAX_SKIPPED_FRAMES = 15
+DEFAULT_MAX_REUSED_PREDICTIONS = 30
+
+THUMBNAIL_SIZE = (32, 24)
+
+
+class FrameGate:
+    """Gating state for one video stream (one camera, one browser session)."""
+
+    def __init__(self, motion_threshold=DEFAULT_MOTION_THRESHOLD, landmark_threshold=DEFAULT_LANDMARK_THRESHOLD,
+                 max_skipped_frames=DEFAULT_MAX_SKIPPED_FRAMES, max_reused_predictions=DEFAULT_MAX_REUSED_PREDICTIONS):
+        self.motion_threshold = motion_threshold
+        self.landmark_threshold = landmark_threshold
+        self.max_skipped_frames = max_skipped_frames
+        self.max_reused_predictions = max_reused_predictions
+
+        self._lock = threading.Lock()
+        self._reference_thumbnail = None
+        self._hand_in_reference = True  # Unknown until the first detection runs
+        self._skipped_frames = 0
+        self._reference_landmarks = None
+        self._reference_prediction = None
+        self._reused_predictions = 0
+        self.last_used = time.time()
+
+        self.stats = {
+            'frames_gated': 0,
+            'detection_skips': 0,
+            'predictions_checked': 0,
+            'prediction_reuses': 0
+        }
+
+    @staticmethod
+    def _thumbnail(frame):
+        import cv2  # Deferred: the server imports this module before it needs OpenCV
+        small = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def should_detect(self, frame):
+        """False if hand detection can be skipped for this frame (static scene, no hand)."""
+        thumbnail = self._thumbnail(frame)
+        with self._lock:
+            self.last_used = time.time()
+            self.stats['frames_gated'] += 1
+
+            if (not self._hand_in_reference and self._reference_thumbnail is not None
+                    and self._skipped_frames < self.max_skipped_frames
+                    and float(np.mean(np.abs(thumbnail - self._reference_thumbnail))) < self.motion_threshold):
+                self._skipped_frames += 1
+                self.stats['detection_skips'] += 1
+                return False
+
+            self._reference_thumbnail = thumbnail
+            self._skipped_frames = 0
+            return True
+
+    def record_detection(self, hand_detected):
+        """Report whether the detection that should_detect allowed found a hand."""
+        with self._lock:
+            self._hand_in_reference = bool(hand_detected)
+            if not hand_detected:
+                self._reference_landmarks = None
+                self._reference_prediction = None
+
+    def reused_prediction(self, landmarks):
+        """The last prediction if the hand has barely moved since it was made, else None."""
+        vector = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+        with self._lock:
+            self.last_used = time.time()
+            self.stats['predictions_checked'] += 1
+            reference = self._reference_landmarks
+            if (reference is None or reference.shape != vector.shape
+                    or self._reused_predictions >= self.max_reused_predictions):
+                return None
+
+            # x and y only: z is noisy and does not change the sign
+            movement = np.abs(vector - reference).reshape(-1, 3)[:, :2].max()
+            if movement >= self.landmark_threshold:
+                return None
+
+            self._reused_predictions += 1
+            self.stats['prediction_reuses'] += 1
+            return self._reference_prediction
+
+    def remember_prediction(self, landmarks, prediction):
+        """Store the result of a real inference as the new reference."""
+        with self._lock:
+            self._reference_landmarks = np.array(landmarks, dtype=np.float32).reshape(-1)
+            self._reference_prediction = prediction
+            self._reused_predictions = 0
+
+    def reset(self):
+        with self._lock:
+            self._reference_thumbnail = None
+            self._hand_in_reference = True
+            self._reference_landmarks = None
+            self._reference_prediction = None
+
+
+class SessionFrameGates:
+    """One FrameGate per session id, dropped after idle_timeout seconds."""
+
+    def __init__(self, gate_factory=FrameGate, idle_timeout=60.0):
+        self.gate_factory = gate_factory
+        self.idle_timeout = idle_timeout
+        self._gates = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            gate = self._gates.get(session_id)
+            if gate is None:
+                gate = self._gates[session_id] = self.gate_factory()
+            return gate
+
+    def discard(self, session_id):
+        with self._lock:
+            self._gates.pop(session_id, None)
+
+    def evict_idle(self):
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = [session_id for session_id, gate in self._gates.items() if gate.last_used < cutoff]
+            for session_id in idle:
+                del self._gates[session_id]
+        return len(idle)
+
+    def clear(self):
+        with self._lock:
+            self._gates.clear()
+
+    def __len__(self):
+        return len(self._gates)
@@ -0,0 +1,192 @@
+"""Capture / inference / display pipeline with latest-frame dropping.
+
+The sequential tester loop pays camera I/O, MediaPipe, the classifier and
+drawing one after the other, so its frame rate is 1 / (sum of the stages).
+Here each stage runs on its own thread and hands work to the next through a
+LatestSlot: a single-item buffer where a new item replaces an unconsumed one.
+A slow stage therefore always works on the newest frame, stale frames are
+dropped (and counted) instead of queuing up, and the displayed frame rate
+tracks the slowest stage rather than the sum.
+
+    capture thread --LatestSlot--> inference thread --LatestSlot--> display (caller's thread)
+
+The display stage stays on the caller's thread because cv2.imshow / waitKey
+must run on the thread that owns the window.
+
+Sources that are not real time (a video file read as fast as possible) can
+use drop_stale=False: capture then waits for inference to take each frame, so
+every frame is recognized and the stages still overlap.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class LatestSlot:
+    """Single-slot buffer: put() overwrites, get() waits for an item newer than the last one taken."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._item = None
+        self._sequence = 0  # Sequence number of the stored item
+        self._taken = 0     # Sequence number of the last item handed out
+        self._closed = False
+        self.dropped = 0    # Items replaced before anyone took them
+
+    def put(self, item, block: bool = False):
+        """Store item; with block=True wait until the previous item was taken instead of dropping it."""
+        with self._condition:
+            if block:
+                self._condition.wait_for(lambda: self._closed or self._sequence == self._taken)
+            if self._sequence > self._taken:
+                self.dropped += 1
+            self._item = item
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None):
+        """Newest unseen item, or None on timeout / close."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._closed or self._sequence > self._taken, timeout):
+                return None
+            if self._sequence == self._taken:  # Closed with nothing new
+                return None
+            self._taken = self._sequence
+            self._condition.notify_all()  # Wake a blocked put()
+            return self._item
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class StageStats:
+    """Items processed and time spent by one stage (written by its own thread only)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.busy_seconds = 0.0
+        self.max_seconds = 0.0
+        self.started_at = time.perf_counter()
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.busy_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict:
+        elapsed = elapsed if elapsed is not None else time.perf_counter() - self.started_at
+        return {
+            'stage': self.name,
+            'frames': self.count,
+            'fps': round(self.count / elapsed, 2) if elapsed > 0 else 0.0,
+            'mean_ms': round(self.busy_seconds / self.count * 1000, 2) if self.count else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 2),
+            'utilization': round(self.busy_seconds / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+
+class FramePipeline:
+    """Runs capture and inference on background threads; the caller drives display.
+
+    capture() -> frame or None (None = no frame right now; the thread retries)
+    infer(frame) -> result passed to the display stage
+    The display loop calls next_result() and reports each shown frame with
+    record_display(seconds).
+    """
+
+    def __init__(self, capture: Callable[[], Optional[object]], infer: Callable[[object], object],
+                 idle_sleep: float = 0.005, drop_stale: bool = True):
+        self.capture = capture
+        self.infer = infer
+        self.idle_sleep = idle_sleep
+        self.drop_stale = drop_stale
+        self.frames = LatestSlot()
+        self.results = LatestSlot()
+        self.stats = {name: StageStats(name) for name in ('capture', 'inference', 'display')}
+        self.frame_latency = StageStats('capture_to_display')  # Age of a frame when it is shown
+        self.errors = {'capture': 0, 'inference': 0}
+        self._stop = threading.Event()
+        self._threads = []
+        self._started_at = None
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        for stats in list(self.stats.values()) + [self.frame_latency]:
+            stats.started_at = self._started_at
+        for name, target in (('capture', self._capture_loop), ('inference', self._inference_loop)):
+            thread = threading.Thread(target=target, name=f'pipeline-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set()
+
+    def _capture_loop(self):
+        stats = self.stats['capture']
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                frame = self.capture()
+            except Exception:
+                self.errors['capture'] += 1
+                frame = None
+            if frame is None:
+                time.sleep(self.idle_sleep)
+                continue
+            captured_at = time.perf_counter()
+            stats.record(captured_at - started)
+            self.frames.put((frame, captured_at), block=not self.drop_stale)
+
+    def _inference_loop(self):
+        stats = self.stats['inference']
+        while not self._stop.is_set():
+            item = self.frames.get(timeout=0.1)
+            if item is None:
+                continue
+            frame, captured_at = item
+            started = time.perf_counter()
+            try:
+                result = self.infer(frame)
+            except Exception:
+                self.errors['inference'] += 1
+                continue
+            stats.record(time.perf_counter() - started)
+            self.results.put((result, captured_at), block=not self.drop_stale)
+
+    def next_result(self, timeout: float = 0.1):
+        """(result, captured_at) of the newest inferred frame, or None."""
+        return self.results.get(timeout=timeout)
+
+    def record_display(self, seconds: float, captured_at: Optional[float] = None):
+        self.stats['display'].record(seconds)
+        if captured_at is not None:
+            self.frame_latency.record(time.perf_counter() - captured_at)
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self.frames.close()
+        self.results.close()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def report(self) -> Dict:
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'stages': [stats.summary(elapsed) for stats in self.stats.values()],
+            'capture_to_display': {key: value for key, value in self.frame_latency.summary(elapsed).items()
+                                   if key in ('frames', 'mean_ms', 'max_ms')},
+            'dropped_frames': self.frames.dropped,
+            'dropped_results': self.results.dropped,
+            'errors': dict(self.errors)
+        }
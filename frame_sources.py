@@ -0,0 +1,268 @@
+"""Pluggable frame sources for the real-time tester.
+
+Every source behaves like cv2.VideoCapture (isOpened / read / get / release),
+so the tester's capture code does not care where frames come from:
+
+- CameraSource          a camera index (the live default)
+- VideoFileSource       a video file
+- ImageDirectorySource  a directory of still images, sorted by name
+- LandmarkStreamSource  a recorded landmark stream (JSONL written by
+                        LandmarkRecorder); read() yields RecordedLandmarks
+                        instead of images, so MediaPipe is skipped
+
+File sources either play back as fast as possible (pace='fast', for
+benchmarks and regression runs) or at the source's own frame rate
+(pace='source', to reproduce what a camera would deliver). After a read,
+`timestamp` holds the frame's position in the stream in seconds.
+
+    source = open_source('website/assets/videos/alphabet/A.mp4', pace='source')
+    ret, frame = source.read()
+"""
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+LANDMARK_STREAM_EXTENSIONS = ('.jsonl', '.ndjson')
+PACING_MODES = ('fast', 'source')
+DEFAULT_IMAGE_FPS = 30.0
+DEFAULT_FRAME_SIZE = (640, 480)
+
+
+class RecordedLandmarks:
+    """One entry of a landmark stream: 63 floats (or None when no hand was seen)."""
+
+    __slots__ = ('landmarks', 'frame_size')
+
+    def __init__(self, landmarks, frame_size=DEFAULT_FRAME_SIZE):
+        self.landmarks = landmarks
+        self.frame_size = frame_size
+
+
+class FrameSource:
+    """Base class: subclasses implement _read() -> (ok, frame, timestamp_seconds)."""
+
+    live = False  # Frames arrive in real time (a camera): no pacing, reconnect on timeouts
+
+    def __init__(self, name, pace='fast', fps=None):
+        if pace not in PACING_MODES:
+            raise ValueError(f"Unknown pacing '{pace}' (expected one of {', '.join(PACING_MODES)})")
+        self.name = name
+        self.pace = pace
+        self.source_fps = fps
+        self.frames_read = 0
+        self.timestamp = 0.0
+        self.exhausted = False
+        self._playback_started = None
+
+    def isOpened(self):
+        return not self.exhausted
+
+    def read(self):
+        ok, frame, timestamp = self._read()
+        if not ok:
+            self.exhausted = True
+            return False, None
+
+        self.frames_read += 1
+        self.timestamp = timestamp
+        if self.pace == 'source' and not self.live:
+            # Release the frame when its timestamp is due, measured from the first frame
+            now = time.perf_counter()
+            if self._playback_started is None:
+                self._playback_started = now - timestamp
+            delay = self._playback_started + timestamp - now
+            if delay > 0:
+                time.sleep(delay)
+        return True, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.source_fps or 0.0)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frame_size[0])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frame_size[1])
+        return 0.0
+
+    @property
+    def frame_size(self):
+        return DEFAULT_FRAME_SIZE
+
+    def release(self):
+        self.exhausted = True
+
+    def describe(self):
+        return {'source': self.name, 'type': type(self).__name__, 'pace': self.pace,
+                'source_fps': self.source_fps, 'frames_read': self.frames_read}
+
+
+class CameraSource(FrameSource):
+    live = True
+
+    def __init__(self, index=0, width=640, height=480, fps=30):
+        super().__init__(f"camera:{index}", pace='fast', fps=fps)
+        self.index = index
+        self.cap = cv2.VideoCapture(index)
+        # Set camera properties for better compatibility
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer for real-time
+        self._opened_at = time.perf_counter()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        # A failed camera read is transient (the tester retries or reconnects), not the end of the stream
+        ret, frame = self.cap.read()
+        if ret:
+            self.frames_read += 1
+            self.timestamp = time.perf_counter() - self._opened_at
+        return ret, frame
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, pace='fast', loop=False):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file {path}")
+        super().__init__(path, pace, fps=self.cap.get(cv2.CAP_PROP_FPS) or None)
+        self.loop = loop
+        self._loop_offset = 0.0
+
+    def _read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.frames_read:
+            self._loop_offset = self.timestamp + 1.0 / (self.source_fps or DEFAULT_IMAGE_FPS)
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return False, None, 0.0
+        # Position from the frame index: CAP_PROP_POS_MSEC is unreliable for some containers
+        index = self.cap.get(cv2.CAP_PROP_POS_FRAMES) - 1
+        return True, frame, self._loop_offset + index / (self.source_fps or DEFAULT_IMAGE_FPS)
+
+    @property
+    def frame_size(self):
+        return (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path, pace='fast', fps=DEFAULT_IMAGE_FPS, loop=False):
+        super().__init__(path, pace, fps=fps)
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise IOError(f"No images ({', '.join(IMAGE_EXTENSIONS)}) in {path}")
+        self.loop = loop
+        self._index = 0
+        self._size = None
+
+    def _read(self):
+        unreadable = 0
+        while True:
+            # End of the list, or a whole pass without one readable image (looping would spin forever)
+            if self._index >= len(self.paths) and (not self.loop or unreadable >= len(self.paths)):
+                return False, None, 0.0
+            position = self._index
+            self._index += 1
+            frame = cv2.imread(self.paths[position % len(self.paths)])
+            if frame is not None:  # Skip unreadable files
+                self._size = (frame.shape[1], frame.shape[0])
+                return True, frame, position / self.source_fps
+            unreadable += 1
+
+    @property
+    def frame_size(self):
+        if self._size is None:
+            frame = cv2.imread(self.paths[0])
+            self._size = (frame.shape[1], frame.shape[0]) if frame is not None else DEFAULT_FRAME_SIZE
+        return self._size
+
+
+class LandmarkStreamSource(FrameSource):
+    """Replays {"t": seconds, "landmarks": [63 floats] | null} lines; frame_size comes from the header line."""
+
+    def __init__(self, path, pace='fast', loop=False):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        header = lines[0] if lines and lines[0].get('type') == 'header' else {}
+        self.entries = [line for line in lines if line.get('type') != 'header']
+        if not self.entries:
+            raise IOError(f"No landmark entries in {path}")
+        super().__init__(path, pace, fps=header.get('fps'))
+        self._frame_size = tuple(header.get('frame_size') or DEFAULT_FRAME_SIZE)
+        self.loop = loop
+        self._index = 0
+        self._loop_offset = 0.0
+
+    def _read(self):
+        if self._index >= len(self.entries):
+            if not self.loop:
+                return False, None, 0.0
+            self._loop_offset = self.timestamp + 1.0 / (self.source_fps or DEFAULT_IMAGE_FPS)
+            self._index = 0
+        entry = self.entries[self._index]
+        self._index += 1
+
+        landmarks = entry.get('landmarks')
+        if landmarks is not None:
+            landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+        return True, RecordedLandmarks(landmarks, self._frame_size), self._loop_offset + float(entry.get('t', 0.0))
+
+    @property
+    def frame_size(self):
+        return self._frame_size
+
+
+class LandmarkRecorder:
+    """Writes the landmark stream LandmarkStreamSource replays."""
+
+    def __init__(self, path, frame_size=DEFAULT_FRAME_SIZE, fps=None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({'type': 'header', 'frame_size': list(frame_size), 'fps': fps}) + '\n')
+        self.entries = 0
+
+    def record(self, timestamp, landmarks):
+        values = None if landmarks is None else [round(float(v), 6) for v in np.asarray(landmarks).reshape(-1)]
+        self._file.write(json.dumps({'t': round(float(timestamp), 4), 'landmarks': values}) + '\n')
+        self.entries += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def is_camera_spec(spec):
+    return spec is None or isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit())
+
+
+def open_source(spec, pace='fast', loop=False, image_fps=DEFAULT_IMAGE_FPS):
+    """FrameSource for a camera index, video file, image directory or landmark stream (.jsonl)."""
+    if is_camera_spec(spec):
+        return CameraSource(int(spec or 0))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, pace, fps=image_fps, loop=loop)
+    if not os.path.exists(spec):
+        raise IOError(f"Frame source not found: {spec}")
+    if spec.lower().endswith(LANDMARK_STREAM_EXTENSIONS):
+        return LandmarkStreamSource(spec, pace, loop=loop)
+    return VideoFileSource(spec, pace, loop=loop)
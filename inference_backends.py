@@ -0,0 +1,185 @@
+"""Pluggable runtimes for the landmark classifier.
+
+Every backend exposes the same small surface as a Keras model - predict(x, verbose=0),
+input_shape and output_shape - so website/app.py, real_time_tester.py and the
+inference scheduler can run any exported artifact unchanged:
+
+    keras        .h5             full TensorFlow / Keras
+    numpy        .npz            numpy_inference.NumpyMLP (no TensorFlow import)
+    tflite       .tflite         TFLite float32 (tflite_runtime or tf.lite)
+    tflite_int8  _int8.tflite    TFLite int8-quantized (opt-in, see below)
+    onnx         .onnx           onnxruntime
+
+Artifacts are produced by model_export.py. The float backends match Keras to
+about 1e-6. tflite_int8 outputs are not calibrated probabilities: its argmax
+mostly agrees with Keras, but confidences can be off by tenths, so
+confidence_threshold, the prediction cache and smoothing behave differently
+with it. No int8 artifacts are bundled; export one with real calibration
+landmarks if you need the smaller, faster model.
+"""
+import os
+import threading
+
+import numpy as np
+
+# Artifact suffix per backend; the int8 suffix must be checked before the float one
+BACKEND_EXTENSIONS = {
+    'keras': '.h5',
+    'numpy': '.npz',
+    'tflite': '.tflite',
+    'tflite_int8': '_int8.tflite',
+    'onnx': '.onnx'
+}
+
+
+def backend_for_path(model_path):
+    """Infer the backend name from an artifact file name."""
+    if model_path.endswith(BACKEND_EXTENSIONS['tflite_int8']):
+        return 'tflite_int8'
+    for backend, extension in BACKEND_EXTENSIONS.items():
+        if model_path.endswith(extension):
+            return backend
+    raise ValueError(f"Unknown model artifact type: {model_path}")
+
+
+def matches_backend(model_path, backend):
+    """True if model_path is an artifact for exactly this backend."""
+    try:
+        return backend_for_path(model_path) == backend
+    except ValueError:
+        return False
+
+
+class InferenceBackend:
+    """Common interface: predict(x) maps (n, features) to (n, classes) probabilities."""
+
+    name = 'base'
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.input_shape = None
+        self.output_shape = None
+
+    def predict(self, x, verbose=0):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.model_path!r})"
+
+
+class KerasBackend(InferenceBackend):
+    name = 'keras'
+
+    def __init__(self, model_path):
+        super().__init__(model_path)
+        import tensorflow as tf
+        self.model = tf.keras.models.load_model(model_path)
+        self.input_shape = self.model.input_shape
+        self.output_shape = self.model.output_shape
+
+    def predict(self, x, verbose=0):
+        return self.model.predict(np.asarray(x, dtype=np.float32).reshape(-1, self.input_shape[1]), verbose=verbose)
+
+
+class NumpyBackend(InferenceBackend):
+    name = 'numpy'
+
+    def __init__(self, model_path):
+        super().__init__(model_path)
+        from numpy_inference import NumpyMLP
+        self.model = NumpyMLP.load(model_path)
+        self.input_shape = self.model.input_shape
+        self.output_shape = self.model.output_shape
+
+    def predict(self, x, verbose=0):
+        return self.model.predict(x)
+
+
+class TFLiteBackend(InferenceBackend):
+    """TFLite interpreter; handles int8-quantized inputs/outputs transparently."""
+
+    name = 'tflite'
+
+    def __init__(self, model_path):
+        super().__init__(model_path)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+        self._lock = threading.Lock()  # Interpreters are not thread-safe
+
+        self.input_shape = (None, int(self._input['shape'][1]))
+        self.output_shape = (None, int(self._output['shape'][1]))
+        if model_path.endswith(BACKEND_EXTENSIONS['tflite_int8']):
+            self.name = 'tflite_int8'
+
+    def _resize(self, batch_size):
+        self.interpreter.resize_tensor_input(self._input['index'], [batch_size, self.input_shape[1]])
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = batch_size
+
+    def predict(self, x, verbose=0):
+        batch = np.asarray(x, dtype=np.float32).reshape(-1, self.input_shape[1])
+
+        with self._lock:
+            if batch.shape[0] != self._batch_size:
+                self._resize(batch.shape[0])
+
+            input_scale, input_zero_point = self._input['quantization']
+            if self._input['dtype'] != np.float32 and input_scale:
+                batch = np.round(batch / input_scale + input_zero_point).astype(self._input['dtype'])
+
+            self.interpreter.set_tensor(self._input['index'], batch)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self._output['index'])
+
+            output_scale, output_zero_point = self._output['quantization']
+            if self._output['dtype'] != np.float32 and output_scale:
+                output = (output.astype(np.float32) - output_zero_point) * output_scale
+
+        return np.asarray(output, dtype=np.float32)
+
+
+class OnnxBackend(InferenceBackend):
+    name = 'onnx'
+
+    def __init__(self, model_path):
+        super().__init__(model_path)
+        import onnxruntime as ort
+        self.session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self.input_shape = (None, int(model_input.shape[1]))
+        self.output_shape = (None, int(self.session.get_outputs()[0].shape[1]))
+
+    def predict(self, x, verbose=0):
+        batch = np.asarray(x, dtype=np.float32).reshape(-1, self.input_shape[1])
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+BACKENDS = {
+    'keras': KerasBackend,
+    'numpy': NumpyBackend,
+    'tflite': TFLiteBackend,
+    'tflite_int8': TFLiteBackend,
+    'onnx': OnnxBackend
+}
+
+
+def load_backend(model_path, backend=None):
+    """Load model_path with the named backend (inferred from the file name if omitted)."""
+    backend = (backend or backend_for_path(model_path)).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(model_path)
+    return BACKENDS[backend](model_path)
@@ -0,0 +1,145 @@
+"""Export a trained Keras model to lighter deployment runtimes.
+
+Produces, next to the .h5 file:
+    <name>.npz           NumPy backend (numpy_inference.py)
+    <name>.tflite        TFLite float32
+    <name>_int8.tflite   TFLite int8 (weights and activations, float32 I/O)
+    <name>.onnx          ONNX (needs tf2onnx)
+
+Any backend in inference_backends.py can then serve the artifacts.
+
+int8 is opt-in and needs real landmark rows to calibrate on (training passes
+X_train). Its argmax mostly agrees with Keras, but its probabilities can be
+far off (tenths, not millionths), so confidence thresholds, cached
+predictions and smoothed confidences are not comparable to the float
+backends.
+
+Usage:
+    python model_export.py models/final_asl_model_XXXX.h5 [--formats numpy tflite onnx]
+    python model_export.py models/final_asl_model_XXXX.h5 --formats tflite_int8 --calibration-data X_train.npy
+"""
+import argparse
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from inference_backends import BACKEND_EXTENSIONS, load_backend
+from numpy_inference import export_numpy_model
+
+EXPORT_FORMATS = ('numpy', 'tflite', 'tflite_int8', 'onnx')
+DEFAULT_EXPORT_FORMATS = ('numpy', 'tflite', 'onnx')  # Float outputs only; int8 needs calibration data
+
+
+def artifact_path(model_path, export_format):
+    """Path of the exported artifact for model_path in the given format."""
+    return os.path.splitext(model_path)[0] + BACKEND_EXTENSIONS[export_format]
+
+
+def synthetic_landmarks(samples=500, features=63, seed=0):
+    """Landmark-like vectors (x, y in [0, 1], small z) for parity checks (not int8 calibration)."""
+    rng = np.random.default_rng(seed)
+    data = rng.uniform(0.0, 1.0, size=(samples, features)).astype(np.float32)
+    data[:, 2::3] = rng.normal(0.0, 0.05, size=data[:, 2::3].shape)
+    return data
+
+
+def export_tflite(model, output_path, representative_data=None, quantize_int8=False):
+    """Convert to TFLite; int8 quantization calibrates on representative_data (real landmark rows)."""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if quantize_int8:
+        if representative_data is None:
+            raise ValueError("int8 export needs representative landmark rows to calibrate on")
+        calibration = np.asarray(representative_data, dtype=np.float32)
+
+        def representative_dataset():
+            for row in calibration[:500]:
+                yield [row.reshape(1, -1)]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+    return output_path
+
+
+def export_onnx(model, output_path, opset=13):
+    """Convert to ONNX with tf2onnx (optional dependency)."""
+    import tf2onnx
+
+    input_signature = [tf.TensorSpec((None, model.input_shape[1]), tf.float32, name='landmarks')]
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=opset, output_path=output_path)
+    return output_path
+
+
+def export_deployment_artifacts(model, model_path, representative_data=None, formats=DEFAULT_EXPORT_FORMATS):
+    """Write every requested artifact next to model_path.
+
+    A failing format (e.g. tf2onnx not installed) is reported and skipped so
+    training never fails because of an export step. Returns {format: path}.
+    """
+    exported = {}
+    for export_format in formats:
+        output_path = artifact_path(model_path, export_format)
+        try:
+            if export_format == 'numpy':
+                export_numpy_model(model, output_path)
+            elif export_format == 'tflite':
+                export_tflite(model, output_path)
+            elif export_format == 'tflite_int8':
+                export_tflite(model, output_path, representative_data, quantize_int8=True)
+            elif export_format == 'onnx':
+                export_onnx(model, output_path)
+            else:
+                raise ValueError(f"Unknown export format '{export_format}'")
+
+            exported[export_format] = output_path
+            print(f"💾 Exported {export_format}: {output_path}")
+        except Exception as e:
+            print(f"⚠️ Could not export {export_format}: {e}")
+
+    return exported
+
+
+def compare_with_keras(model, exported, inputs=None, samples=1000):
+    """Max output difference and argmax agreement of every artifact vs Keras.
+
+    inputs defaults to synthetic landmarks. Prints and returns
+    {format: (max_difference, agreement)}.
+    """
+    if inputs is None:
+        inputs = synthetic_landmarks(samples, model.input_shape[1], seed=1)
+    expected = model.predict(inputs, verbose=0)
+
+    results = {}
+    for export_format, path in exported.items():
+        actual = load_backend(path, export_format).predict(inputs)
+        max_difference = float(np.max(np.abs(expected - actual)))
+        agreement = float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1)))
+        print(f"🔍 {export_format:12} max |diff| {max_difference:.2e} | argmax agreement {agreement:.2%}")
+        results[export_format] = (max_difference, agreement)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a Keras ASL model to NumPy/TFLite/ONNX")
+    parser.add_argument('model_path', help="Trained Keras .h5 model")
+    parser.add_argument('--formats', nargs='+', choices=EXPORT_FORMATS, default=list(DEFAULT_EXPORT_FORMATS))
+    parser.add_argument('--calibration-data', help=".npy array of real landmark rows (required for tflite_int8)")
+    args = parser.parse_args()
+    if 'tflite_int8' in args.formats and not args.calibration_data:
+        parser.error("tflite_int8 needs --calibration-data (e.g. the training landmark rows)")
+
+    model = tf.keras.models.load_model(args.model_path)
+    representative_data = np.load(args.calibration_data) if args.calibration_data else None
+
+    exported = export_deployment_artifacts(model, args.model_path, representative_data, args.formats)
+    # Agreement on the calibration rows says more about int8 than synthetic inputs do
+    compare_with_keras(model, exported, representative_data[:1000] if representative_data is not None else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Model registry backed by models/manifest.json.
+
+Instead of walking the working tree for *.h5 files, loaders read one small
+manifest that lists every trained model and its exported artifacts:
+
+    {
+      "version": 1,
+      "active": "final_asl_model_20251026_144942",
+      "models": {
+        "final_asl_model_20251026_144942": {
+          "created": "2025-10-26T14:49:42",
+          "class_mapping": {"0": "bye", ...},
+          "artifacts": {
+            "keras": {"path": "final_asl_model_20251026_144942.h5", "format": "keras",
+                      "input_shape": [null, 63], "output_shape": [null, 6],
+                      "sha256": "...", "size_bytes": 123, "created": "..."},
+            "numpy": {...}, ...
+          }
+        }
+      }
+    }
+
+Artifact paths are relative to the manifest's directory. Resolving the active
+model for a backend is a dictionary lookup; loading checks the file's checksum
+and the model's shapes against the manifest.
+
+Usage:
+    python model_registry.py rebuild [--models-dir models]   # index the models directory
+    python model_registry.py show
+    python model_registry.py activate final_asl_model_XXXX
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+
+from inference_backends import BACKEND_EXTENSIONS, backend_for_path, load_backend
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# The models directory next to this file, whatever the caller's working directory
+DEFAULT_MODELS_DIRS = (os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'),)
+
+# Preferred model families when no model is marked active
+MODEL_NAME_PRIORITY = ('final_asl_model_', 'best_asl_model_', 'asl_model')
+
+
+class ModelRegistryError(RuntimeError):
+    """Raised when the manifest is missing, inconsistent or an artifact fails validation."""
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_name_for_path(path):
+    """Model name shared by all artifacts of one training run (file name minus artifact suffix)."""
+    filename = os.path.basename(path)
+    return filename[:-len(BACKEND_EXTENSIONS[backend_for_path(filename)])]
+
+
+def _created_from_name(model_name, fallback_path):
+    match = re.search(r'(\d{8}_\d{6})$', model_name)
+    if match:
+        return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').isoformat()
+    return datetime.fromtimestamp(os.path.getmtime(fallback_path)).isoformat(timespec='seconds')
+
+
+def _shape(shape):
+    return [None if dim is None else int(dim) for dim in shape]
+
+
+class ModelRegistry:
+    """Reads, validates and updates the manifest of one models directory."""
+
+    def __init__(self, models_dir='models'):
+        self.models_dir = models_dir
+        self.manifest_path = os.path.join(models_dir, MANIFEST_NAME)
+        self.manifest = {'version': MANIFEST_VERSION, 'active': None, 'models': {}}
+        if os.path.exists(self.manifest_path):
+            self.reload()
+
+    @classmethod
+    def locate(cls, candidates=DEFAULT_MODELS_DIRS):
+        """Registry for the first candidate directory holding a manifest (or any models directory)."""
+        existing = [path for path in candidates if os.path.isdir(path)]
+        for path in existing:
+            if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+                return cls(path)
+        if existing:
+            return cls(existing[0])
+        raise ModelRegistryError(f"No models directory found (looked in {', '.join(candidates)})")
+
+    @property
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def reload(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ModelRegistryError(f"Could not read {self.manifest_path}: {e}")
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ModelRegistryError(f"Unsupported manifest version {manifest.get('version')!r}")
+        self.manifest = manifest
+
+    def save(self):
+        """Write the manifest atomically."""
+        fd, temp_path = tempfile.mkstemp(dir=self.models_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=4)
+            f.write('\n')
+        os.replace(temp_path, self.manifest_path)
+
+    # ----- Queries -----
+
+    @property
+    def active_model(self):
+        return self.manifest.get('active')
+
+    def models(self):
+        return self.manifest['models']
+
+    def resolve(self, backend='keras', model_name=None):
+        """Manifest entry for one artifact: a dict with path (under models_dir), class_names and the recorded metadata."""
+        model_name = model_name or self.active_model
+        if not model_name:
+            raise ModelRegistryError(f"No active model in {self.manifest_path}")
+        entry = self.manifest['models'].get(model_name)
+        if entry is None:
+            raise ModelRegistryError(f"Model '{model_name}' is not in {self.manifest_path}")
+        artifact = entry['artifacts'].get(backend)
+        if artifact is None:
+            raise ModelRegistryError(
+                f"Model '{model_name}' has no {backend} artifact (available: {', '.join(entry['artifacts'])})"
+            )
+
+        class_mapping = entry.get('class_mapping') or {}
+        return {
+            **artifact,
+            'name': model_name,
+            'backend': backend,
+            'path': os.path.join(self.models_dir, artifact['path']),
+            'class_mapping': class_mapping,
+            'class_names': [class_mapping.get(str(i), f"Sign_{i}") for i in range(len(class_mapping))]
+        }
+
+    # ----- Validation and loading -----
+
+    @staticmethod
+    def validate_file(record, verify_checksum=True):
+        if not os.path.exists(record['path']):
+            raise ModelRegistryError(f"Artifact missing: {record['path']}")
+        if verify_checksum and record.get('sha256') and file_sha256(record['path']) != record['sha256']:
+            raise ModelRegistryError(f"Checksum mismatch for {record['path']} - rebuild the manifest")
+
+    @staticmethod
+    def validate_model(record, model):
+        for key in ('input_shape', 'output_shape'):
+            expected = record.get(key)
+            actual = _shape(getattr(model, key))
+            if expected and expected[1:] != actual[1:]:
+                raise ModelRegistryError(f"{record['path']}: {key} {actual} does not match manifest {expected}")
+        classes = len(record['class_names'])
+        if classes and record.get('output_shape') and record['output_shape'][-1] != classes:
+            raise ModelRegistryError(
+                f"{record['path']}: {record['output_shape'][-1]} outputs but {classes} classes in the mapping"
+            )
+
+    def load(self, backend='keras', model_name=None, verify_checksum=True):
+        """Resolve, validate and load one artifact; returns (model, record)."""
+        record = self.resolve(backend, model_name)
+        self.validate_file(record, verify_checksum)
+        model = load_backend(record['path'], backend)
+        self.validate_model(record, model)
+        return model, record
+
+    # ----- Updates -----
+
+    def register(self, artifact_path, class_mapping=None, model=None, activate=False):
+        """Add (or refresh) one artifact file; shapes come from model or from loading the file."""
+        backend = backend_for_path(artifact_path)
+        model_name = model_name_for_path(artifact_path)
+        if model is None:
+            model = load_backend(artifact_path, backend)
+
+        entry = self.manifest['models'].setdefault(model_name, {
+            'created': _created_from_name(model_name, artifact_path),
+            'class_mapping': {},
+            'artifacts': {}
+        })
+        if class_mapping is not None:
+            entry['class_mapping'] = {str(k): v for k, v in class_mapping.items()}
+
+        entry['artifacts'][backend] = {
+            'path': os.path.relpath(artifact_path, self.models_dir).replace(os.sep, '/'),
+            'format': backend,
+            'input_shape': _shape(model.input_shape),
+            'output_shape': _shape(model.output_shape),
+            'sha256': file_sha256(artifact_path),
+            'size_bytes': os.path.getsize(artifact_path),
+            'created': datetime.fromtimestamp(os.path.getmtime(artifact_path)).isoformat(timespec='seconds')
+        }
+
+        if activate or not self.active_model:
+            self.manifest['active'] = model_name
+        return entry
+
+    def set_active(self, model_name):
+        if model_name not in self.manifest['models']:
+            raise ModelRegistryError(f"Model '{model_name}' is not in {self.manifest_path}")
+        self.manifest['active'] = model_name
+
+    def rebuild(self, class_mapping=None):
+        """Index every artifact in the models directory (one listing, no recursion)."""
+        if class_mapping is None:
+            mapping_path = os.path.join(self.models_dir, 'class_mapping.json')
+            if os.path.exists(mapping_path):
+                with open(mapping_path, 'r', encoding='utf-8') as f:
+                    class_mapping = json.load(f)
+
+        active = self.active_model
+        self.manifest = {'version': MANIFEST_VERSION, 'active': None, 'models': {}}
+        for filename in sorted(os.listdir(self.models_dir)):
+            try:
+                backend_for_path(filename)
+            except ValueError:
+                continue
+            path = os.path.join(self.models_dir, filename)
+            try:
+                self.register(path, class_mapping)
+                print(f"📦 Registered {filename}")
+            except Exception as e:
+                print(f"⚠️ Skipping {filename}: {e}")
+
+        if active in self.manifest['models']:
+            self.manifest['active'] = active
+        else:
+            self.manifest['active'] = self._default_active()
+        return self.manifest
+
+    def _default_active(self):
+        names = sorted(self.manifest['models'], reverse=True)  # Newest timestamp first
+        for prefix in MODEL_NAME_PRIORITY:
+            for name in names:
+                if name.startswith(prefix):
+                    return name
+        return names[0] if names else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the models/manifest.json model registry")
+    parser.add_argument('command', choices=('rebuild', 'show', 'activate'))
+    parser.add_argument('model_name', nargs='?', help="Model to activate")
+    parser.add_argument('--models-dir', default='models')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.models_dir)
+
+    if args.command == 'rebuild':
+        registry.rebuild()
+        registry.save()
+        print(f"✅ {len(registry.models())} model(s) indexed in {registry.manifest_path}, active: {registry.active_model}")
+    elif args.command == 'activate':
+        if not args.model_name:
+            parser.error("activate needs a model name")
+        registry.set_active(args.model_name)
+        registry.save()
+        print(f"✅ Active model: {args.model_name}")
+    else:
+        print(f"📋 {registry.manifest_path} (active: {registry.active_model})")
+        for name, entry in registry.models().items():
+            marker = '*' if name == registry.active_model else ' '
+            print(f" {marker} {name}  [{', '.join(entry['artifacts'])}]  created {entry['created']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import gc
 # Import our custom modules
 from data_preprocessing import DataPreprocessor
 from model_architecture import AdvancedASLModel
+from model_export import EXPORT_FORMATS, export_deployment_artifacts
+from model_registry import ModelRegistry
 
 class AdvancedModelTrainer:
     def __init__(self):
@@ -162,11 +164,24 @@ class AdvancedModelTrainer:
         model.save(final_model_path)
         print(f"💾 Final model saved to: {final_model_path}")
         
+        # Export lighter runtimes (NumPy, TFLite float/int8, ONNX) next to the .h5;
+        # int8 is calibrated on the training landmarks
+        print("📦 Exporting deployment artifacts...")
+        exported = export_deployment_artifacts(model, final_model_path, representative_data=X_train,
+                                               formats=EXPORT_FORMATS)
+        
         # Save class labels
         class_mapping = {i: sign for i, sign in enumerate(self.preprocessor.signs)}
         with open('models/class_mapping.json', 'w') as f:
             json.dump(class_mapping, f, indent=4)
         
+        # Index the new artifacts in models/manifest.json and make them the active model
+        registry = ModelRegistry('models')
+        for artifact in [final_model_path, *exported.values()]:
+            registry.register(artifact, class_mapping, model=model, activate=True)
+        registry.save()
+        print(f"📋 Registered {registry.active_model} in {registry.manifest_path}")
+        
         return model, test_accuracy
     
     def plot_training_history(self):
@@ -0,0 +1,197 @@
+"""Pure-NumPy inference for the landmark classifier.
+
+The deployed models are small Dense/BatchNormalization/Dropout stacks
+(AdvancedASLModel.create_landmark_model, AdvancedModelTrainer.create_memory_efficient_model).
+Running one 63-float row through tf.keras costs milliseconds of framework
+overhead for microseconds of math, so this module:
+
+1. Exports a trained Keras model to a compact .npz file. Dropout is dropped
+   and every BatchNormalization is folded into the Dense layer that follows it.
+   In these models BN comes *after* the ReLU, so it becomes an affine map on
+   the next Dense layer's input.
+2. Loads that file into NumpyMLP, which has the same predict() call shape as a
+   Keras model, so callers can switch backends without other changes.
+
+Usage:
+    python numpy_inference.py models/final_asl_model_XXXX.h5 [--output out.npz] [--verify]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+SUPPORTED_ACTIVATIONS = ('linear', 'relu', 'softmax', 'sigmoid', 'tanh')
+
+
+def _activation_name(layer):
+    activation = getattr(layer, 'activation', None)
+    name = getattr(activation, '__name__', 'linear') if activation is not None else 'linear'
+    if name not in SUPPORTED_ACTIVATIONS:
+        raise ValueError(f"Unsupported activation '{name}' in layer {layer.name}")
+    return name
+
+
+def fold_keras_model(model):
+    """Convert a Keras Sequential MLP into a list of (weights, bias, activation) layers.
+
+    BatchNormalization y = x * scale + shift is folded into the next Dense layer:
+        W' = scale[:, None] * W,   b' = shift @ W + b
+    A trailing BatchNormalization with no Dense after it is kept as a diagonal
+    linear layer.
+    """
+    layers = []
+    pending_scale = None
+    pending_shift = None
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+
+        if kind in ('Dropout', 'InputLayer', 'Flatten', 'GaussianNoise'):
+            continue  # Identity at inference time
+
+        if kind == 'BatchNormalization':
+            gamma, beta, moving_mean, moving_variance = _batchnorm_parameters(layer)
+            scale = gamma / np.sqrt(moving_variance + layer.epsilon)
+            shift = beta - moving_mean * scale
+            if pending_scale is None:
+                pending_scale, pending_shift = scale, shift
+            else:
+                pending_shift = pending_shift * scale + shift
+                pending_scale = pending_scale * scale
+            continue
+
+        if kind == 'Dense':
+            weights, bias = layer.get_weights() if layer.use_bias else (layer.get_weights()[0], None)
+            if bias is None:
+                bias = np.zeros(weights.shape[1], dtype=weights.dtype)
+            if pending_scale is not None:
+                bias = pending_shift @ weights + bias
+                weights = pending_scale[:, None] * weights
+                pending_scale = pending_shift = None
+            layers.append((weights.astype(np.float32), bias.astype(np.float32), _activation_name(layer)))
+            continue
+
+        raise ValueError(f"Layer type '{kind}' ({layer.name}) is not supported by the NumPy backend")
+
+    if pending_scale is not None:
+        layers.append((np.diag(pending_scale).astype(np.float32), pending_shift.astype(np.float32), 'linear'))
+
+    if not layers:
+        raise ValueError("Model has no Dense layers to export")
+    return layers
+
+
+def _batchnorm_parameters(layer):
+    """Return gamma, beta, mean, variance even when center/scale are disabled."""
+    weights = list(layer.get_weights())
+    size = weights[-1].shape[0]
+    gamma = weights.pop(0) if layer.scale else np.ones(size, dtype=np.float32)
+    beta = weights.pop(0) if layer.center else np.zeros(size, dtype=np.float32)
+    moving_mean, moving_variance = weights
+    return gamma, beta, moving_mean, moving_variance
+
+
+def export_numpy_model(model, output_path):
+    """Fold a Keras model and write it as a compressed .npz weights file."""
+    layers = fold_keras_model(model)
+    arrays = {'layer_count': np.array(len(layers))}
+    for i, (weights, bias, activation) in enumerate(layers):
+        arrays[f'W{i}'] = weights
+        arrays[f'b{i}'] = bias
+        arrays[f'activation{i}'] = np.array(activation)
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    np.savez_compressed(output_path, **arrays)
+    return output_path
+
+
+def _softmax(x):
+    shifted = x - np.max(x, axis=1, keepdims=True)
+    np.exp(shifted, out=shifted)
+    shifted /= np.sum(shifted, axis=1, keepdims=True)
+    return shifted
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'softmax': _softmax,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'tanh': np.tanh
+}
+
+
+class NumpyMLP:
+    """Folded Dense stack evaluated with plain NumPy matrix products."""
+
+    def __init__(self, layers):
+        self.layers = [(np.ascontiguousarray(w, dtype=np.float32),
+                        np.ascontiguousarray(b, dtype=np.float32),
+                        _ACTIVATIONS[activation])
+                       for w, b, activation in layers]
+        self.input_shape = (None, self.layers[0][0].shape[0])
+        self.output_shape = (None, self.layers[-1][0].shape[1])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            count = int(data['layer_count'])
+            layers = [(data[f'W{i}'], data[f'b{i}'], str(data[f'activation{i}'])) for i in range(count)]
+        return cls(layers)
+
+    def predict(self, x, verbose=0):
+        """Same call shape as keras Model.predict: (n, features) -> (n, classes)."""
+        activations = np.asarray(x, dtype=np.float32).reshape(-1, self.input_shape[1])
+        for weights, bias, activation in self.layers:
+            activations = activation(activations @ weights + bias)
+        return activations
+
+    __call__ = predict
+
+
+def check_parity(keras_model, numpy_model, samples=2000, seed=0):
+    """Compare NumPy and Keras outputs on synthetic landmark vectors.
+
+    Inputs are drawn like MediaPipe output (x, y in [0, 1], small z). Returns
+    (max_abs_difference, argmax_agreement).
+    """
+    rng = np.random.default_rng(seed)
+    inputs = rng.uniform(0.0, 1.0, size=(samples, numpy_model.input_shape[1])).astype(np.float32)
+    inputs[:, 2::3] = rng.normal(0.0, 0.05, size=inputs[:, 2::3].shape)
+
+    expected = keras_model.predict(inputs, verbose=0)
+    actual = numpy_model.predict(inputs)
+    max_difference = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1)))
+    return max_difference, agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a Keras landmark model for the NumPy inference backend")
+    parser.add_argument('model_path', help="Trained Keras .h5 model")
+    parser.add_argument('--output', help="Output .npz path (default: next to the model)")
+    parser.add_argument('--verify', action='store_true', help="Check outputs against Keras after export")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    output_path = args.output or os.path.splitext(args.model_path)[0] + '.npz'
+    keras_model = tf.keras.models.load_model(args.model_path)
+    export_numpy_model(keras_model, output_path)
+    print(f"💾 NumPy weights saved to: {output_path}")
+
+    if args.verify:
+        max_difference, agreement = check_parity(keras_model, NumpyMLP.load(output_path))
+        print(f"🔍 Max |keras - numpy|: {max_difference:.2e}")
+        print(f"🎯 Argmax agreement: {agreement:.2%}")
+        if max_difference > 1e-4 or agreement < 1.0:
+            print("❌ Parity check failed")
+            sys.exit(1)
+        print("✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Bounded LRU cache of classifier outputs keyed on quantized landmark vectors.
+
+Users hold the same sign for many frames, so near-identical 63-float vectors
+reach the classifier over and over. MediaPipe landmarks are already normalized
+to the frame (x, y in [0, 1], z relative to the wrist). Snapping every
+coordinate to a grid of `precision` makes those vectors share one key, and a
+hit returns the stored probabilities without running the model.
+
+Keys carry a model version, so a prediction computed by a model that has since
+been replaced can never answer for its successor; callers should still clear()
+the cache when the model changes to free the stale entries.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_PRECISION = 0.005
+
+
+class PredictionCache:
+    """Thread-safe LRU map from quantized landmarks to a prediction array."""
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, precision=DEFAULT_CACHE_PRECISION):
+        self.max_size = max(0, int(max_size))
+        self.precision = float(precision)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'clears': 0
+        }
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def make_key(self, landmarks, model_version=0):
+        """Key for a landmark vector: (model_version, quantized bytes)."""
+        vector = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+        return model_version, np.round(vector / self.precision).astype(np.int32).tobytes()
+
+    def get(self, key):
+        """Stored prediction for key (marked most recently used) or None."""
+        with self._lock:
+            prediction = self._entries.get(key)
+            if prediction is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return prediction
+
+    def put(self, key, prediction):
+        if not self.enabled:
+            return
+        prediction = np.array(prediction, copy=True)
+        prediction.setflags(write=False)  # Shared between callers
+        with self._lock:
+            self._entries[key] = prediction
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after a model reload."""
+        with self._lock:
+            self._entries.clear()
+            self._stats['clears'] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'precision': self.precision,
+                **self._stats,
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0
+            }
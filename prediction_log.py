@@ -0,0 +1,51 @@
+"""Per-frame prediction output for headless tester runs (JSONL or CSV).
+
+The format follows the file extension (.csv -> CSV, anything else -> one
+JSON object per line). Rows are flushed in blocks so a long corpus run can
+be followed with `tail -f` without paying a flush per frame.
+"""
+import csv
+import json
+import os
+
+PREDICTION_FIELDS = (
+    'frame', 'timestamp', 'hand_detected', 'prediction', 'confidence',
+    'raw_prediction', 'raw_confidence', 'landmarks_ms', 'predict_ms', 'smoothing_ms', 'total_ms'
+)
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+
+def output_format_for_path(path):
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+class PredictionLogWriter:
+    def __init__(self, path, output_format=None, fields=PREDICTION_FIELDS, flush_every=100):
+        self.path = path
+        self.format = output_format or output_format_for_path(path)
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{self.format}' (expected one of {', '.join(OUTPUT_FORMATS)})")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.fields = list(fields)
+        self.flush_every = flush_every
+        self.rows = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._csv = None
+        if self.format == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps({field: row.get(field) for field in self.fields}) + '\n')
+        self.rows += 1
+        if self.rows % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
@@ -1,14 +1,27 @@
+import argparse
 import cv2
 import numpy as np
-import tensorflow as tf
 import mediapipe as mp
 import json
 import os
 import time
 import sys
-from collections import deque
+import threading
 import logging
 
+from inference_backends import BACKEND_EXTENSIONS, load_backend, matches_backend
+from model_registry import ModelRegistry
+from roi_tracking import RoiHandTracker
+from frame_gating import FrameGate
+from frame_pipeline import FramePipeline, StageStats
+from frame_sources import (PACING_MODES, CameraSource, LandmarkRecorder, RecordedLandmarks,
+                           is_camera_spec, open_source)
+from prediction_cache import PredictionCache
+from prediction_log import PredictionLogWriter
+from temporal_smoothing import DEFAULT_DECAY, DEFAULT_WINDOW, SMOOTHING_METHODS, TemporalSmoother
+from ui_overlay import UIOverlay
+from warmup import DEFAULT_FRAME_SIZE, warm_up_classifier, warm_up_hands, warmup_frames
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,15 +34,48 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class UltraRobustASLTester:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, backend=None, roi_tracking=True, frame_gating=True, warmup=True,
+                 camera=True, pipelined=None, source=None, pace='fast', loop=False, record_landmarks=None,
+                 headless=False, output=None, max_frames=None, smoothing='vote', smoothing_window=DEFAULT_WINDOW,
+                 smoothing_decay=DEFAULT_DECAY):
+        self.backend = (backend or os.getenv('ASL_INFERENCE_BACKEND', 'keras')).lower()
+        self.roi_tracking = roi_tracking  # Track on a crop around the last hand position
+        # Skip detection on static no-hand frames, reuse predictions for a steady hand
+        self.frame_gate = FrameGate() if frame_gating else None
+        # Predictions keyed on quantized landmarks (cleared when a model is loaded)
+        self.prediction_cache = PredictionCache()
+        self.warmup = warmup  # Run the classifier and MediaPipe once before the first frame
+        self.use_camera = camera  # False: MediaPipe and the model only (benchmarks, offline runs)
+        # Camera index (None = first working camera), video file, image directory or landmark stream
+        self.source_spec = source
+        self.pace = pace  # File sources: 'fast' or 'source' (the source's own frame rate)
+        self.loop_source = loop
+        self.record_landmarks = record_landmarks  # Path of a landmark stream to write while running
+        self.recorder = None
+        # No windows and no drawing: per-frame results go to output (JSONL / CSV) instead
+        self.headless = headless
+        self.output_path = output
+        self.max_frames = max_frames
+        # Capture, inference and display on separate threads, dropping stale frames
+        if pipelined is None:
+            pipelined = os.getenv('ASL_TESTER_PIPELINED', '0').lower() in ('1', 'true', 'yes')
+        self.pipelined = pipelined
+        self.camera_lock = threading.Lock()  # The capture thread and camera restarts share self.cap
+        self.camera_failed = False
+        self.debug_mode = False
+        self.ui_overlay = UIOverlay()  # Static UI rendered once per frame size, dynamic parts on change
+        self.draw_stats = StageStats('ui_draw')  # Per-frame UI drawing time while debug mode is on
         self.model = None
         self.class_mapping = None
         self.hands = None
         self.cap = None
         self.is_running = False
         
-        # Prediction smoothing
-        self.prediction_history = deque(maxlen=15)
+        # Prediction smoothing: majority vote over the last frames, or an average of the probabilities
+        self.smoothing = smoothing
+        self.smoothing_window = smoothing_window
+        self.smoothing_decay = smoothing_decay
+        self.smoother = None  # Built once the model's class count is known
         self.confidence_threshold = 0.7
         self.min_hand_detection_confidence = 0.6
         self.min_tracking_confidence = 0.5
@@ -43,6 +89,8 @@ class UltraRobustASLTester:
         # Performance tracking
         self.frame_count = 0
         self.start_time = time.time()
+        self.stage_stats = {}  # Per-stage timings of the current run
+        self.run_report = None
         
         # Emergency mode
         self.emergency_mode = False
@@ -59,11 +107,23 @@ class UltraRobustASLTester:
         
         # 2. Load model with multiple fallback options
         self.load_model_with_fallbacks(model_path)
+        self.smoother = TemporalSmoother(
+            len(self.class_mapping) if self.class_mapping else 6,
+            window=self.smoothing_window,
+            decay=self.smoothing_decay,
+            method=self.smoothing,
+            min_history=3  # Fewer votes: pass predictions through for a fast response
+        )
         
         # 3. Initialize camera with multiple attempts
-        if not self.initialize_camera_with_retry():
-            logger.warning("⚠️ Camera initialization failed, entering emergency mode...")
-            self.emergency_mode = True
+        if self.use_camera and not self.initialize_camera_with_retry():
+            if is_camera_spec(self.source_spec):
+                logger.warning("⚠️ Camera initialization failed, entering emergency mode...")
+                self.emergency_mode = True
+        
+        # 4. Warm up so the first real frame runs at steady-state speed
+        if self.warmup:
+            self.warm_up()
         
         logger.info("✅ All components initialized successfully!")
     
@@ -82,13 +142,16 @@ class UltraRobustASLTester:
                 self.mp_drawing = mp.solutions.drawing_utils
                 self.mp_drawing_styles = mp.solutions.drawing_styles
                 
-                self.hands = self.mp_hands.Hands(
-                    static_image_mode=False,
-                    max_num_hands=1,
-                    model_complexity=0,  # Reduced complexity for stability
-                    min_detection_confidence=self.min_hand_detection_confidence,
-                    min_tracking_confidence=self.min_tracking_confidence
-                )
+                def create_hands():
+                    return self.mp_hands.Hands(
+                        static_image_mode=False,
+                        max_num_hands=1,
+                        model_complexity=0,  # Reduced complexity for stability
+                        min_detection_confidence=self.min_hand_detection_confidence,
+                        min_tracking_confidence=self.min_tracking_confidence
+                    )
+                
+                self.hands = RoiHandTracker(create_hands) if self.roi_tracking else create_hands()
                 
                 # Test MediaPipe with a dummy frame
                 test_frame = np.zeros((100, 100, 3), dtype=np.uint8)
@@ -107,6 +170,10 @@ class UltraRobustASLTester:
     
     def load_model_with_fallbacks(self, model_path):
         """Load model with multiple fallback strategies"""
+        # The manifest names the active model directly; file patterns are the fallback
+        if not model_path and self.load_registered_model():
+            return True
+        
         model_candidates = []
         
         # Collect all possible model candidates
@@ -121,17 +188,20 @@ class UltraRobustASLTester:
             'model_*.h5',
             '*.h5'  # Any .h5 file as last resort
         ]
+        model_extension = BACKEND_EXTENSIONS.get(self.backend, '.h5')
+        model_patterns = [pattern.replace('.h5', model_extension) for pattern in model_patterns]
         
         for pattern in model_patterns:
             for file in self.find_files('models', pattern):
-                if file not in model_candidates:
+                if file not in model_candidates and matches_backend(file, self.backend):
                     model_candidates.append(file)
         
         # Try to load each candidate
         for model_candidate in model_candidates:
             try:
                 logger.info(f"🔄 Attempting to load model: {model_candidate}")
-                self.model = tf.keras.models.load_model(model_candidate)
+                self.model = load_backend(model_candidate)  # Backend inferred from the file type
+                self.prediction_cache.clear()  # Cached outputs belong to the previous model
                 
                 # Load class mapping
                 class_mapping_path = 'models/class_mapping.json'
@@ -143,7 +213,7 @@ class UltraRobustASLTester:
                     self.class_mapping = {str(i): f"Sign_{i}" for i in range(6)}
                     logger.warning("⚠️ Using default class mapping")
                 
-                logger.info(f"✅ Model loaded successfully: {model_candidate}")
+                logger.info(f"✅ Model loaded successfully: {model_candidate} (backend: {self.backend})")
                 logger.info(f"🎯 Available signs: {list(self.class_mapping.values())}")
                 return True
                 
@@ -154,28 +224,75 @@ class UltraRobustASLTester:
         logger.critical("💥 Could not load any model file!")
         return False
     
+    def load_registered_model(self):
+        """Load the active model of models/manifest.json for self.backend"""
+        try:
+            registry = ModelRegistry.locate()
+            if not registry.exists:
+                return False
+            self.model, record = registry.load(self.backend)
+        except Exception as e:
+            logger.warning(f"⚠️ Model registry unavailable, searching for model files: {e}")
+            return False
+        
+        self.prediction_cache.clear()  # Cached outputs belong to the previous model
+        self.class_mapping = record['class_mapping'] or {str(i): f"Sign_{i}" for i in range(6)}
+        logger.info(f"✅ Model loaded from registry: {record['name']} ({record['path']}, backend: {self.backend})")
+        logger.info(f"🎯 Available signs: {list(self.class_mapping.values())}")
+        return True
+    
+    def warm_up(self):
+        """Run the classifier and MediaPipe on synthetic input at the camera resolution"""
+        try:
+            if self.model:
+                result = warm_up_classifier(self.model)
+                logger.info(f"🔥 Classifier warmed up in {result['duration_ms']}ms")
+            
+            if self.hands:
+                frame_size = DEFAULT_FRAME_SIZE
+                if self.cap and self.cap.isOpened():
+                    width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                    height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                    if width > 0 and height > 0:
+                        frame_size = (width, height)
+                result = warm_up_hands(self.hands, warmup_frames(frame_size))
+                logger.info(f"🔥 MediaPipe warmed up at {frame_size[0]}x{frame_size[1]}: "
+                            f"first frame {result['first_frame_ms']}ms, last {result['last_frame_ms']}ms")
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up failed, continuing cold: {e}")
+    
     def find_files(self, directory, pattern):
         """Find files matching pattern in directory"""
         import glob
         return glob.glob(os.path.join(directory, pattern))
     
     def initialize_camera_with_retry(self):
-        """Initialize camera with multiple attempts and fallbacks"""
+        """Initialize camera with multiple attempts and fallbacks (or open the file source)"""
+        if not is_camera_spec(self.source_spec):
+            # Files do not come back by retrying: open once
+            try:
+                self.cap = open_source(self.source_spec, self.pace, self.loop_source)
+                logger.info(f"🎞️ Frame source: {self.cap.name} ({type(self.cap).__name__}, "
+                            f"{self.cap.source_fps or '?'} FPS, pace: {self.pace})")
+                return True
+            except Exception as e:
+                logger.critical(f"💥 Could not open frame source {self.source_spec}: {e}")
+                self.cap = None
+                return False
+        
         max_retries = 5
         camera_indices = [0, 1, 2, 3]  # Try multiple camera indices
+        if self.source_spec is not None:
+            # The requested camera first, the others as fallbacks
+            requested = int(self.source_spec)
+            camera_indices = [requested] + [i for i in camera_indices if i != requested]
         
         for camera_index in camera_indices:
             for attempt in range(max_retries):
                 try:
                     logger.info(f"📷 Attempting to initialize camera {camera_index} (Attempt {attempt + 1}/{max_retries})...")
                     
-                    self.cap = cv2.VideoCapture(camera_index)
-                    
-                    # Set camera properties for better compatibility
-                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                    self.cap.set(cv2.CAP_PROP_FPS, 30)
-                    self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer for real-time
+                    self.cap = CameraSource(camera_index, width=640, height=480, fps=30)
                     
                     # Test camera by reading a frame
                     ret, test_frame = self.cap.read()
@@ -238,6 +355,10 @@ class UltraRobustASLTester:
     
     def safe_capture_frame(self):
         """Safely capture frame with error recovery"""
+        if getattr(self.cap, 'exhausted', False):
+            self.is_running = False  # A video / image / landmark source reached its end
+            return None, False
+        
         if not self.cap or not self.cap.isOpened():
             logger.warning("🔄 Camera not available, attempting to reinitialize...")
             if self.initialize_camera_with_retry():
@@ -248,6 +369,11 @@ class UltraRobustASLTester:
         try:
             ret, frame = self.cap.read()
             
+            if not ret and getattr(self.cap, 'exhausted', False):
+                logger.info(f"🏁 End of {self.cap.name} after {self.cap.frames_read} frames")
+                self.is_running = False
+                return None, False
+            
             if not ret or frame is None:
                 self.consecutive_errors += 1
                 logger.warning(f"⚠️ Frame capture failed (Consecutive errors: {self.consecutive_errors})")
@@ -276,7 +402,7 @@ class UltraRobustASLTester:
             self.consecutive_errors += 1
             return None, False
     
-    def safe_extract_landmarks(self, frame):
+    def safe_extract_landmarks(self, frame, draw=True):
         """Safely extract landmarks with error handling"""
         if self.hands is None:
             return None, frame, False
@@ -293,13 +419,14 @@ class UltraRobustASLTester:
                 landmarks = []
                 for hand_landmarks in results.multi_hand_landmarks:
                     # Draw landmarks on frame for visual feedback
-                    self.mp_drawing.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                        self.mp_drawing_styles.get_default_hand_connections_style()
-                    )
+                    if draw:
+                        self.mp_drawing.draw_landmarks(
+                            frame,
+                            hand_landmarks,
+                            self.mp_hands.HAND_CONNECTIONS,
+                            self.mp_drawing_styles.get_default_hand_landmarks_style(),
+                            self.mp_drawing_styles.get_default_hand_connections_style()
+                        )
                     
                     # Extract landmark coordinates
                     for landmark in hand_landmarks.landmark:
@@ -314,55 +441,49 @@ class UltraRobustASLTester:
             return None, frame, False
     
     def safe_predict(self, landmarks):
-        """Safely make prediction with error handling"""
+        """Safely make prediction with error handling; (class, confidence, probability row)"""
         if self.model is None or landmarks is None:
-            return None, 0.0
+            return None, 0.0, None
         
         try:
             # Ensure landmarks are in correct shape
             if landmarks.shape[0] != 63:
                 logger.warning(f"⚠️ Unexpected landmarks shape: {landmarks.shape}")
-                return None, 0.0
+                return None, 0.0, None
             
-            # Make prediction
-            prediction = self.model.predict(landmarks.reshape(1, -1), verbose=0)
+            # Make prediction (cache hits skip the model entirely)
+            cache_key = self.prediction_cache.make_key(landmarks)
+            prediction = self.prediction_cache.get(cache_key)
+            if prediction is None:
+                prediction = self.model.predict(landmarks.reshape(1, -1), verbose=0)
+                self.prediction_cache.put(cache_key, prediction)
             predicted_class = np.argmax(prediction)
             confidence = np.max(prediction)
             
-            return predicted_class, float(confidence)
+            return predicted_class, float(confidence), prediction
             
         except Exception as e:
             logger.error(f"❌ Prediction error: {e}")
-            return None, 0.0
+            return None, 0.0, None
     
-    def smooth_prediction(self, current_pred, current_confidence):
-        """Apply smoothing to predictions using history"""
-        if current_pred is None:
-            # Return most recent valid prediction if available
-            if self.prediction_history:
-                last_pred, last_conf = self.prediction_history[-1]
-                return last_pred, last_conf * 0.9  # Decay confidence
-            return None, 0.0
-        
-        self.prediction_history.append((current_pred, current_confidence))
-        
-        if len(self.prediction_history) < 3:  # Reduced from 5 for faster response
-            return current_pred, current_confidence
+    def gated_predict(self, landmarks):
+        """safe_predict, reusing the last result while the hand has barely moved"""
+        if self.frame_gate is not None:
+            reused = self.frame_gate.reused_prediction(landmarks)
+            if reused is not None:
+                return reused
         
-        # Get the most common prediction from recent history
-        recent_predictions = list(self.prediction_history)[-5:]  # Last 5 predictions
-        predictions = [pred for pred, conf in recent_predictions]
-        
-        try:
-            most_common_pred = max(set(predictions), key=predictions.count)
-            
-            # Calculate weighted confidence for the most common prediction
-            relevant_confidences = [conf for pred, conf in recent_predictions if pred == most_common_pred]
-            avg_confidence = np.mean(relevant_confidences) if relevant_confidences else current_confidence
-            
-            return most_common_pred, avg_confidence
-        except:
-            return current_pred, current_confidence
+        predicted_class, confidence, probabilities = self.safe_predict(landmarks)
+        if self.frame_gate is not None and predicted_class is not None:
+            self.frame_gate.remember_prediction(landmarks, (predicted_class, confidence, probabilities))
+        return predicted_class, confidence, probabilities
+    
+    def smooth_prediction(self, current_pred, current_confidence, probabilities=None):
+        """Apply smoothing to predictions using the recent history (see temporal_smoothing)"""
+        if current_pred is None:
+            # Most recent valid prediction with its confidence decayed
+            return self.smoother.hold()
+        return self.smoother.update(int(current_pred), current_confidence, probabilities)
     
     def calculate_fps(self):
         """Calculate and return current FPS"""
@@ -375,83 +496,29 @@ class UltraRobustASLTester:
         return 0
     
     def draw_ui_elements(self, frame, sign_name, confidence, hand_detected, fps):
-        """Draw all UI elements on the frame"""
+        """Draw all UI elements on the frame from cached overlay layers (see ui_overlay)"""
         try:
-            # Draw hand detection status
-            status_color = (0, 255, 0) if hand_detected else (0, 0, 255)
-            status_text = "Hand Detected" if hand_detected else "Show Hand in Frame"
-            cv2.putText(frame, status_text, (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
-            
-            # Draw prediction if available
-            if sign_name and confidence >= self.confidence_threshold:
-                # Display prediction with confidence
-                text = f"{sign_name} ({confidence:.1%})"
-                color = (0, 255, 0)  # Green for high confidence
-                
-                # Add background for better text visibility
-                text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.2, 3)[0]
-                text_x, text_y = 10, 70
-                cv2.rectangle(frame, (text_x, text_y - text_size[1] - 10), 
-                             (text_x + text_size[0] + 10, text_y + 10), (0, 0, 0), -1)
-                
-                cv2.putText(frame, text, (text_x, text_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.2, color, 3)
-                
-                # Add confidence bar
-                bar_width = 300
-                bar_height = 20
-                bar_x, bar_y = 10, 100
-                filled_width = int(bar_width * confidence)
-                
-                cv2.rectangle(frame, (bar_x, bar_y), 
-                             (bar_x + bar_width, bar_y + bar_height), (50, 50, 50), -1)
-                cv2.rectangle(frame, (bar_x, bar_y), 
-                             (bar_x + filled_width, bar_y + bar_height), color, -1)
-                cv2.putText(frame, "Confidence", (bar_x, bar_y - 5), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            elif sign_name:
-                text = f"Low confidence: {confidence:.1%}"
-                cv2.putText(frame, text, (10, 70), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 165, 255), 2)  # Orange for medium confidence
-            
-            # Draw FPS
-            fps_text = f"FPS: {fps:.1f}"
-            cv2.putText(frame, fps_text, (frame.shape[1] - 120, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Draw instructions
-            instructions = [
-                "Press 'q' to quit",
-                "Press 'c' to clear history", 
-                "Press 'r' to restart camera",
-                "Press 'd' to toggle debug",
-                "Press 'e' for emergency mode"
-            ]
-            
-            for i, instruction in enumerate(instructions):
-                y_pos = frame.shape[0] - 30 - (i * 25)
-                cv2.putText(frame, instruction, (10, y_pos), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            
-            # Draw hand bounding box guide
-            height, width = frame.shape[:2]
-            center_x, center_y = width // 2, height // 2
-            box_size = 250
-            x1 = center_x - box_size // 2
-            y1 = center_y - box_size // 2
-            x2 = center_x + box_size // 2
-            y2 = center_y + box_size // 2
-            
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cv2.putText(frame, "Place hand here", (x1, y1-10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            
+            started = time.perf_counter()
+            self.ui_overlay.draw(frame, sign_name, confidence, hand_detected, fps, self.confidence_threshold)
+            if self.debug_mode:
+                draw_seconds = time.perf_counter() - started
+                self.draw_stats.record(draw_seconds)
+                self.draw_debug_info(frame, draw_seconds)
         except Exception as e:
             logger.error(f"❌ Error drawing UI: {e}")
     
+    def draw_debug_info(self, frame, draw_seconds):
+        """UI drawing time of this frame and since debug mode was turned on"""
+        stats = self.draw_stats.summary()
+        text = f"UI draw: {draw_seconds * 1000:.2f}ms (mean {stats['mean_ms']:.2f}, max {stats['max_ms']:.2f})"
+        cv2.putText(frame, text, (max(10, frame.shape[1] - 330), frame.shape[0] - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+    
     def run_test(self):
         """Main method to run the ASL detection"""
+        if self.emergency_mode and self.headless:
+            logger.critical("💥 No camera available for the headless run")
+            return
         if self.emergency_mode:
             logger.warning("🚨 Starting in emergency mode - basic camera only")
             self.run_emergency_mode()
@@ -459,6 +526,8 @@ class UltraRobustASLTester:
             
         if not self.cap or not self.model:
             logger.critical("💥 Cannot start - essential components missing")
+            if self.headless or not is_camera_spec(self.source_spec):
+                return  # Nothing a camera test could fix
             print("🔧 Attempting emergency mode...")
             self.emergency_camera_test()
             return
@@ -466,8 +535,40 @@ class UltraRobustASLTester:
         self.is_running = True
         self.frame_count = 0
         self.start_time = time.time()
+        self.stage_stats = {name: StageStats(name) for name in ('landmarks', 'predict', 'smoothing')}
+        if self.record_landmarks:
+            self.recorder = LandmarkRecorder(self.record_landmarks, self.cap_frame_size(),
+                                             fps=self.cap.get(cv2.CAP_PROP_FPS) or None)
+            logger.info(f"⏺️ Recording landmarks to {self.record_landmarks}")
         
         logger.info("🚀 Starting real-time ASL detection...")
+        if self.headless:
+            print(f"🖥️ Headless run: {self.cap.name} -> {self.output_path or '(no output file)'}")
+        else:
+            self.print_instructions()
+        
+        run_started = time.perf_counter()
+        if self.headless:
+            pipeline_report = self.run_headless()
+        elif self.pipelined:
+            pipeline_report = self.run_pipelined()
+        else:
+            pipeline_report = self.run_sequential()
+        self.log_run_report(pipeline_report, time.perf_counter() - run_started)
+        
+        if self.frame_gate is not None:
+            stats = self.frame_gate.stats
+            frames = max(1, stats['frames_gated'])
+            logger.info(f"⏭️ Detection skipped on {stats['detection_skips'] / frames:.1%} of frames, "
+                        f"predictions reused on {stats['prediction_reuses'] / frames:.1%}")
+        cache_stats = self.prediction_cache.stats()
+        logger.info(f"🗃️ Prediction cache: {cache_stats['hit_rate']:.1%} hit rate, "
+                    f"{cache_stats['size']} entries, {cache_stats['evictions']} evictions")
+        
+        self.cleanup()
+        logger.info("✅ Real-time testing completed!")
+    
+    def print_instructions(self):
         print("\n" + "="*50)
         print("🤟 ASL Real-Time Translator - Ultra Robust Version")
         print("="*50)
@@ -481,33 +582,166 @@ class UltraRobustASLTester:
         print("   - Press 'd' to toggle debug mode")
         print("   - Press 'e' for emergency camera test")
         print("="*50 + "\n")
+    
+    def cap_frame_size(self):
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if self.cap else 0
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if self.cap else 0
+        return (width, height) if width > 0 and height > 0 else DEFAULT_FRAME_SIZE
+    
+    def record_stage(self, name, started):
+        """Add the time since started (perf_counter) to a stage of the current run; returns now"""
+        now = time.perf_counter()
+        stats = self.stage_stats.get(name)
+        if stats is not None:
+            stats.record(now - started)
+        return now
+    
+    def landmark_canvas(self, recorded):
+        """Black frame with the recorded landmark points, for replayed landmark streams"""
+        width, height = recorded.frame_size
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        if recorded.landmarks is not None:
+            for x, y, _ in recorded.landmarks.reshape(-1, 3):
+                cv2.circle(canvas, (int(x * width), int(y * height)), 4, (0, 255, 0), -1)
+        return canvas
+    
+    def process_frame(self, frame, timestamp=None, details=None):
+        """Landmarks, prediction and smoothing for one captured frame.
+        
+        Returns (processed_frame, sign_name, confidence, hand_detected); processed_frame is mirrored
+        and carries the landmark drawing (headless: no drawing, None for landmark streams).
+        If details is a dict it receives the raw prediction and per-stage milliseconds.
+        """
+        started = frame_started = time.perf_counter()
+        if isinstance(frame, RecordedLandmarks):
+            # Replayed landmark stream: MediaPipe already ran when it was recorded
+            landmarks = frame.landmarks
+            hand_detected = landmarks is not None and landmarks.shape[0] == 63
+            processed_frame = None if self.headless else self.landmark_canvas(frame)
+        # Extract landmarks safely (static scene without a hand: skip detection)
+        elif self.frame_gate is None or self.frame_gate.should_detect(frame):
+            landmarks, processed_frame, hand_detected = self.safe_extract_landmarks(frame, draw=not self.headless)
+            if self.frame_gate is not None:
+                self.frame_gate.record_detection(hand_detected)
+        else:
+            landmarks, processed_frame, hand_detected = None, cv2.flip(frame, 1), False
+        stage_started, started = started, self.record_stage('landmarks', started)
+        if details is not None:
+            details['landmarks_ms'] = round((started - stage_started) * 1000, 3)
+        
+        if self.recorder is not None:
+            self.recorder.record(timestamp if timestamp is not None else time.time() - self.start_time,
+                                 landmarks if hand_detected else None)
+        
+        # Make prediction if landmarks available
+        sign_name = None
+        confidence = 0.0
         
-        debug_mode = False
+        if hand_detected and landmarks is not None:
+            predicted_class, raw_confidence, probabilities = self.gated_predict(landmarks)
+            stage_started, started = started, self.record_stage('predict', started)
+            if details is not None:
+                details['predict_ms'] = round((started - stage_started) * 1000, 3)
+                details['raw_prediction'] = (self.class_mapping.get(str(predicted_class))
+                                             if predicted_class is not None else None)
+                details['raw_confidence'] = round(float(raw_confidence), 4)
+            
+            if predicted_class is not None:
+                # Apply smoothing
+                smooth_pred, smooth_confidence = self.smooth_prediction(predicted_class, raw_confidence, probabilities)
+                stage_started, started = started, self.record_stage('smoothing', started)
+                if details is not None:
+                    details['smoothing_ms'] = round((started - stage_started) * 1000, 3)
+                
+                if smooth_pred is not None and str(smooth_pred) in self.class_mapping:
+                    sign_name = self.class_mapping[str(smooth_pred)]
+                    confidence = smooth_confidence
+        
+        if details is not None:
+            details['total_ms'] = round((time.perf_counter() - frame_started) * 1000, 3)
+        return processed_frame, sign_name, confidence, hand_detected
+    
+    def check_frame_timeout(self):
+        """Restart the camera when no frame arrived for frame_timeout seconds; False if that failed"""
+        if self.cap is not None and not self.cap.live:
+            return True  # File sources are paced by us, not by a device
+        if time.time() - self.last_successful_frame_time <= self.frame_timeout:
+            return True
+        logger.warning("🔄 Frame timeout detected, attempting camera restart...")
+        if self.cap:
+            self.cap.release()
+        self.cap = None
+        if not self.initialize_camera_with_retry():
+            logger.error("💥 Failed to restart camera, switching to emergency mode...")
+            return False
+        return True
+    
+    def restart_camera(self):
+        logger.info("🔄 Camera restart requested...")
+        with self.camera_lock:
+            if self.cap:
+                self.cap.release()
+            self.cap = None
+            if self.initialize_camera_with_retry():
+                logger.info("✅ Camera restarted successfully")
+            else:
+                logger.error("❌ Camera restart failed")
+    
+    def handle_key(self, key):
+        """React to a key press; returns 'quit', 'emergency' or None"""
+        if key == ord('q'):
+            logger.info("👋 Quit requested by user")
+            return 'quit'
+        elif key == ord('c'):
+            self.smoother.reset()
+            logger.info("🗑️ Prediction history cleared!")
+        elif key == ord('r'):
+            self.restart_camera()
+        elif key == ord('d'):
+            self.debug_mode = not self.debug_mode
+            status = "enabled" if self.debug_mode else "disabled"
+            logger.info(f"🔧 Debug mode {status}")
+            if self.debug_mode:
+                self.draw_stats = StageStats('ui_draw')
+            else:
+                stats = self.draw_stats.summary()
+                logger.info(f"🎨 UI drawing: {stats['frames']} frames, {stats['mean_ms']}ms mean, "
+                            f"{stats['max_ms']}ms max ({self.ui_overlay.renders} layer renders)")
+        elif key == ord('e'):
+            logger.info("🚨 Emergency mode requested...")
+            return 'emergency'
+        return None
+    
+    def show_error_frame(self, message, hint, wait_ms=1):
+        error_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(error_frame, message, 
+                   (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        cv2.putText(error_frame, hint, 
+                   (50, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        cv2.imshow('ASL Real-Time Translator', error_frame)
+        return cv2.waitKey(wait_ms) & 0xFF
+    
+    def run_sequential(self):
+        """Capture, recognize and display one frame after the other on this thread"""
+        stats = {name: StageStats(name) for name in ('capture', 'inference', 'display')}
+        frame_latency = StageStats('capture_to_display')
         
         while self.is_running:
             try:
                 # Check for frame timeout
-                if time.time() - self.last_successful_frame_time > self.frame_timeout:
-                    logger.warning("🔄 Frame timeout detected, attempting camera restart...")
-                    self.cap.release()
-                    self.cap = None
-                    if not self.initialize_camera_with_retry():
-                        logger.error("💥 Failed to restart camera, switching to emergency mode...")
-                        self.run_emergency_mode()
-                        break
+                if not self.check_frame_timeout():
+                    self.run_emergency_mode()
+                    break
                 
                 # Capture frame safely
+                started = time.perf_counter()
                 frame, success = self.safe_capture_frame()
                 if not success:
+                    if not self.is_running:
+                        break  # End of a file source
                     # Display error message on black frame
-                    error_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                    cv2.putText(error_frame, "Camera Error - Attempting to reconnect...", 
-                               (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    cv2.putText(error_frame, "Press 'e' for emergency mode", 
-                               (50, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    cv2.imshow('ASL Real-Time Translator', error_frame)
-                    
-                    key = cv2.waitKey(1) & 0xFF
+                    key = self.show_error_frame("Camera Error - Attempting to reconnect...",
+                                                "Press 'e' for emergency mode")
                     if key == ord('e'):
                         self.run_emergency_mode()
                         break
@@ -517,23 +751,12 @@ class UltraRobustASLTester:
                     time.sleep(0.5)
                     continue
                 
-                # Extract landmarks safely
-                landmarks, processed_frame, hand_detected = self.safe_extract_landmarks(frame)
+                captured_at = time.perf_counter()
+                stats['capture'].record(captured_at - started)
                 
-                # Make prediction if landmarks available
-                sign_name = None
-                confidence = 0.0
-                
-                if hand_detected and landmarks is not None:
-                    predicted_class, raw_confidence = self.safe_predict(landmarks)
-                    
-                    if predicted_class is not None:
-                        # Apply smoothing
-                        smooth_pred, smooth_confidence = self.smooth_prediction(predicted_class, raw_confidence)
-                        
-                        if smooth_pred is not None and str(smooth_pred) in self.class_mapping:
-                            sign_name = self.class_mapping[str(smooth_pred)]
-                            confidence = smooth_confidence
+                processed_frame, sign_name, confidence, hand_detected = self.process_frame(frame, self.cap.timestamp)
+                inferred_at = time.perf_counter()
+                stats['inference'].record(inferred_at - captured_at)
                 
                 # Calculate FPS
                 fps = self.calculate_fps()
@@ -545,27 +768,12 @@ class UltraRobustASLTester:
                 cv2.imshow('ASL Real-Time Translator', processed_frame)
                 
                 # Handle key presses
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    logger.info("👋 Quit requested by user")
+                action = self.handle_key(cv2.waitKey(1) & 0xFF)
+                stats['display'].record(time.perf_counter() - inferred_at)
+                frame_latency.record(time.perf_counter() - captured_at)
+                if action == 'quit':
                     break
-                elif key == ord('c'):
-                    self.prediction_history.clear()
-                    logger.info("🗑️ Prediction history cleared!")
-                elif key == ord('r'):
-                    logger.info("🔄 Camera restart requested...")
-                    self.cap.release()
-                    self.cap = None
-                    if self.initialize_camera_with_retry():
-                        logger.info("✅ Camera restarted successfully")
-                    else:
-                        logger.error("❌ Camera restart failed")
-                elif key == ord('d'):
-                    debug_mode = not debug_mode
-                    status = "enabled" if debug_mode else "disabled"
-                    logger.info(f"🔧 Debug mode {status}")
-                elif key == ord('e'):
-                    logger.info("🚨 Emergency mode requested...")
+                if action == 'emergency':
                     self.run_emergency_mode()
                     break
                 
@@ -573,18 +781,155 @@ class UltraRobustASLTester:
                 logger.error(f"❌ Unexpected error in main loop: {e}")
                 # Try to continue despite errors
                 try:
-                    error_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                    cv2.putText(error_frame, f"Error: {str(e)[:50]}...", 
-                               (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    cv2.putText(error_frame, "Press any key to continue...", 
-                               (50, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    cv2.imshow('ASL Real-Time Translator', error_frame)
-                    cv2.waitKey(2000)  # Wait 2 seconds
+                    self.show_error_frame(f"Error: {str(e)[:50]}...", "Press any key to continue...",
+                                          wait_ms=2000)  # Wait 2 seconds
                 except:
                     pass
         
-        self.cleanup()
-        logger.info("✅ Real-time testing completed!")
+        return {
+            'stages': [stage.summary() for stage in stats.values()],
+            'capture_to_display': {key: value for key, value in frame_latency.summary().items()
+                                   if key in ('frames', 'mean_ms', 'max_ms')}
+        }
+    
+    def run_headless(self):
+        """Recognize frames without drawing or windows; each frame becomes one output row"""
+        if self.pipelined:
+            logger.info("ℹ️ Headless runs are sequential: --pipelined is ignored")
+        stats = {name: StageStats(name) for name in ('capture', 'inference', 'output')}
+        writer = PredictionLogWriter(self.output_path) if self.output_path else None
+        frame_index = 0
+        
+        try:
+            while self.is_running:
+                if self.max_frames and frame_index >= self.max_frames:
+                    break
+                if not self.check_frame_timeout():
+                    break
+                
+                started = time.perf_counter()
+                frame, success = self.safe_capture_frame()
+                if not success:
+                    if not self.is_running:
+                        break  # End of a file source
+                    time.sleep(0.05)  # Camera hiccup: retry
+                    continue
+                captured_at = time.perf_counter()
+                stats['capture'].record(captured_at - started)
+                
+                details = {}
+                _, sign_name, confidence, hand_detected = self.process_frame(frame, self.cap.timestamp, details)
+                inferred_at = time.perf_counter()
+                stats['inference'].record(inferred_at - captured_at)
+                
+                if writer is not None:
+                    writer.write({
+                        'frame': frame_index,
+                        'timestamp': round(self.cap.timestamp, 4),
+                        'hand_detected': hand_detected,
+                        'prediction': sign_name,
+                        'confidence': round(float(confidence), 4),
+                        **details
+                    })
+                stats['output'].record(time.perf_counter() - inferred_at)
+                frame_index += 1
+        except KeyboardInterrupt:
+            logger.info("🛑 Headless run interrupted")
+        finally:
+            if writer is not None:
+                writer.close()
+                logger.info(f"💾 {writer.rows} frame results written to {writer.path}")
+        
+        return {'stages': [stage.summary() for stage in stats.values()]}
+    
+    def pipeline_capture(self):
+        """Capture stage of the pipelined mode (runs on the capture thread)"""
+        if not self.is_running:
+            return None
+        with self.camera_lock:
+            if not self.check_frame_timeout():
+                self.camera_failed = True
+                return None
+            frame, success = self.safe_capture_frame()
+        if not success:
+            time.sleep(0.05)  # Camera recovering; do not spin
+            return None
+        return frame, self.cap.timestamp
+    
+    def run_pipelined(self):
+        """Capture and recognition on background threads; this thread only draws and displays.
+        
+        The displayed frame is always the newest recognized one: frames captured while
+        recognition is busy are dropped, so the display rate follows the slowest stage.
+        """
+        # Live and source-paced input drops stale frames; a file read at full speed recognizes every frame
+        drop_stale = self.cap.live or self.pace == 'source'
+        pipeline = FramePipeline(self.pipeline_capture, lambda item: self.process_frame(*item),
+                                 drop_stale=drop_stale).start()
+        logger.info("🧵 Pipelined mode: capture and recognition run on their own threads")
+        display_started = time.perf_counter()
+        action = None
+        
+        try:
+            while not self.camera_failed:
+                # Once the source has ended, wait for the frame still being recognized
+                item = pipeline.next_result(timeout=0.1 if self.is_running else 1.0)
+                if item is None:
+                    if not self.is_running:
+                        break
+                    action = self.handle_key(cv2.waitKey(1) & 0xFF)  # Keep the window responsive
+                    if action:
+                        break
+                    continue
+                
+                (processed_frame, sign_name, confidence, hand_detected), captured_at = item
+                started = time.perf_counter()
+                
+                # Displayed frames per second, i.e. what the user actually sees
+                display_count = pipeline.stats['display'].count
+                fps = display_count / (started - display_started) if started > display_started else 0.0
+                
+                self.draw_ui_elements(processed_frame, sign_name, confidence, hand_detected, fps)
+                cv2.imshow('ASL Real-Time Translator', processed_frame)
+                action = self.handle_key(cv2.waitKey(1) & 0xFF)
+                pipeline.record_display(time.perf_counter() - started, captured_at)
+                if action:
+                    break
+        finally:
+            pipeline.stop()
+        
+        if action == 'emergency' or self.camera_failed:
+            self.run_emergency_mode()
+        return pipeline.report()
+    
+    def log_run_report(self, report, elapsed):
+        """Log end-to-end FPS and per-stage timings of the finished run; kept in self.run_report"""
+        stages = report['stages'] + [stats.summary(elapsed) for stats in self.stage_stats.values()]
+        displayed = next((stage['frames'] for stage in report['stages'] if stage['stage'] in ('display', 'output')), 0)
+        self.run_report = {
+            'mode': 'headless' if self.headless else 'pipelined' if self.pipelined else 'sequential',
+            'source': self.cap.describe() if hasattr(self.cap, 'describe') else None,
+            'elapsed_s': round(elapsed, 2),
+            'frames_captured': self.frame_count,
+            'frames_displayed': displayed,
+            'end_to_end_fps': round(displayed / elapsed, 2) if elapsed > 0 else 0.0,
+            **report,
+            'stages': stages
+        }
+        
+        logger.info(f"📊 Run report ({self.run_report['mode']}, {elapsed:.1f}s): "
+                    f"{self.run_report['end_to_end_fps']} FPS end to end, "
+                    f"{displayed}/{self.frame_count} frames shown")
+        for stage in stages:
+            logger.info(f"   {stage['stage']:<10} {stage['frames']:>6} frames | {stage['fps']:>6.1f} FPS | "
+                        f"{stage['mean_ms']:>6.1f}ms mean | {stage['max_ms']:>6.1f}ms max | "
+                        f"{stage['utilization']:.0%} busy")
+        if 'capture_to_display' in report:
+            latency = report['capture_to_display']
+            logger.info(f"   capture -> display: {latency['mean_ms']}ms mean, {latency['max_ms']}ms max")
+        if 'dropped_frames' in report:
+            logger.info(f"   dropped stale frames: {report['dropped_frames']}, "
+                        f"skipped results: {report['dropped_results']}, errors: {report['errors']}")
     
     def run_emergency_mode(self):
         """Run emergency camera-only mode"""
@@ -661,19 +1006,28 @@ class UltraRobustASLTester:
         logger.info("🧹 Cleaning up resources...")
         
         try:
-            if self.cap and self.cap.isOpened():
+            if self.cap:
                 self.cap.release()
+                self.cap = None
                 logger.info("✅ Camera released")
         except Exception as e:
             logger.error(f"❌ Error releasing camera: {e}")
         
+        if self.recorder is not None:
+            self.recorder.close()
+            logger.info(f"💾 {self.recorder.entries} landmark frames written to {self.recorder.path}")
+            self.recorder = None
+        
         try:
             if self.hands:
                 self.hands.close()
+                self.hands = None
                 logger.info("✅ MediaPipe resources released")
         except Exception as e:
             logger.error(f"❌ Error closing MediaPipe: {e}")
         
+        if self.headless:
+            return  # No windows were opened (and opencv-python-headless cannot close any)
         try:
             cv2.destroyAllWindows()
             # Also destroy any specific windows that might remain
@@ -683,8 +1037,37 @@ class UltraRobustASLTester:
         except Exception as e:
             logger.error(f"❌ Error closing windows: {e}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Real-time ASL recognition from a camera, video, image folder or landmark stream")
+    parser.add_argument('--source', default=None,
+                        help="Camera index (default: first working camera), video file, image directory "
+                             "or recorded landmark stream (.jsonl)")
+    parser.add_argument('--pace', choices=PACING_MODES, default='fast',
+                        help="File sources: 'fast' = as fast as possible, 'source' = the source's frame rate")
+    parser.add_argument('--loop', action='store_true', help="Restart file sources at the end")
+    parser.add_argument('--pipelined', action='store_true', default=None,
+                        help="Capture, recognition and display on separate threads")
+    parser.add_argument('--model', default=None, help="Model file (default: the registry's active model)")
+    parser.add_argument('--backend', default=None, help="Inference backend: keras, numpy, tflite, onnx")
+    parser.add_argument('--record-landmarks', metavar='PATH', help="Write the landmark stream to a .jsonl file")
+    parser.add_argument('--headless', action='store_true',
+                        help="No window and no drawing; write per-frame results to --output")
+    parser.add_argument('--output', metavar='PATH', help="Per-frame results (.jsonl or .csv) for --headless runs")
+    parser.add_argument('--max-frames', type=int, default=None, help="Stop a headless run after this many frames")
+    parser.add_argument('--report', metavar='PATH', help="Save the end-of-run report as JSON")
+    parser.add_argument('--smoothing', choices=SMOOTHING_METHODS, default='vote',
+                        help="Majority vote over recent frames, or a moving average of the probabilities")
+    parser.add_argument('--smoothing-window', type=int, default=DEFAULT_WINDOW, help="Frames that vote")
+    parser.add_argument('--smoothing-decay', type=float, default=DEFAULT_DECAY,
+                        help="Weight of the previous average for --smoothing ema (0-1)")
+    parser.add_argument('--no-warmup', action='store_true')
+    parser.add_argument('--no-roi', action='store_true', help="Run MediaPipe on the full frame")
+    parser.add_argument('--no-gating', action='store_true', help="Detect and predict on every frame")
+    return parser.parse_args()
+
 def main():
     """Main function with comprehensive error handling"""
+    args = parse_args()
     tester = None
     
     try:
@@ -693,11 +1076,33 @@ def main():
         print("🛡️  Designed to work reliably during presentations\n")
         
         # Create tester instance
-        tester = UltraRobustASLTester()
+        tester = UltraRobustASLTester(
+            model_path=args.model,
+            backend=args.backend,
+            roi_tracking=not args.no_roi,
+            frame_gating=not args.no_gating,
+            warmup=not args.no_warmup,
+            pipelined=args.pipelined,
+            source=args.source,
+            pace=args.pace,
+            loop=args.loop,
+            record_landmarks=args.record_landmarks,
+            headless=args.headless,
+            output=args.output,
+            max_frames=args.max_frames,
+            smoothing=args.smoothing,
+            smoothing_window=args.smoothing_window,
+            smoothing_decay=args.smoothing_decay
+        )
         
         # Run the tester
         tester.run_test()
         
+        if args.report and tester.run_report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(tester.run_report, f, indent=2)
+            print(f"💾 Run report saved to {args.report}")
+        
     except KeyboardInterrupt:
         print("\n🛑 Program interrupted by user")
     except Exception as e:
@@ -0,0 +1,182 @@
+"""Region-of-interest hand tracking on top of MediaPipe Hands.
+
+Running Hands on the whole full-resolution frame every time wastes most of the
+work on background pixels. RoiHandTracker keeps the expanded bounding box of the
+previous frame's landmarks (same idea as extract_hand_region in
+data_collection_mediapipe.py), runs MediaPipe only on that crop at a reduced
+working resolution and maps the landmarks back to full-frame coordinates. When
+the hand is lost in the crop it falls back to full-frame detection in the same
+frame, so no detection is dropped. The crop only moves when the hand nears its
+edges.
+
+The crop and the full frame use separate Hands instances, so every tracker holds
+two of them (size tracker pools accordingly):
+
+- the crop instance runs in video mode like the full-frame one, but its
+  tracking state is only valid for the crop it was built on. When the crop
+  moves, one blank frame clears that state first, so the next crop runs palm
+  detection instead of looking for the hand where it was in the old crop.
+  (Static-image mode would also be correct, but runs palm detection on every
+  frame and made ROI frames ~2.5x slower.)
+- the full-frame instance only ever sees full frames
+
+Full-frame detection runs on the frame downscaled to detection_max_side pixels
+on its longest side (640 by default, None to disable). Landmarks are normalized
+so they come out the same, but very small (distant) hands in large frames are
+found less reliably than at full resolution.
+"""
+import numpy as np
+
+# Crop size (longest side, pixels) handed to MediaPipe
+DEFAULT_WORKING_SIZE = 256
+# Box growth around the landmarks, as a fraction of the hand's size on each side
+DEFAULT_ROI_PADDING = 0.5
+# Full-frame detection input is downscaled to this longest side
+DEFAULT_DETECTION_MAX_SIDE = 640
+# Boxes thinner than this (hand at the frame edge) go back to full-frame detection
+MIN_ROI_SIDE = 32
+
+
+def landmark_bounding_box(hand_landmarks, frame_width, frame_height, padding=DEFAULT_ROI_PADDING,
+                          min_size=96):
+    """Square pixel box around the landmarks, grown by padding and clipped to the frame.
+
+    Returns (x_min, y_min, x_max, y_max).
+    """
+    x_coords = [landmark.x * frame_width for landmark in hand_landmarks.landmark]
+    y_coords = [landmark.y * frame_height for landmark in hand_landmarks.landmark]
+
+    center_x = (min(x_coords) + max(x_coords)) / 2
+    center_y = (min(y_coords) + max(y_coords)) / 2
+    hand_size = max(max(x_coords) - min(x_coords), max(y_coords) - min(y_coords))
+    half_side = max(hand_size * (1 + 2 * padding), min_size) / 2
+
+    x_min = int(max(0, center_x - half_side))
+    y_min = int(max(0, center_y - half_side))
+    x_max = int(min(frame_width, center_x + half_side))
+    y_max = int(min(frame_height, center_y + half_side))
+    return x_min, y_min, x_max, y_max
+
+
+def map_landmarks_to_frame(hand_landmarks, box, frame_width, frame_height):
+    """Rewrite crop-normalized landmarks in place as full-frame normalized coordinates."""
+    x_min, y_min, x_max, y_max = box
+    crop_width = x_max - x_min
+    crop_height = y_max - y_min
+    for landmark in hand_landmarks.landmark:
+        landmark.x = (landmark.x * crop_width + x_min) / frame_width
+        landmark.y = (landmark.y * crop_height + y_min) / frame_height
+        landmark.z = landmark.z * crop_width / frame_width  # z shares the x scale
+
+
+class RoiHandTracker:
+    """Drop-in replacement for a MediaPipe Hands object: process(rgb_frame) -> results.
+
+    hands_factory builds one Hands instance; two are created (HANDS_PER_TRACKER:
+    crop + full frame). The returned landmarks are always normalized to the full
+    frame passed in.
+    """
+
+    HANDS_PER_TRACKER = 2
+
+    def __init__(self, hands_factory, working_size=DEFAULT_WORKING_SIZE, padding=DEFAULT_ROI_PADDING,
+                 detection_max_side=DEFAULT_DETECTION_MAX_SIDE):
+        self.roi_hands = hands_factory()
+        self.full_hands = hands_factory()
+        self.working_size = working_size
+        self.padding = padding
+        self.detection_max_side = detection_max_side
+
+        self.roi_box = None  # Pixel box for the next frame, None = detect on the full frame
+        self._tracked_box = None  # Crop that roi_hands' tracking state refers to
+        self._blank = np.zeros((working_size, working_size, 3), dtype=np.uint8)
+        self.stats = {
+            'roi_frames': 0,
+            'full_frames': 0,
+            'roi_misses': 0,
+            'roi_moves': 0,
+            'roi_resets': 0
+        }
+
+    def process(self, rgb_frame):
+        frame_height, frame_width = rgb_frame.shape[:2]
+
+        if self.roi_box is not None:
+            results = self._process_roi(rgb_frame, self.roi_box, frame_width, frame_height)
+            if results.multi_hand_landmarks:
+                self.stats['roi_frames'] += 1
+                self._update_roi(results, frame_width, frame_height)
+                return results
+            # Hand left the crop: look for it on the whole frame
+            self.stats['roi_misses'] += 1
+            self.roi_box = None
+
+        results = self.full_hands.process(self._downscale(rgb_frame, self.detection_max_side))
+        self.stats['full_frames'] += 1
+        self._update_roi(results, frame_width, frame_height)
+        return results
+
+    def _process_roi(self, rgb_frame, box, frame_width, frame_height):
+        if self._tracked_box is not None and self._tracked_box != box:
+            # Landmarks from the old crop would land on the wrong pixels: make MediaPipe detect afresh
+            self.roi_hands.process(self._blank)
+            self.stats['roi_resets'] += 1
+
+        x_min, y_min, x_max, y_max = box
+        crop = self._downscale(rgb_frame[y_min:y_max, x_min:x_max], self.working_size)
+        results = self.roi_hands.process(np.ascontiguousarray(crop))
+
+        # A miss leaves MediaPipe without a hand to track, so there is nothing to reset
+        self._tracked_box = box if results.multi_hand_landmarks else None
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                map_landmarks_to_frame(hand_landmarks, box, frame_width, frame_height)
+        return results
+
+    def _update_roi(self, results, frame_width, frame_height):
+        if not results.multi_hand_landmarks:
+            self.roi_box = None
+            return
+
+        hand_landmarks = results.multi_hand_landmarks[0]
+        if self.roi_box is not None and self._hand_inside_roi(hand_landmarks, frame_width, frame_height):
+            return  # Keep the crop still while the hand stays well inside it
+
+        self.roi_box = None
+        box = landmark_bounding_box(hand_landmarks, frame_width, frame_height, self.padding)
+        if box[2] - box[0] >= MIN_ROI_SIDE and box[3] - box[1] >= MIN_ROI_SIDE:
+            self.roi_box = box
+            self.stats['roi_moves'] += 1
+
+    def _hand_inside_roi(self, hand_landmarks, frame_width, frame_height):
+        """True while the hand stays clear of the crop edges and fills a sensible share of it."""
+        x_min, y_min, x_max, y_max = self.roi_box
+        side = max(x_max - x_min, y_max - y_min)
+        margin = side * self.padding / (1 + 2 * self.padding) / 2
+        x_coords = [landmark.x * frame_width for landmark in hand_landmarks.landmark]
+        y_coords = [landmark.y * frame_height for landmark in hand_landmarks.landmark]
+        hand_size = max(max(x_coords) - min(x_coords), max(y_coords) - min(y_coords))
+
+        inside = (min(x_coords) >= x_min + margin or x_min == 0) and \
+                 (max(x_coords) <= x_max - margin or x_max == frame_width) and \
+                 (min(y_coords) >= y_min + margin or y_min == 0) and \
+                 (max(y_coords) <= y_max - margin or y_max == frame_height)
+        return inside and hand_size > side / (2 * (1 + 2 * self.padding))
+
+    @staticmethod
+    def _downscale(image, max_side):
+        height, width = image.shape[:2]
+        scale = max_side / max(height, width) if max_side else 1.0
+        if scale >= 1.0:
+            return image
+        import cv2  # Deferred: the server imports this module before it needs OpenCV
+        return cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                          interpolation=cv2.INTER_LINEAR)
+
+    def reset(self):
+        """Forget the ROI so the next frame runs full-frame detection."""
+        self.roi_box = None
+
+    def close(self):
+        self.roi_hands.close()
+        self.full_hands.close()
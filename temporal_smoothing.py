@@ -0,0 +1,332 @@
+"""Incremental temporal smoothing of per-frame classifier outputs.
+
+Single-frame predictions flicker between signs while a hand moves into and
+out of a pose. A TemporalSmoother keeps, for one stream (one camera, one
+browser session):
+
+- a ring buffer of the last `window` votes (label, confidence, timestamp)
+  with running per-class vote counts and confidence sums: a new vote pushes
+  the oldest one out, so the majority label and its mean confidence come out
+  of an O(1) update instead of recounting the whole history
+- an exponential moving average of the full probability vector
+  (ema = decay * ema + (1 - decay) * probabilities), updated in place
+
+method='vote' reports the majority label with the mean confidence of its
+votes (the behaviour of the old smooth_prediction helpers; a tie goes to the
+current label). With min_consensus, the majority label only replaces the
+current one if it holds at least that fraction of the votes (the server
+uses 1/3, its old `count >= len(history) // 3` rule). method='ema' reports
+the argmax of the averaged probabilities. Votes older than max_age seconds expire, and the average
+restarts once every vote has expired.
+
+BatchTemporalSmoother keeps the same state for many streams in stacked
+arrays and updates any subset of them with a handful of numpy operations,
+so the cost per batch barely grows with the number of streams.
+
+    smoother = TemporalSmoother(num_classes=6, window=5)
+    label, confidence = smoother.update(predicted_class, confidence, probabilities)
+"""
+import threading
+import time
+
+import numpy as np
+
+SMOOTHING_METHODS = ('vote', 'ema')
+DEFAULT_WINDOW = 5
+DEFAULT_DECAY = 0.6  # Weight of the running average; ~4 frames of memory at 30 FPS
+DEFAULT_HOLD_DECAY = 0.9
+
+
+def _check_config(window, decay, method, min_consensus):
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(f"Unknown smoothing method '{method}' (expected one of {', '.join(SMOOTHING_METHODS)})")
+    if window < 1:
+        raise ValueError(f"Smoothing window must be at least 1 (got {window})")
+    if not 0.0 <= decay < 1.0:
+        raise ValueError(f"Smoothing decay must be in [0, 1) (got {decay})")
+    if not 0.0 <= min_consensus <= 1.0:
+        raise ValueError(f"Smoothing consensus must be in [0, 1] (got {min_consensus})")
+
+
+class TemporalSmoother:
+    """Smoothing state for one stream.
+
+    min_history: below this many votes the current prediction is returned as is.
+    min_confidence: predictions below it are smoothed but do not vote.
+    min_consensus: fraction of the votes the majority label needs to replace
+        the current prediction (vote method only).
+    """
+
+    def __init__(self, num_classes, window=DEFAULT_WINDOW, decay=DEFAULT_DECAY, method='vote',
+                 min_history=1, min_confidence=0.0, min_consensus=0.0, max_age=None):
+        _check_config(window, decay, method, min_consensus)
+        self.num_classes = num_classes
+        self.window = window
+        self.decay = decay
+        self.method = method
+        self.min_history = min_history
+        self.min_confidence = min_confidence
+        self.min_consensus = min_consensus
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._labels = [0] * window
+        self._confidences = [0.0] * window
+        self._timestamps = [0.0] * window
+        self._start = 0  # Slot of the oldest vote
+        self._size = 0
+        self._counts = [0] * num_classes
+        self._confidence_sums = [0.0] * num_classes
+        self._ema = np.zeros(num_classes, dtype=np.float64)
+        self._scratch = np.zeros(num_classes, dtype=np.float64)
+        self._ema_ready = False
+        self.last_used = time.time()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def probabilities(self):
+        """Copy of the averaged probability vector, or None before the first vote."""
+        with self._lock:
+            return self._ema.copy() if self._ema_ready else None
+
+    def update(self, label, confidence, probabilities=None, timestamp=None):
+        """Add one prediction (class index, its confidence, optionally the full output row).
+
+        Returns the smoothed (label, confidence).
+        """
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self.last_used = time.time()
+            if self.max_age is not None:
+                self._expire(now)
+            if confidence >= self.min_confidence:
+                self._vote(label, confidence, now)
+                self._blend(label, confidence, probabilities)
+
+            if self._size < max(self.min_history, 1):
+                return label, confidence
+            return self._result(label, confidence)
+
+    def hold(self, decay=DEFAULT_HOLD_DECAY):
+        """Latest vote with its confidence decayed, for frames without a prediction."""
+        with self._lock:
+            if not self._size:
+                return None, 0.0
+            slot = (self._start + self._size - 1) % self.window
+            return self._labels[slot], self._confidences[slot] * decay
+
+    def reset(self):
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._counts = [0] * self.num_classes
+            self._confidence_sums = [0.0] * self.num_classes
+            self._ema_ready = False
+
+    def _vote(self, label, confidence, now):
+        if self._size == self.window:
+            self._drop_oldest()
+        slot = (self._start + self._size) % self.window
+        self._labels[slot] = label
+        self._confidences[slot] = confidence
+        self._timestamps[slot] = now
+        self._size += 1
+        self._counts[label] += 1
+        self._confidence_sums[label] += confidence
+
+    def _drop_oldest(self):
+        label = self._labels[self._start]
+        self._counts[label] -= 1
+        # Reset instead of subtracting to zero so float error cannot build up
+        self._confidence_sums[label] = (self._confidence_sums[label] - self._confidences[self._start]
+                                        if self._counts[label] else 0.0)
+        self._start = (self._start + 1) % self.window
+        self._size -= 1
+
+    def _expire(self, now):
+        while self._size and now - self._timestamps[self._start] >= self.max_age:
+            self._drop_oldest()
+        if not self._size:
+            self._ema_ready = False
+
+    def _blend(self, label, confidence, probabilities):
+        if probabilities is None:
+            source = self._scratch
+            source.fill(0.0)
+            source[label] = confidence
+        else:
+            source = np.asarray(probabilities).reshape(-1)
+        if not self._ema_ready:
+            self._ema[:] = source
+            self._ema_ready = True
+        else:
+            # ema + (1 - decay) * (source - ema) == decay * ema + (1 - decay) * source
+            np.subtract(source, self._ema, out=self._scratch)
+            self._scratch *= 1.0 - self.decay
+            self._ema += self._scratch
+
+    def _result(self, label, confidence):
+        if self.method == 'ema':
+            best = int(self._ema.argmax())
+            return best, float(self._ema[best])
+        top = max(self._counts)
+        best = label if self._counts[label] == top else self._counts.index(top)
+        if top < max(1, int(self._size * self.min_consensus)):
+            return label, confidence  # Not enough agreement to override the current prediction
+        return best, self._confidence_sums[best] / self._counts[best]
+
+
+class SessionSmoothers:
+    """One TemporalSmoother per session id, dropped after idle_timeout seconds.
+
+    smoother_factory(num_classes, window) builds a smoother; a session whose
+    class count or window changes gets a fresh one.
+    """
+
+    def __init__(self, smoother_factory, idle_timeout=60.0):
+        self.smoother_factory = smoother_factory
+        self.idle_timeout = idle_timeout
+        self._smoothers = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id, num_classes, window=DEFAULT_WINDOW):
+        with self._lock:
+            smoother = self._smoothers.get(session_id)
+            if smoother is None or smoother.num_classes != num_classes or smoother.window != window:
+                smoother = self._smoothers[session_id] = self.smoother_factory(num_classes, window)
+            return smoother
+
+    def discard(self, session_id):
+        with self._lock:
+            self._smoothers.pop(session_id, None)
+
+    def evict_idle(self):
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = [session_id for session_id, smoother in self._smoothers.items() if smoother.last_used < cutoff]
+            for session_id in idle:
+                del self._smoothers[session_id]
+        return len(idle)
+
+    def clear(self):
+        with self._lock:
+            self._smoothers.clear()
+
+    def total_votes(self):
+        with self._lock:
+            return sum(len(smoother) for smoother in self._smoothers.values())
+
+    def __len__(self):
+        return len(self._smoothers)
+
+
+class BatchTemporalSmoother:
+    """TemporalSmoother state for num_streams streams, updated a batch at a time.
+
+    Each update() call takes at most one prediction per stream; streams not in
+    the batch are left untouched. Same options and results as TemporalSmoother.
+    """
+
+    def __init__(self, num_streams, num_classes, window=DEFAULT_WINDOW, decay=DEFAULT_DECAY, method='vote',
+                 min_history=1, min_confidence=0.0, min_consensus=0.0, max_age=None):
+        _check_config(window, decay, method, min_consensus)
+        self.num_streams = num_streams
+        self.num_classes = num_classes
+        self.window = window
+        self.decay = decay
+        self.method = method
+        self.min_history = min_history
+        self.min_confidence = min_confidence
+        self.min_consensus = min_consensus
+        self.max_age = max_age
+
+        self._labels = np.zeros((num_streams, window), dtype=np.intp)
+        self._confidences = np.zeros((num_streams, window), dtype=np.float64)
+        self._timestamps = np.zeros((num_streams, window), dtype=np.float64)
+        self._start = np.zeros(num_streams, dtype=np.intp)
+        self._size = np.zeros(num_streams, dtype=np.intp)
+        self._counts = np.zeros((num_streams, num_classes), dtype=np.int32)
+        self._confidence_sums = np.zeros((num_streams, num_classes), dtype=np.float64)
+        self._ema = np.zeros((num_streams, num_classes), dtype=np.float64)
+        self._ema_ready = np.zeros(num_streams, dtype=bool)
+
+    def update(self, streams, labels, confidences, probabilities=None, timestamps=None):
+        """Add one prediction for each listed stream; returns (labels, confidences) arrays."""
+        streams = np.asarray(streams, dtype=np.intp)
+        labels = np.asarray(labels, dtype=np.intp)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        now = (np.full(len(streams), time.time()) if timestamps is None
+               else np.asarray(timestamps, dtype=np.float64))
+        if self.max_age is not None:
+            self._expire(streams, now)
+
+        voting = confidences >= self.min_confidence
+        rows, voted_labels, voted_confidences = streams[voting], labels[voting], confidences[voting]
+        self._drop_oldest(rows[self._size[rows] == self.window])
+        slots = (self._start[rows] + self._size[rows]) % self.window
+        self._labels[rows, slots] = voted_labels
+        self._confidences[rows, slots] = voted_confidences
+        self._timestamps[rows, slots] = now[voting]
+        self._size[rows] += 1
+        self._counts[rows, voted_labels] += 1
+        self._confidence_sums[rows, voted_labels] += voted_confidences
+
+        if probabilities is None:
+            source = np.zeros((len(rows), self.num_classes))
+            source[np.arange(len(rows)), voted_labels] = voted_confidences
+        else:
+            source = np.asarray(probabilities, dtype=np.float64).reshape(len(streams), -1)[voting]
+        ready = self._ema_ready[rows]
+        self._ema[rows] = np.where(ready[:, None], self.decay * self._ema[rows] + (1.0 - self.decay) * source, source)
+        self._ema_ready[rows] = True
+
+        return self._result(streams, labels, confidences)
+
+    def reset(self, streams=None):
+        streams = slice(None) if streams is None else np.asarray(streams, dtype=np.intp)
+        self._start[streams] = 0
+        self._size[streams] = 0
+        self._counts[streams] = 0
+        self._confidence_sums[streams] = 0.0
+        self._ema_ready[streams] = False
+
+    def _drop_oldest(self, rows):
+        if not len(rows):
+            return
+        starts = self._start[rows]
+        labels = self._labels[rows, starts]
+        self._counts[rows, labels] -= 1
+        sums = self._confidence_sums[rows, labels] - self._confidences[rows, starts]
+        self._confidence_sums[rows, labels] = np.where(self._counts[rows, labels] > 0, sums, 0.0)
+        self._start[rows] = (starts + 1) % self.window
+        self._size[rows] -= 1
+
+    def _expire(self, streams, now):
+        for _ in range(self.window):
+            stale = (self._size[streams] > 0) & (now - self._timestamps[streams, self._start[streams]] >= self.max_age)
+            if not stale.any():
+                break
+            self._drop_oldest(streams[stale])
+        self._ema_ready[streams[self._size[streams] == 0]] = False
+
+    def _result(self, streams, labels, confidences):
+        if self.method == 'ema':
+            averaged = self._ema[streams]
+            best = averaged.argmax(axis=1)
+            smoothed = averaged[np.arange(len(streams)), best]
+        else:
+            counts = self._counts[streams]
+            top = counts.max(axis=1)
+            best = np.where(counts[np.arange(len(streams)), labels] == top, labels, counts.argmax(axis=1))
+            smoothed = (self._confidence_sums[streams, best]
+                        / np.maximum(self._counts[streams, best], 1))
+            # Not enough agreement: the current prediction stands
+            weak = top < np.maximum(1, (self._size[streams] * self.min_consensus).astype(np.intp))
+            best = np.where(weak, labels, best)
+            smoothed = np.where(weak, confidences, smoothed)
+
+        # Too little history: the current prediction passes through
+        passthrough = self._size[streams] < max(self.min_history, 1)
+        return np.where(passthrough, labels, best), np.where(passthrough, confidences, smoothed)
@@ -0,0 +1,72 @@
+"""FrameGate: motion gate for no-hand frames and landmark-delta prediction reuse.
+
+    python -m pytest -q tests/test_frame_gating.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_gating import FrameGate, SessionFrameGates  # noqa: E402
+
+
+def frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def landmarks(offset=0.0):
+    return np.linspace(0.1, 0.9, 63, dtype=np.float32) + offset
+
+
+def test_static_scene_without_a_hand_skips_detection():
+    gate = FrameGate(motion_threshold=2.5)
+    assert gate.should_detect(frame(100))  # No reference yet
+    gate.record_detection(False)
+    assert not gate.should_detect(frame(101))
+    assert gate.should_detect(frame(140))  # Enough motion
+    assert gate.stats['detection_skips'] == 1
+
+
+def test_frames_with_a_hand_are_always_detected():
+    gate = FrameGate()
+    gate.should_detect(frame(100))
+    gate.record_detection(True)
+    assert gate.should_detect(frame(100))
+
+
+def test_detection_is_forced_after_max_skipped_frames():
+    gate = FrameGate(max_skipped_frames=2)
+    gate.should_detect(frame(100))
+    gate.record_detection(False)
+    assert [gate.should_detect(frame(100)) for _ in range(3)] == [False, False, True]
+
+
+def test_steady_hand_reuses_the_last_prediction():
+    gate = FrameGate(landmark_threshold=0.01)
+    assert gate.reused_prediction(landmarks()) is None  # Nothing to reuse yet
+    gate.remember_prediction(landmarks(), ('hello', 0.9))
+    assert gate.reused_prediction(landmarks(0.005)) == ('hello', 0.9)
+    assert gate.reused_prediction(landmarks(0.05)) is None
+
+
+def test_lost_hand_forgets_the_reference_prediction():
+    gate = FrameGate()
+    gate.remember_prediction(landmarks(), ('hello', 0.9))
+    gate.record_detection(False)
+    assert gate.reused_prediction(landmarks()) is None
+
+
+def test_reuse_is_capped_at_max_reused_predictions():
+    gate = FrameGate(max_reused_predictions=2)
+    gate.remember_prediction(landmarks(), ('yes', 0.8))
+    assert [gate.reused_prediction(landmarks()) for _ in range(3)] == [('yes', 0.8), ('yes', 0.8), None]
+
+
+def test_session_gates_are_separate_and_discardable():
+    gates = SessionFrameGates()
+    assert gates.get('a') is gates.get('a')
+    assert gates.get('a') is not gates.get('b')
+    gates.discard('a')
+    assert len(gates) == 1
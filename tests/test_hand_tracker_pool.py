@@ -0,0 +1,138 @@
+"""HandTrackerPool: per-session checkout, eviction, release and exhaustion.
+
+    python -m pytest -q tests/test_hand_tracker_pool.py
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'website'))
+
+from hand_tracker_pool import HandTrackerPool, TrackerPoolExhausted  # noqa: E402
+
+
+class FakeTracker:
+    def __init__(self):
+        self.closed = False
+        self.warmed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        created.append(FakeTracker())
+        return created[-1]
+
+    return HandTrackerPool(factory, **kwargs), created
+
+
+def test_a_session_gets_its_own_tracker_back():
+    pool, created = make_pool(max_trackers=2)
+    with pool.checkout('a') as first:
+        pass
+    with pool.checkout('b') as other:
+        pass
+    with pool.checkout('a') as again:
+        pass
+    assert first is again
+    assert other is not first
+    assert len(created) == 2
+
+
+def test_full_pool_evicts_the_least_recently_used_idle_tracker():
+    pool, created = make_pool(max_trackers=2)
+    for session_id in ('a', 'b', 'a', 'c'):
+        with pool.checkout(session_id):
+            pass
+    tracker_a, tracker_b, tracker_c = created
+    assert tracker_b.closed and not tracker_a.closed and not tracker_c.closed
+    assert pool.stats()['trackers_evicted'] == 1
+
+
+def test_checkout_raises_when_every_tracker_is_busy():
+    pool, _ = make_pool(max_trackers=1, acquire_timeout=0.05)
+    with pool.checkout('a'):
+        with pytest.raises(TrackerPoolExhausted):
+            with pool.checkout('b'):
+                pass
+    assert pool.stats()['exhausted'] == 1
+
+
+def test_busy_session_waits_for_its_own_tracker():
+    pool, created = make_pool(max_trackers=1, acquire_timeout=2.0)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.checkout('a'):
+            entered.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert entered.wait(5)
+    threading.Timer(0.05, release.set).start()
+    with pool.checkout('a') as tracker:
+        assert tracker is created[0]
+    holder.join(5)
+
+
+def test_idle_trackers_are_evicted():
+    pool, created = make_pool(max_trackers=2, idle_timeout=0.0)
+    with pool.checkout('a'):
+        assert pool.evict_idle() == 0  # Busy trackers stay
+    assert pool.evict_idle() == 1
+    assert created[0].closed
+    assert pool.stats()['active_trackers'] == 0
+
+
+def test_release_frees_the_slot_unless_the_tracker_is_busy():
+    pool, created = make_pool(max_trackers=1)
+    with pool.checkout('a'):
+        assert not pool.release('a')
+    assert pool.release('a')
+    assert created[0].closed
+    assert not pool.release('a')
+    with pool.checkout('b'):
+        pass
+    assert pool.stats()['trackers_released'] == 1
+
+
+def test_new_sessions_take_prewarmed_spares():
+    pool, created = make_pool(max_trackers=2)
+
+    def warm(tracker):
+        tracker.warmed = True
+        return {'frames': 1}
+
+    assert pool.prewarm(1, warm) == {'frames': 1}
+    with pool.checkout('a') as tracker:
+        assert tracker.warmed
+    with pool.checkout('b'):
+        pass
+    assert len(created) == 2
+    assert pool.stats()['warm_checkouts'] == 1
+    assert pool.stats()['trackers_created'] == 2  # The spare is counted once, when it is built
+
+
+def test_factory_failure_frees_the_reserved_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no camera model")
+        return FakeTracker()
+
+    pool = HandTrackerPool(factory, max_trackers=1, acquire_timeout=0.05)
+    with pytest.raises(RuntimeError):
+        with pool.checkout('a'):
+            pass
+    with pool.checkout('a') as tracker:
+        assert isinstance(tracker, FakeTracker)
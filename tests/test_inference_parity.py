@@ -0,0 +1,89 @@
+"""Exported inference backends must reproduce the Keras model's outputs.
+
+Builds the deployed landmark architecture (Dense/BatchNormalization/Dropout)
+with randomized BatchNormalization statistics, so folding is exercised, and
+compares each exported artifact with model.predict: the float backends
+(NumPy, TFLite, ONNX) must match closely, int8 only has to agree on the
+predicted class. Skipped when TensorFlow is not installed; a backend whose
+optional exporter is missing is skipped on its own.
+
+    python -m pytest -q tests/test_inference_parity.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tf = pytest.importorskip('tensorflow')
+
+from model_architecture import AdvancedASLModel  # noqa: E402
+from numpy_inference import NumpyMLP, check_parity, export_numpy_model, fold_keras_model  # noqa: E402
+
+FLOAT_TOLERANCE = 1e-5
+INT8_MIN_AGREEMENT = 0.95
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    tf.keras.utils.set_random_seed(0)
+    model = AdvancedASLModel(num_classes=6, input_shape=63).create_landmark_model()
+
+    # Non-trivial running statistics: a fresh layer (mean 0, variance 1) would hide folding mistakes
+    rng = np.random.default_rng(0)
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.BatchNormalization):
+            size = layer.get_weights()[0].shape[0]
+            layer.set_weights([
+                rng.uniform(0.5, 1.5, size).astype(np.float32),   # gamma
+                rng.normal(0.0, 0.2, size).astype(np.float32),    # beta
+                rng.normal(0.0, 0.5, size).astype(np.float32),    # moving mean
+                rng.uniform(0.5, 2.0, size).astype(np.float32)    # moving variance
+            ])
+    return model
+
+
+def test_fold_removes_batchnorm_and_dropout(keras_model):
+    layers = fold_keras_model(keras_model)
+    assert [activation for _, _, activation in layers] == ['relu', 'relu', 'relu', 'softmax']
+    assert [weights.shape for weights, _, _ in layers] == [(63, 128), (128, 64), (64, 32), (32, 6)]
+
+
+def test_numpy_matches_keras(keras_model, tmp_path):
+    path = export_numpy_model(keras_model, str(tmp_path / 'model.npz'))
+    max_difference, agreement = check_parity(keras_model, NumpyMLP.load(path))
+    assert max_difference < FLOAT_TOLERANCE
+    assert agreement == 1.0
+
+
+@pytest.fixture(scope='module')
+def exported(keras_model, tmp_path_factory):
+    from model_export import EXPORT_FORMATS, export_deployment_artifacts, synthetic_landmarks
+
+    model_path = str(tmp_path_factory.mktemp('export') / 'model.h5')
+    calibration = synthetic_landmarks(500, 63, seed=2)  # Same distribution as the comparison inputs
+    return export_deployment_artifacts(keras_model, model_path, representative_data=calibration,
+                                       formats=EXPORT_FORMATS)
+
+
+@pytest.mark.parametrize('export_format', ['numpy', 'tflite', 'onnx'])
+def test_float_backends_match_keras(keras_model, exported, export_format):
+    from model_export import compare_with_keras
+
+    if export_format not in exported:
+        pytest.skip(f"{export_format} export unavailable here (optional dependency missing)")
+    max_difference, agreement = compare_with_keras(keras_model, {export_format: exported[export_format]})[export_format]
+    assert max_difference < FLOAT_TOLERANCE
+    assert agreement == 1.0
+
+
+def test_int8_agrees_on_argmax(keras_model, exported):
+    from model_export import compare_with_keras
+
+    if 'tflite_int8' not in exported:
+        pytest.skip("tflite_int8 export unavailable here")
+    # Probabilities are not comparable to the float backends (see inference_backends), only the label is
+    _, agreement = compare_with_keras(keras_model, {'tflite_int8': exported['tflite_int8']})['tflite_int8']
+    assert agreement >= INT8_MIN_AGREEMENT
@@ -0,0 +1,124 @@
+"""InferenceScheduler: batching, model separation, backpressure and timeouts.
+
+    python -m pytest -q tests/test_inference_scheduler.py
+"""
+import os
+import sys
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'website'))
+
+from inference_scheduler import InferenceScheduler, SchedulerOverloaded  # noqa: E402
+
+
+class GatedModel:
+    """predict() returns rows * scale; it blocks while the gate is closed so tests can queue rows behind it."""
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.batches = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def predict(self, rows, verbose=0):
+        self.batches.append(rows.copy())
+        self.entered.set()
+        self.gate.wait(5)
+        return rows * self.scale
+
+
+def block_worker(scheduler, model):
+    """Occupy the worker with one row; returns its future once the worker is inside predict()."""
+    model.gate.clear()
+    future = scheduler.submit(model, np.zeros(3))
+    assert model.entered.wait(5)
+    return future
+
+
+def test_concurrent_rows_share_one_forward_pass():
+    model = GatedModel(scale=2.0)
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=50)
+    first = block_worker(scheduler, model)
+
+    futures = [scheduler.submit(model, np.full(3, i, dtype=np.float32)) for i in range(5)]
+    model.gate.set()
+
+    assert first.result(5).tolist() == [0, 0, 0]
+    for i, future in enumerate(futures):
+        assert future.result(5).tolist() == [2 * i] * 3
+    assert [len(batch) for batch in model.batches] == [1, 5]
+    assert scheduler.stats()['batch_size_histogram'] == {1: 1, 5: 1}
+
+
+def test_batches_are_capped_at_max_batch_size():
+    model = GatedModel()
+    scheduler = InferenceScheduler(max_batch_size=2, max_wait_ms=50)
+    block_worker(scheduler, model)
+
+    futures = [scheduler.submit(model, np.ones(3)) for _ in range(5)]
+    model.gate.set()
+    for future in futures:
+        future.result(5)
+    assert [len(batch) for batch in model.batches] == [1, 2, 2, 1]
+
+
+def test_rows_for_different_models_are_never_mixed():
+    first_model, second_model = GatedModel(scale=1.0), GatedModel(scale=10.0)
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=50)
+    block_worker(scheduler, first_model)
+
+    old = scheduler.submit(first_model, np.ones(3))
+    new = scheduler.submit(second_model, np.ones(3))
+    first_model.gate.set()
+    assert old.result(5).tolist() == [1, 1, 1]
+    assert new.result(5).tolist() == [10, 10, 10]
+    assert [len(batch) for batch in first_model.batches] == [1, 1]
+    assert [len(batch) for batch in second_model.batches] == [1]
+
+
+def test_full_queue_rejects_immediately():
+    model = GatedModel()
+    scheduler = InferenceScheduler(max_batch_size=1, max_wait_ms=0, max_queue_size=1)
+    block_worker(scheduler, model)
+
+    queued = scheduler.submit(model, np.ones(3))
+    with pytest.raises(SchedulerOverloaded):
+        scheduler.submit(model, np.ones(3))
+    assert scheduler.stats()['rejected'] == 1
+
+    model.gate.set()
+    queued.result(5)
+
+
+def test_timed_out_request_is_dropped_from_the_queue():
+    model = GatedModel()
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=0)
+    block_worker(scheduler, model)
+
+    with pytest.raises(FutureTimeoutError):
+        scheduler.predict(model, np.full(3, 7.0), timeout=0.05)
+    fresh = scheduler.submit(model, np.full(3, 1.0))
+    model.gate.set()
+
+    assert fresh.result(5).tolist() == [1, 1, 1]
+    # The abandoned row never reached the model
+    assert not any((batch == 7.0).all(axis=1).any() for batch in model.batches)
+    assert scheduler.stats()['abandoned'] == 1
+
+
+def test_prediction_errors_reach_every_caller_in_the_batch():
+    class BrokenModel:
+        def predict(self, rows, verbose=0):
+            raise ValueError("bad input")
+
+    model = BrokenModel()
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=20)
+    futures = [scheduler.submit(model, np.ones(3)) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(5)
@@ -0,0 +1,77 @@
+"""Latency histograms, counters and the Prometheus export/parse round trip.
+
+    python -m pytest -q tests/test_metrics.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'website'))
+
+from metrics import (LatencyHistogram, PipelineMetrics, bucket_quantile,  # noqa: E402
+                     parse_stage_histograms, summarize_histogram_delta)
+
+BUCKETS = (0.001, 0.01, 0.1)
+
+
+def bucket_lines(histogram):
+    return [line for line in histogram.render('latency', {}) if '_bucket' in line]
+
+
+def test_observations_land_in_the_first_bucket_that_holds_them():
+    histogram = LatencyHistogram(BUCKETS)
+    for seconds in (0.0005, 0.001, 0.005, 0.05, 1.0):
+        histogram.observe(seconds)
+    assert bucket_lines(histogram) == [
+        'latency_bucket{le="0.001"} 2',  # Upper bounds are inclusive
+        'latency_bucket{le="0.01"} 3',
+        'latency_bucket{le="0.1"} 4',
+        'latency_bucket{le="+Inf"} 5'
+    ]
+
+
+def test_summary_interpolates_percentiles_inside_buckets():
+    histogram = LatencyHistogram(BUCKETS)
+    for _ in range(100):
+        histogram.observe(0.005)
+    summary = histogram.summary()
+    assert summary['count'] == 100
+    assert summary['mean_ms'] == pytest.approx(5.0)
+    assert 1.0 <= summary['p50_ms'] <= 5.0  # Capped at the observed maximum
+    assert summary['p99_ms'] <= summary['max_ms'] == pytest.approx(5.0)
+
+
+def test_quantile_of_the_overflow_bucket_is_capped_at_the_maximum():
+    assert bucket_quantile(BUCKETS, [0, 0, 0, 4], 4, 2.0, 0.5) == pytest.approx(1.05)
+    assert bucket_quantile(BUCKETS, [0, 0, 0, 4], 4, 2.0, 1.0) == pytest.approx(2.0)
+
+
+def test_prometheus_export_parses_back():
+    metrics = PipelineMetrics(prefix='test')
+    metrics.observe('predict', 0.002)
+    metrics.observe('predict', 0.003)
+    metrics.errors.inc(label_value='decode')
+    text = metrics.render_prometheus()
+
+    assert 'test_errors_total{kind="decode"} 1' in text
+    stages = parse_stage_histograms(text, prefix='test')
+    assert stages['predict']['count'] == 2
+    assert stages['predict']['sum'] == pytest.approx(0.005)
+    assert stages['predict']['cumulative'][-1] == 2
+
+
+def test_delta_summary_only_counts_new_observations():
+    metrics = PipelineMetrics(prefix='test')
+    for _ in range(10):
+        metrics.observe('predict', 2.0)
+    before = parse_stage_histograms(metrics.render_prometheus(), prefix='test')['predict']
+    for _ in range(5):
+        metrics.observe('predict', 0.0002)
+    after = parse_stage_histograms(metrics.render_prometheus(), prefix='test')['predict']
+
+    delta = summarize_histogram_delta(before, after)
+    assert delta['count'] == 5
+    assert delta['mean_ms'] == pytest.approx(0.2)
+    assert delta['p99_ms'] <= 0.25  # The earlier 2 s observations are not in the delta
+    assert summarize_histogram_delta(None, after)['count'] == 15
@@ -0,0 +1,63 @@
+"""PredictionCache: quantized keys, LRU eviction and model-version invalidation.
+
+    python -m pytest -q tests/test_prediction_cache.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prediction_cache import PredictionCache  # noqa: E402
+
+LANDMARKS = np.round(np.linspace(0.1, 0.9, 63), 2).astype(np.float32)  # On the 0.01 grid
+PREDICTION = np.array([[0.1, 0.9]], dtype=np.float32)
+
+
+def test_nearby_landmarks_share_an_entry():
+    cache = PredictionCache(precision=0.01)
+    cache.put(cache.make_key(LANDMARKS), PREDICTION)
+    assert np.array_equal(cache.get(cache.make_key(LANDMARKS + 0.001)), PREDICTION)
+    assert cache.get(cache.make_key(LANDMARKS + 0.05)) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_new_model_version_never_sees_old_predictions():
+    cache = PredictionCache()
+    cache.put(cache.make_key(LANDMARKS, model_version=1), PREDICTION)
+    assert cache.get(cache.make_key(LANDMARKS, model_version=2)) is None
+    cache.clear()
+    assert cache.get(cache.make_key(LANDMARKS, model_version=1)) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2, precision=0.01)
+    keys = [cache.make_key(LANDMARKS + i) for i in range(3)]
+    cache.put(keys[0], PREDICTION)
+    cache.put(keys[1], PREDICTION)
+    cache.get(keys[0])  # keys[1] is now the oldest
+    cache.put(keys[2], PREDICTION)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PredictionCache(max_size=0)
+    assert not cache.enabled
+    cache.put(cache.make_key(LANDMARKS), PREDICTION)
+    assert cache.get(cache.make_key(LANDMARKS)) is None
+
+
+def test_stored_predictions_are_read_only_copies():
+    cache = PredictionCache()
+    prediction = PREDICTION.copy()
+    cache.put(cache.make_key(LANDMARKS), prediction)
+    prediction[0, 0] = 1.0
+    cached = cache.get(cache.make_key(LANDMARKS))
+    assert cached[0, 0] == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        cached[0, 0] = 0.5
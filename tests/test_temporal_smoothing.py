@@ -0,0 +1,128 @@
+"""TemporalSmoother: majority vote, consensus threshold, EMA and vote expiry.
+
+BatchTemporalSmoother must give the same results as one TemporalSmoother per
+stream; a random label stream checks that for both methods.
+
+    python -m pytest -q tests/test_temporal_smoothing.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporal_smoothing import BatchTemporalSmoother, SessionSmoothers, TemporalSmoother  # noqa: E402
+
+
+def feed(smoother, labels, confidence=0.9, start=0.0, step=0.1):
+    result = None
+    for i, label in enumerate(labels):
+        result = smoother.update(label, confidence, timestamp=start + i * step)
+    return result
+
+
+def test_majority_label_wins_with_its_mean_confidence():
+    smoother = TemporalSmoother(num_classes=3, window=3)
+    smoother.update(1, 0.8, timestamp=0.0)
+    smoother.update(1, 0.6, timestamp=0.1)
+    label, confidence = smoother.update(2, 0.9, timestamp=0.2)
+    assert label == 1
+    assert confidence == pytest.approx(0.7)
+
+
+def test_tie_goes_to_the_current_label():
+    smoother = TemporalSmoother(num_classes=3, window=2)
+    smoother.update(0, 0.9, timestamp=0.0)
+    assert smoother.update(2, 0.8, timestamp=0.1) == (2, 0.8)
+
+
+def test_oldest_vote_leaves_the_window():
+    smoother = TemporalSmoother(num_classes=3, window=3)
+    assert feed(smoother, [0, 0, 1, 1])[0] == 1
+    assert len(smoother) == 3
+
+
+def test_low_confidence_predictions_do_not_vote():
+    smoother = TemporalSmoother(num_classes=3, window=3, min_confidence=0.5)
+    smoother.update(1, 0.9, timestamp=0.0)
+    assert smoother.update(2, 0.3, timestamp=0.1) == (1, 0.9)
+    assert len(smoother) == 1
+
+
+def test_majority_below_min_consensus_keeps_the_current_prediction():
+    history = [1, 1, 2, 0, 3]  # With the next vote, label 1 holds 2 of 6 votes
+    plain = TemporalSmoother(num_classes=5, window=6)
+    feed(plain, history)
+    assert plain.update(4, 0.4, timestamp=1.0)[0] == 1
+
+    strict = TemporalSmoother(num_classes=5, window=6, min_consensus=0.5)
+    feed(strict, history)
+    assert strict.update(4, 0.4, timestamp=1.0) == (4, 0.4)
+
+
+def test_min_consensus_must_be_a_fraction():
+    with pytest.raises(ValueError):
+        TemporalSmoother(num_classes=3, min_consensus=1.5)
+
+
+def test_ema_reports_the_argmax_of_the_averaged_probabilities():
+    smoother = TemporalSmoother(num_classes=2, window=5, decay=0.5, method='ema')
+    smoother.update(0, 0.9, np.array([0.9, 0.1]), timestamp=0.0)
+    label, confidence = smoother.update(1, 0.7, np.array([0.3, 0.7]), timestamp=0.1)
+    assert label == 0
+    assert confidence == pytest.approx(0.6)
+    assert smoother.probabilities == pytest.approx([0.6, 0.4])
+
+
+def test_votes_expire_after_max_age():
+    smoother = TemporalSmoother(num_classes=3, window=5, max_age=1.0)
+    feed(smoother, [2, 2, 2])
+    assert smoother.update(0, 0.6, timestamp=5.0) == (0, 0.6)
+    assert len(smoother) == 1
+
+
+def test_hold_decays_the_latest_vote():
+    smoother = TemporalSmoother(num_classes=3)
+    assert smoother.hold() == (None, 0.0)
+    smoother.update(1, 0.8, timestamp=0.0)
+    label, confidence = smoother.hold(decay=0.5)
+    assert label == 1 and confidence == pytest.approx(0.4)
+
+
+def test_session_smoothers_are_rebuilt_when_the_window_changes():
+    smoothers = SessionSmoothers(lambda num_classes, window: TemporalSmoother(num_classes, window=window))
+    first = smoothers.get('a', 3, window=3)
+    assert smoothers.get('a', 3, window=3) is first
+    assert smoothers.get('a', 3, window=5) is not first
+    smoothers.discard('a')
+    assert len(smoothers) == 0
+
+
+@pytest.mark.parametrize('method', ['vote', 'ema'])
+@pytest.mark.parametrize('min_consensus', [0.0, 1 / 3, 0.5])
+def test_batch_smoother_matches_one_smoother_per_stream(method, min_consensus):
+    rng = np.random.default_rng(0)
+    streams, classes = 8, 6
+    options = dict(window=6, decay=0.6, method=method, min_confidence=0.5,
+                   min_consensus=min_consensus, max_age=0.5)
+    singles = [TemporalSmoother(classes, **options) for _ in range(streams)]
+    batch = BatchTemporalSmoother(streams, classes, **options)
+
+    now = 0.0
+    for _ in range(400):
+        # Irregular gaps so some votes outlive max_age, and random subsets of streams
+        now += rng.choice([0.03, 0.05, 0.3])
+        active = np.sort(rng.choice(streams, rng.integers(1, streams + 1), replace=False))
+        probabilities = rng.dirichlet(np.ones(classes), len(active))
+        labels = probabilities.argmax(axis=1)
+        confidences = probabilities.max(axis=1) + rng.uniform(0.0, 0.4, len(active))
+
+        batch_labels, batch_confidences = batch.update(active, labels, confidences, probabilities,
+                                                       timestamps=np.full(len(active), now))
+        for i, stream in enumerate(active):
+            label, confidence = singles[stream].update(int(labels[i]), float(confidences[i]),
+                                                      probabilities[i], timestamp=now)
+            assert batch_labels[i] == label
+            assert batch_confidences[i] == pytest.approx(confidence)
@@ -0,0 +1,103 @@
+"""SpeechJobPool: coalescing by key, backpressure and low-priority promotion.
+
+    python -m pytest -q tests/test_tts_jobs.py
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'website'))
+
+from tts_jobs import LOW_PRIORITY, SpeechJobPool, SpeechQueueFull  # noqa: E402
+
+
+@pytest.fixture
+def blocked_pool():
+    """One-worker pool whose worker is stuck in a job until the returned event is set."""
+    pool = SpeechJobPool(workers=1, max_queue_size=4)
+    entered, release = threading.Event(), threading.Event()
+
+    def block():
+        entered.set()
+        release.wait(5)
+
+    pool.submit('block', block)
+    assert entered.wait(5)
+    yield pool, release
+    release.set()
+
+
+def recorder(calls):
+    def run(name):
+        calls.append(name)
+        return name
+    return run
+
+
+def test_requests_for_a_queued_key_share_one_job(blocked_pool):
+    pool, release = blocked_pool
+    calls = []
+    first, coalesced_first = pool.submit('hello', recorder(calls), 'hello')
+    second, coalesced_second = pool.submit('hello', recorder(calls), 'hello')
+    release.set()
+
+    assert second is first
+    assert (coalesced_first, coalesced_second) == (False, True)
+    assert first.result(5) == 'hello'
+    assert calls == ['hello']
+
+
+def test_full_queue_rejects_new_keys(blocked_pool):
+    pool, release = blocked_pool
+    for i in range(4):
+        pool.submit(i, recorder([]), i)
+    with pytest.raises(SpeechQueueFull):
+        pool.submit('one too many', recorder([]), 'x')
+    pool.submit(0, recorder([]), 0)  # Coalescing still works when full
+    assert pool.stats()['rejected'] == 1
+
+
+def test_user_requests_run_before_low_priority_work(blocked_pool):
+    pool, release = blocked_pool
+    calls = []
+    background, _ = pool.submit('precompute', recorder(calls), 'precompute', priority=LOW_PRIORITY)
+    user, _ = pool.submit('speak', recorder(calls), 'speak')
+    release.set()
+    background.result(5)
+    user.result(5)
+    assert calls == ['speak', 'precompute']
+
+
+def test_user_request_promotes_a_queued_background_job(blocked_pool):
+    pool, release = blocked_pool
+    calls = []
+    pool.submit('bye', recorder(calls), 'bye', priority=LOW_PRIORITY)
+    queued, _ = pool.submit('hello', recorder(calls), 'hello', priority=LOW_PRIORITY)
+    promoted, coalesced = pool.submit('hello', recorder(calls), 'hello')
+    release.set()
+
+    assert coalesced and promoted is queued
+    promoted.result(5)
+    pool.submit('sync', recorder(calls), 'sync', priority=LOW_PRIORITY)[0].result(5)
+    assert calls == ['hello', 'bye', 'sync']  # Promoted job ran once, ahead of the older one
+
+
+def test_failed_job_reports_its_error_and_frees_the_key():
+    pool = SpeechJobPool(workers=1)
+
+    def fail():
+        raise RuntimeError("no backend")
+
+    future, _ = pool.submit('hello', fail)
+    with pytest.raises(RuntimeError):
+        future.result(5)
+    deadline = time.time() + 5
+    while pool.stats()['pending_jobs'] and time.time() < deadline:  # The worker drops the key after the result
+        time.sleep(0.01)
+    retry, coalesced = pool.submit('hello', lambda: 'ok')
+    assert not coalesced
+    assert retry.result(5) == 'ok'
+    assert pool.stats()['failed'] == 1
@@ -0,0 +1,251 @@
+"""Cached overlay layers for the tester's on-screen UI.
+
+Most of the UI never changes: the key instructions, the hand guide box and
+its label. They are rendered once per frame size into a layer (a BGR image
+plus a mask of the drawn pixels) and copied onto each frame with a single
+cv2.copyTo call instead of a putText / rectangle call per element.
+
+The parts that do change (hand status, prediction text, confidence bar, FPS)
+each get a layer cut tight around what they draw. A layer is re-rendered
+only when the value it shows changes, so a held sign costs a few small
+copies per frame. The FPS readout is refreshed a few times per second
+rather than on every frame.
+
+The mask is the drawing's coverage (0-255). Fully covered pixels are copied;
+OpenCV builds that anti-alias text also leave partially covered edge pixels,
+which are alpha-blended from a precomputed index list, so the result matches
+drawing directly on the frame (to within rounding).
+
+    overlay = UIOverlay()
+    overlay.draw(frame, 'hello', 0.93, True, 29.7, confidence_threshold=0.7)
+"""
+import time
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+INSTRUCTIONS = [
+    "Press 'q' to quit",
+    "Press 'c' to clear history",
+    "Press 'r' to restart camera",
+    "Press 'd' to toggle debug",
+    "Press 'e' for emergency mode"
+]
+GUIDE_BOX_SIZE = 250
+CONFIDENCE_BAR_WIDTH = 300
+CONFIDENCE_BAR_HEIGHT = 20
+FPS_REFRESH_SECONDS = 0.25
+CHANNEL_OFFSETS = np.arange(3)
+
+# Compositing order: later layers cover earlier ones, as the direct drawing calls did
+LAYER_ORDER = ('status', 'prediction', 'confidence_bar', 'confidence_label', 'fps', 'static')
+
+
+class OverlayLayer:
+    """BGR image (drawn on black) and coverage mask for one region of a frame_width wide frame.
+
+    An opaque layer replaces its whole region (e.g. the confidence bar and its
+    background), so drawing skips the mask.
+    """
+
+    def __init__(self, x, y, width, height, frame_width, opaque=False):
+        self.x, self.y = x, y
+        self.frame_width = frame_width
+        self.opaque = opaque
+        self.image = np.zeros((height, width, 3), dtype=np.uint8)
+        self.mask = np.full((height, width), 255 if opaque else 0, dtype=np.uint8)
+        self._opaque = self.mask
+        self._edge_rows = self._edge_cols = self._edge_index = None
+
+    def put_text(self, text, org, scale, color, thickness):
+        """cv2.putText with org in frame coordinates."""
+        org = (org[0] - self.x, org[1] - self.y)
+        cv2.putText(self.image, text, org, FONT, scale, color, thickness)
+        if not self.opaque:
+            cv2.putText(self.mask, text, org, FONT, scale, 255, thickness)
+
+    def rectangle(self, pt1, pt2, color, thickness):
+        """cv2.rectangle with corners in frame coordinates."""
+        pt1, pt2 = (pt1[0] - self.x, pt1[1] - self.y), (pt2[0] - self.x, pt2[1] - self.y)
+        cv2.rectangle(self.image, pt1, pt2, color, thickness)
+        if not self.opaque:
+            cv2.rectangle(self.mask, pt1, pt2, 255, thickness)
+
+    def finish(self):
+        """Split the mask into copied and blended pixels once drawing is done."""
+        if self.opaque:
+            return self
+        self._opaque = cv2.threshold(self.mask, 254, 255, cv2.THRESH_BINARY)[1]
+        if cv2.countNonZero(self._opaque) == cv2.countNonZero(self.mask):
+            return self  # Nothing partially covered
+        height, width = self.mask.shape
+        flat_mask = self.mask.reshape(-1)
+        edges = np.flatnonzero(flat_mask - self._opaque.reshape(-1))
+        self._edge_rows, self._edge_cols = np.divmod(edges, width)
+        # Byte offsets in a contiguous frame, and the blend terms: out = frame * (1 - a) + image
+        pixels = (self._edge_rows + self.y) * self.frame_width + self._edge_cols + self.x
+        self._edge_index = np.repeat(pixels * 3, 3) + np.tile(CHANNEL_OFFSETS, len(pixels))
+        self._edge_keep = np.repeat((255 - flat_mask[edges]) / np.float32(255), 3)
+        self._edge_add = self.image.reshape(-1, 3)[edges].reshape(-1) + np.float32(0.5)
+        return self
+
+    def composite(self, frame):
+        height, width = self.mask.shape
+        roi = frame[self.y:self.y + height, self.x:self.x + width]
+        if self.opaque:
+            roi[:] = self.image
+            return
+        cv2.copyTo(self.image, self._opaque, roi)
+        if self._edge_index is None:
+            return
+        if frame.flags.c_contiguous and frame.shape[1] == self.frame_width:
+            flat = frame.reshape(-1)
+            blended = flat[self._edge_index] * self._edge_keep
+            blended += self._edge_add
+            flat[self._edge_index] = blended.astype(np.uint8)
+        else:
+            blended = roi[self._edge_rows, self._edge_cols].reshape(-1) * self._edge_keep + self._edge_add
+            roi[self._edge_rows, self._edge_cols] = blended.astype(np.uint8).reshape(-1, 3)
+
+
+def text_bounds(text, org, scale, thickness):
+    """(x1, y1, x2, y2) around cv2.putText(text, org, ...), with a margin for the stroke."""
+    (width, height), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    margin = thickness + 2
+    return org[0] - margin, org[1] - height - margin, org[0] + width + margin, org[1] + baseline + margin
+
+
+class UIOverlay:
+    """Static layer per frame size plus value-keyed layers for everything that changes."""
+
+    def __init__(self):
+        self.frame_size = None
+        self.layers = {}
+        self.keys = {}
+        self.renders = 0  # Layer renders, static ones included
+        self._fps_text = None
+        self._fps_refreshed_at = 0.0
+
+    def draw(self, frame, sign_name, confidence, hand_detected, fps, confidence_threshold=0.7):
+        height, width = frame.shape[:2]
+        if (width, height) != self.frame_size:
+            self._build(width, height)
+        hand_detected = bool(hand_detected)
+        self._update('status', hand_detected, self._render_status, hand_detected)
+
+        if sign_name and confidence >= confidence_threshold:
+            text = f"{sign_name} ({confidence:.1%})"
+            filled_width = int(CONFIDENCE_BAR_WIDTH * confidence)
+            self._update('prediction', text, self._render_prediction, text)
+            self._update('confidence_bar', filled_width, self._render_confidence_bar, filled_width)
+            self._update('confidence_label', True, self._render_confidence_label)
+        else:
+            if sign_name:
+                text = f"Low confidence: {confidence:.1%}"
+                self._update('prediction', text, self._render_low_confidence, text)
+            else:
+                self._update('prediction', None, None)
+            self._update('confidence_bar', None, None)
+            self._update('confidence_label', None, None)
+
+        now = time.perf_counter()
+        if self._fps_text is None or now - self._fps_refreshed_at >= FPS_REFRESH_SECONDS:
+            self._fps_text = f"FPS: {fps:.1f}"
+            self._fps_refreshed_at = now
+        self._update('fps', self._fps_text, self._render_fps, self._fps_text)
+
+        for name in LAYER_ORDER:
+            layer = self.layers[name]
+            if layer is not None:
+                layer.composite(frame)
+        return frame
+
+    def _update(self, name, key, render, *args):
+        """Re-render a layer with render(*args) only when the value it shows changed.
+
+        key None (with render None) hides the layer.
+        """
+        if name in self.keys and self.keys[name] == key:
+            return
+        self.keys[name] = key
+        self.layers[name] = render(*args).finish() if render is not None else None
+        if render is not None:
+            self.renders += 1
+
+    def _layer(self, x1, y1, x2, y2, opaque=False):
+        """Empty layer over frame pixels x1..x2 / y1..y2 (inclusive), clipped to the frame."""
+        width, height = self.frame_size
+        x1, y1 = min(max(x1, 0), width), min(max(y1, 0), height)
+        x2, y2 = min(max(x2 + 1, x1), width), min(max(y2 + 1, y1), height)
+        return OverlayLayer(x1, y1, x2 - x1, y2 - y1, width, opaque)
+
+    def _build(self, width, height):
+        self.frame_size = (width, height)
+        self.layers, self.keys = {}, {}
+        self._fps_text = None
+        self._update('static', (width, height), self._render_static)
+
+    def _render_static(self):
+        width, height = self.frame_size
+        layer = self._layer(0, 0, width - 1, height - 1)
+        for i, instruction in enumerate(INSTRUCTIONS):
+            y_pos = height - 30 - (i * 25)
+            layer.put_text(instruction, (10, y_pos), 0.5, (255, 255, 255), 1)
+
+        # Hand bounding box guide
+        center_x, center_y = width // 2, height // 2
+        x1 = center_x - GUIDE_BOX_SIZE // 2
+        y1 = center_y - GUIDE_BOX_SIZE // 2
+        x2 = center_x + GUIDE_BOX_SIZE // 2
+        y2 = center_y + GUIDE_BOX_SIZE // 2
+        layer.rectangle((x1, y1), (x2, y2), (0, 255, 0), 2)
+        layer.put_text("Place hand here", (x1, y1 - 10), 0.6, (0, 255, 0), 2)
+        return layer
+
+    def _render_status(self, hand_detected):
+        status_color = (0, 255, 0) if hand_detected else (0, 0, 255)
+        status_text = "Hand Detected" if hand_detected else "Show Hand in Frame"
+        layer = self._layer(*text_bounds(status_text, (10, 30), 0.7, 2))
+        layer.put_text(status_text, (10, 30), 0.7, status_color, 2)
+        return layer
+
+    def _render_prediction(self, text):
+        color = (0, 255, 0)  # Green for high confidence
+
+        # Background for better text visibility
+        text_size = cv2.getTextSize(text, FONT, 1.2, 3)[0]
+        text_x, text_y = 10, 70
+        box = (text_x, text_y - text_size[1] - 10, text_x + text_size[0] + 10, text_y + 10)
+        # Descenders (the baseline part of getTextSize) hang below the box, so the layer spans both
+        bounds = text_bounds(text, (text_x, text_y), 1.2, 3)
+        layer = self._layer(min(box[0], bounds[0]), min(box[1], bounds[1]),
+                            max(box[2], bounds[2]), max(box[3], bounds[3]))
+        layer.rectangle(box[:2], box[2:], (0, 0, 0), -1)
+        layer.put_text(text, (text_x, text_y), 1.2, color, 3)
+        return layer
+
+    def _render_confidence_bar(self, filled_width):
+        bar_x, bar_y = 10, 100
+        layer = self._layer(bar_x, bar_y, bar_x + CONFIDENCE_BAR_WIDTH, bar_y + CONFIDENCE_BAR_HEIGHT,
+                            opaque=True)
+        layer.rectangle((bar_x, bar_y), (bar_x + CONFIDENCE_BAR_WIDTH, bar_y + CONFIDENCE_BAR_HEIGHT),
+                        (50, 50, 50), -1)
+        layer.rectangle((bar_x, bar_y), (bar_x + filled_width, bar_y + CONFIDENCE_BAR_HEIGHT), (0, 255, 0), -1)
+        return layer
+
+    def _render_confidence_label(self):
+        layer = self._layer(*text_bounds("Confidence", (10, 95), 0.6, 2))
+        layer.put_text("Confidence", (10, 95), 0.6, (255, 255, 255), 2)
+        return layer
+
+    def _render_low_confidence(self, text):
+        layer = self._layer(*text_bounds(text, (10, 70), 0.8, 2))
+        layer.put_text(text, (10, 70), 0.8, (0, 165, 255), 2)  # Orange for medium confidence
+        return layer
+
+    def _render_fps(self, fps_text):
+        org = (self.frame_size[0] - 120, 30)
+        layer = self._layer(*text_bounds(fps_text, org, 0.7, 2))
+        layer.put_text(fps_text, org, 0.7, (255, 255, 255), 2)
+        return layer
@@ -0,0 +1,123 @@
+"""Warm-up passes for the classifier and MediaPipe before real frames arrive.
+
+The first predict() at a new batch size traces a TensorFlow graph and the first
+frames through a MediaPipe Hands graph initialize its calculators; both cost
+hundreds of milliseconds that would otherwise land on the first user. These
+helpers run representative inputs once at startup (and after a model swap):
+
+- warm_up_classifier: synthetic landmark batches at every size the inference
+  scheduler can form.
+- warm_up_hands: frames at the camera resolution, taken from a sample clip
+  when one is available so the landmark sub-graph runs too, followed by blank
+  frames so no tracking state leaks into the first real session.
+"""
+import os
+import time
+
+import numpy as np
+
+DEFAULT_FRAME_SIZE = (640, 480)
+DEFAULT_WARMUP_FRAMES = 8
+DEFAULT_CLASSIFIER_ITERATIONS = 2
+# Blank frames appended to a warm-up run: MediaPipe drops the tracked hand
+TRAILING_BLANK_FRAMES = 2
+
+DEFAULT_WARMUP_VIDEO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'website', 'assets', 'videos', 'alphabet', 'A.mp4')
+
+
+def parse_frame_size(value, default=DEFAULT_FRAME_SIZE):
+    """'640x480' -> (640, 480); falls back to default on malformed input."""
+    try:
+        width, height = (int(part) for part in str(value).lower().split('x'))
+        if width > 0 and height > 0:
+            return width, height
+    except ValueError:
+        pass
+    return default
+
+
+def scheduler_batch_sizes(max_batch_size):
+    """Powers of two up to max_batch_size, plus max_batch_size itself."""
+    sizes = []
+    size = 1
+    while size < max_batch_size:
+        sizes.append(size)
+        size *= 2
+    sizes.append(max(1, max_batch_size))
+    return sizes
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def warm_up_classifier(model, batch_sizes=(1,), iterations=DEFAULT_CLASSIFIER_ITERATIONS):
+    """Run random landmark batches of each size through model.predict."""
+    rng = np.random.default_rng(0)
+    input_dim = model.input_shape[-1]
+    started = time.perf_counter()
+    timings = {}
+
+    for batch_size in batch_sizes:
+        batch = rng.random((batch_size, input_dim), dtype=np.float32)
+        calls = []
+        for _ in range(max(1, iterations)):
+            call_started = time.perf_counter()
+            model.predict(batch, verbose=0)
+            calls.append(_elapsed_ms(call_started))
+        timings[batch_size] = {'first_ms': calls[0], 'last_ms': calls[-1]}
+
+    return {
+        'batch_sizes': list(batch_sizes),
+        'timings': timings,
+        'duration_ms': _elapsed_ms(started)
+    }
+
+
+def warmup_frames(frame_size=DEFAULT_FRAME_SIZE, count=DEFAULT_WARMUP_FRAMES, video_path=DEFAULT_WARMUP_VIDEO):
+    """BGR frames at frame_size (width, height): clip frames if readable, else noise."""
+    import cv2  # Deferred like mediapipe: the server imports this module before it needs OpenCV
+
+    frames = []
+    if video_path and os.path.exists(video_path):
+        cap = cv2.VideoCapture(video_path)
+        try:
+            while len(frames) < count:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames.append(cv2.resize(frame, frame_size, interpolation=cv2.INTER_LINEAR))
+        finally:
+            cap.release()
+
+    rng = np.random.default_rng(0)
+    width, height = frame_size
+    while len(frames) < count:
+        frames.append(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+    frames.extend(np.zeros((height, width, 3), dtype=np.uint8) for _ in range(TRAILING_BLANK_FRAMES))
+    return frames
+
+
+def warm_up_hands(tracker, frames):
+    """Feed frames (BGR) through a Hands tracker the way the frame pipeline does."""
+    import cv2
+
+    started = time.perf_counter()
+    timings = []
+    for frame in frames:
+        frame_started = time.perf_counter()
+        tracker.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+        timings.append(_elapsed_ms(frame_started))
+
+    if hasattr(tracker, 'reset'):
+        tracker.reset()  # RoiHandTracker: start the first session from a full-frame detection
+
+    return {
+        'frames': len(frames),
+        'frame_size': list(frames[0].shape[1::-1]) if frames else None,
+        'first_frame_ms': timings[0] if timings else None,
+        'last_frame_ms': timings[-1] if timings else None,
+        'duration_ms': _elapsed_ms(started)
+    }
@@ -1,21 +1,59 @@
 import base64
 import io
 import os
+import sys
 import json
 import time
 import logging
+import uuid
 from datetime import datetime
-from collections import deque
-from flask import Flask, render_template, request, jsonify, Response
-import cv2
-import numpy as np
-import mediapipe as mp
-import tensorflow as tf
-from gtts import gTTS
-import pygame                                                                                                                                                                                                                                                                                                                                                                                                                                                                              
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+from functools import wraps
 import threading
 from typing import Dict, List, Optional, Tuple
 
+# Startup report: everything from here to the end of this module counts as "app import"
+APP_IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, request, jsonify, Response, send_file
+import numpy as np
+
+from lazy_imports import import_report, lazy_import, preload, record_phase
+
+# Heavy stacks are imported on first use (or by the background startup thread):
+# mediapipe alone pulls in TensorFlow and takes seconds, OpenCV ~150 ms
+mp = lazy_import('mediapipe', 'hand tracking')
+cv2 = lazy_import('cv2', 'frame decoding and colour conversion')
+pygame = lazy_import('pygame', 'server-side audio playback')
+
+# Shared inference modules live in the project root, next to real_time_tester.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from model_registry import ModelRegistry
+from model_slot import ModelReloadInProgress, ModelSlot
+from warmup import (DEFAULT_WARMUP_FRAMES, DEFAULT_WARMUP_VIDEO, parse_frame_size, scheduler_batch_sizes,
+                    warm_up_classifier, warm_up_hands, warmup_frames)
+from roi_tracking import DEFAULT_DETECTION_MAX_SIDE, DEFAULT_WORKING_SIZE, RoiHandTracker
+from prediction_cache import DEFAULT_CACHE_PRECISION, DEFAULT_CACHE_SIZE, PredictionCache
+from frame_gating import (DEFAULT_LANDMARK_THRESHOLD, DEFAULT_MOTION_THRESHOLD, FrameGate,
+                          SessionFrameGates)
+from hand_tracker_pool import HandTrackerPool, TrackerPoolExhausted
+from temporal_smoothing import DEFAULT_DECAY, SessionSmoothers, TemporalSmoother
+from inference_scheduler import InferenceScheduler, SchedulerOverloaded
+from tts_engine import (DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, DEFAULT_RATE, DEFAULT_VOICE, AudioCache,
+                        TextToSpeech, audio_mimetype, normalize_text)
+from tts_jobs import LOW_PRIORITY, SpeechJobPool, SpeechQueueFull
+from metrics import PROMETHEUS_CONTENT_TYPE, PipelineMetrics
+
+# Optional WebSocket support for streaming translation sessions
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
 # Configure logging with proper encoding for Windows
 logging.basicConfig(
     level=logging.INFO,
@@ -27,56 +65,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ASL_WEB_ONLY=1: serve the website pages only - MediaPipe, the model and TTS are never loaded
+WEB_ONLY = os.getenv('ASL_WEB_ONLY', '0').lower() in ('1', 'true', 'yes')
+# Load the inference stack in a background thread so pages are served right away
+BACKGROUND_INIT = os.getenv('ASL_BACKGROUND_INIT', '1').lower() not in ('0', 'false', 'no')
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False  # Maintain response order
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+sock = Sock(app) if Sock is not None else None
 
 # Global variables with thread safety
 translation_history = []
-model = None
-model_loaded = False
-model_load_attempts = 0
-MAX_LOAD_ATTEMPTS = 5
 
-# Define class names based on your dataset
-class_names = ['bye', 'hello', 'yes', 'no', 'thank_you', 'perfect']
+# Classifier runtime: keras | numpy | tflite | tflite_int8 | onnx (see inference_backends.py;
+# tflite_int8 confidences are not calibrated against the float backends)
+INFERENCE_BACKEND = os.getenv('ASL_INFERENCE_BACKEND', 'keras').lower()
+
+# Define class names based on your dataset (used when the manifest has no class mapping)
+DEFAULT_CLASS_NAMES = ['bye', 'hello', 'yes', 'no', 'thank_you', 'perfect']
 
 # Thread-safe data structures
-import threading
 history_lock = threading.Lock()
-tts_lock = threading.Lock()
-model_lock = threading.Lock()
+mixer_lock = threading.Lock()  # One pygame mixer for the whole server
+
+# ROI tracking: after the first detection only a crop around the hand goes through MediaPipe.
+# Full-frame detection runs downscaled to ASL_DETECTION_MAX_SIDE pixels (0 = full resolution).
+ROI_TRACKING = os.getenv('ASL_ROI_TRACKING', '1').lower() not in ('0', 'false', 'no')
+ROI_WORKING_SIZE = int(os.getenv('ASL_ROI_WORKING_SIZE', str(DEFAULT_WORKING_SIZE)))
+DETECTION_MAX_SIDE = int(os.getenv('ASL_DETECTION_MAX_SIDE', str(DEFAULT_DETECTION_MAX_SIDE)))
+
+# Per-session hand tracker pool limits. The default budget is one MediaPipe Hands instance per
+# CPU; an ROI tracker holds two, so it gets half as many trackers.
+HANDS_PER_TRACKER = RoiHandTracker.HANDS_PER_TRACKER if ROI_TRACKING else 1
+MAX_HAND_TRACKERS = int(os.getenv('ASL_MAX_HAND_TRACKERS',
+                                  str(max(1, (os.cpu_count() or 4) // HANDS_PER_TRACKER))))
+HAND_TRACKER_IDLE_TIMEOUT = float(os.getenv('ASL_HAND_TRACKER_IDLE_TIMEOUT', '60'))
+
+def create_mediapipe_hands():
+    """Build one MediaPipe Hands instance with EXACT same settings as real_time_tester.py"""
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,  # EXACTLY like standalone
+        model_complexity=0,  # EXACTLY like standalone - Reduced for stability
+        min_detection_confidence=0.6,  # EXACTLY like standalone
+        min_tracking_confidence=0.5,   # EXACTLY like standalone
+    )
+
+# Frame gating: skip detection on static no-hand frames, reuse predictions for a steady hand
+FRAME_GATING = os.getenv('ASL_FRAME_GATING', '1').lower() not in ('0', 'false', 'no')
+MOTION_THRESHOLD = float(os.getenv('ASL_MOTION_THRESHOLD', str(DEFAULT_MOTION_THRESHOLD)))
+LANDMARK_REUSE_THRESHOLD = float(os.getenv('ASL_LANDMARK_REUSE_THRESHOLD', str(DEFAULT_LANDMARK_THRESHOLD)))
+
+frame_gates = SessionFrameGates(
+    lambda: FrameGate(motion_threshold=MOTION_THRESHOLD, landmark_threshold=LANDMARK_REUSE_THRESHOLD),
+    idle_timeout=HAND_TRACKER_IDLE_TIMEOUT
+)
+
+# Classifier outputs keyed on quantized landmarks; cleared whenever the model changes
+prediction_cache = PredictionCache(
+    max_size=int(os.getenv('ASL_PREDICTION_CACHE_SIZE', str(DEFAULT_CACHE_SIZE))),
+    precision=float(os.getenv('ASL_PREDICTION_CACHE_PRECISION', str(DEFAULT_CACHE_PRECISION)))
+)
+
+def create_hands_tracker():
+    """Build one per-session tracker (ROI-cropped unless ASL_ROI_TRACKING=0)."""
+    if ROI_TRACKING:
+        return RoiHandTracker(create_mediapipe_hands, working_size=ROI_WORKING_SIZE,
+                              detection_max_side=DETECTION_MAX_SIDE or None)
+    return create_mediapipe_hands()
 
 # ULTRA ROBUST MediaPipe Hands initialization (EXACTLY like real_time_tester.py)
 def initialize_mediapipe():
-    """Initialize MediaPipe with EXACT same settings as real_time_tester.py"""
+    """Verify MediaPipe works and build the per-session hand tracker pool."""
     max_retries = 3
     for attempt in range(max_retries):
         try:
             logger.info(f"🔄 Initializing MediaPipe (Attempt {attempt + 1}/{max_retries})...")
             
             # Import MediaPipe components
-            mp_hands = mp.solutions.hands
             mp_drawing = mp.solutions.drawing_utils
             mp_drawing_styles = mp.solutions.drawing_styles
             
-            # EXACT SAME SETTINGS as real_time_tester.py
-            hands = mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,  # EXACTLY like standalone
-                model_complexity=0,  # EXACTLY like standalone - Reduced for stability
-                min_detection_confidence=0.6,  # EXACTLY like standalone
-                min_tracking_confidence=0.5,   # EXACTLY like standalone
-            )
-            
             # Test MediaPipe with a dummy frame
+            test_tracker = create_hands_tracker()
             test_frame = np.zeros((100, 100, 3), dtype=np.uint8)
             rgb_frame = cv2.cvtColor(test_frame, cv2.COLOR_BGR2RGB)
-            _ = hands.process(rgb_frame)
+            _ = test_tracker.process(rgb_frame)
+            test_tracker.close()
             
-            logger.info("✅ MediaPipe initialized successfully (matched standalone settings)")
-            return hands, mp_drawing, mp_drawing_styles
+            tracker_pool = HandTrackerPool(
+                create_hands_tracker,
+                max_trackers=MAX_HAND_TRACKERS,
+                idle_timeout=HAND_TRACKER_IDLE_TIMEOUT
+            )
+            
+            logger.info(f"✅ MediaPipe initialized successfully (up to {MAX_HAND_TRACKERS} session trackers, "
+                        f"{MAX_HAND_TRACKERS * HANDS_PER_TRACKER} Hands instances)")
+            return tracker_pool, mp_drawing, mp_drawing_styles
             
         except Exception as e:
             logger.error(f"❌ MediaPipe initialization failed (Attempt {attempt + 1}): {e}")
@@ -85,142 +172,166 @@ def initialize_mediapipe():
                 return None, None, None
             time.sleep(1)  # Wait before retry
 
-# Initialize MediaPipe
-hands, mp_drawing, mp_drawing_styles = initialize_mediapipe()
+# Built by initialize_inference_stack() - never at import time
+hand_tracker_pool, mp_drawing, mp_drawing_styles = None, None, None
+inference_stack = {
+    'state': 'disabled' if WEB_ONLY else 'pending',  # pending | loading | ready | failed | disabled
+    'duration_ms': None
+}
+
+# Micro-batching of classifier calls across concurrent requests
+inference_scheduler = InferenceScheduler(
+    max_batch_size=int(os.getenv('ASL_BATCH_MAX_SIZE', '32')),
+    max_wait_ms=float(os.getenv('ASL_BATCH_MAX_WAIT_MS', '4'))
+)
+
+# Prediction smoothing per session (same engine as real_time_tester.py): majority vote over the
+# last smoothing_frames confident predictions of the past 2 seconds, or ASL_SMOOTHING_METHOD=ema.
+# The majority only replaces the current prediction with a third of the votes behind it.
+SMOOTHING_METHOD = os.getenv('ASL_SMOOTHING_METHOD', 'vote').lower()
+SMOOTHING_DECAY = float(os.getenv('ASL_SMOOTHING_DECAY', str(DEFAULT_DECAY)))
+SMOOTHING_MAX_AGE = float(os.getenv('ASL_SMOOTHING_MAX_AGE', '2.0'))
+SMOOTHING_MIN_CONSENSUS = float(os.getenv('ASL_SMOOTHING_MIN_CONSENSUS', str(1 / 3)))
+
+prediction_smoothers = SessionSmoothers(
+    lambda num_classes, window: TemporalSmoother(
+        num_classes, window=window, decay=SMOOTHING_DECAY, method=SMOOTHING_METHOD,
+        min_confidence=0.5, min_consensus=SMOOTHING_MIN_CONSENSUS, max_age=SMOOTHING_MAX_AGE
+    ),
+    idle_timeout=HAND_TRACKER_IDLE_TIMEOUT
+)
+
+# Speech synthesis: ordered backends (gtts needs network, pyttsx3 works offline) over a disk cache
+speech_engine = TextToSpeech(
+    backend_names=os.getenv('ASL_TTS_BACKENDS', 'gtts,pyttsx3').split(','),
+    cache=AudioCache(
+        cache_dir=os.getenv('ASL_TTS_CACHE_DIR', DEFAULT_CACHE_DIR),
+        max_bytes=int(float(os.getenv('ASL_TTS_CACHE_MB', str(DEFAULT_CACHE_MAX_BYTES / 1024 / 1024))) * 1024 * 1024)
+    ),
+    voice=os.getenv('ASL_TTS_VOICE', DEFAULT_VOICE),
+    rate=float(os.getenv('ASL_TTS_RATE', str(DEFAULT_RATE)))
+)
+
+# Longest text either TTS endpoint synthesizes: every clip costs a synthesis and a file in the cache
+TTS_MAX_TEXT_LENGTH = int(os.getenv('ASL_TTS_MAX_TEXT_LENGTH', '200'))
 
-# NEW: Enhanced prediction smoothing with EXACT same logic as real_time_tester.py
-prediction_history = deque(maxlen=3)  # EXACTLY 3 frames like standalone for fast response
-last_valid_prediction = "No hand detected"
-last_valid_confidence = 0.0
+# Where /api/text_to_speech plays audio: 'server' (pygame on this machine) or 'client' (audio bytes returned)
+TTS_PLAYBACK = os.getenv('ASL_TTS_PLAYBACK', 'server').lower()
 
-# NEW: Enhanced TTS request tracking with better debouncing
-tts_requests = {}
-active_tts_requests = set()
-last_tts_cleanup = time.time()
+# Synthesis / playback runs on a few workers; identical pending texts share one job
+TTS_JOB_TIMEOUT = 30.0
+tts_jobs = SpeechJobPool(
+    workers=int(os.getenv('ASL_TTS_WORKERS', '2')),
+    max_queue_size=int(os.getenv('ASL_TTS_QUEUE_SIZE', '32'))
+)
 
-# NEW: Performance monitoring with enhanced metrics
+# NEW: Performance monitoring with enhanced metrics (updated under stats_lock)
+stats_lock = threading.Lock()
 performance_stats = {
     'total_frames_processed': 0,
     'average_processing_time': 0,
     'last_processing_time': 0,
     'start_time': time.time(),
     'consecutive_errors': 0,
-    'last_successful_frame': time.time()
+    'last_successful_frame': time.time(),
+    'detection_skips': 0,
+    'detection_skip_rate': 0,
+    'prediction_reuses': 0,
+    'prediction_reuse_rate': 0
 }
 
-def load_model_with_fallbacks(attempt=1) -> bool:
-    """ULTRA ROBUST model loading with multiple fallback paths EXACTLY like real_time_tester.py"""
-    global model, model_loaded, model_load_attempts, class_names
-    
-    if model_load_attempts >= MAX_LOAD_ATTEMPTS:
-        logger.error("🚨 Maximum model load attempts reached")
-        return False
-        
-    model_load_attempts += 1
-    logger.info(f"🔄 Attempting to load model (attempt {model_load_attempts}/{MAX_LOAD_ATTEMPTS})...")
-    
-    # EXACT SAME model candidates as real_time_tester.py
-    model_candidates = []
-    
-    # Primary paths (RELATIVE paths that work on any laptop)
-    primary_paths = [
-        '../models/final_asl_model_20251026_144942.h5',
-        '../models/best_asl_model_20251026_144813.h5',
-        '../models/asl_model.h5',
-        './models/final_asl_model_20251026_144942.h5',
-        './models/best_asl_model_20251026_144813.h5',
-        './models/asl_model.h5',
-    ]
-    
-    # Look for model files with various patterns (like standalone)
-    model_patterns = [
-        'final_asl_model_*.h5',
-        'best_asl_model_*.h5', 
-        'asl_model_*.h5',
-        'model_*.h5',
-        '*.h5'  # Any .h5 file as last resort
-    ]
-    
-    # Collect all possible model candidates
-    for pattern in model_patterns:
-        for root, dirs, files in os.walk('.'):
-            for file in files:
-                if file.endswith('.h5') and pattern.replace('*', '') in file:
-                    full_path = os.path.join(root, file)
-                    if full_path not in model_candidates:
-                        model_candidates.append(full_path)
-    
-    # Add primary paths
-    for path in primary_paths:
-        if os.path.exists(path) and path not in model_candidates:
-            model_candidates.insert(0, path)  # Prioritize primary paths
-    
-    # Try to load each candidate
-    loaded_path = None
-    model_errors = []
-    
-    for model_candidate in model_candidates:
-        try:
-            logger.info(f"🔄 Attempting to load: {model_candidate}")
-            
-            with model_lock:
-                model = tf.keras.models.load_model(model_candidate)
-            
-            # Load class mapping (RELATIVE paths that work on any laptop)
-            class_mapping_paths = [
-                '../models/class_mapping.json',
-                './models/class_mapping.json',
-                'models/class_mapping.json',
-                'class_mapping.json'
-            ]
-            
-            for mapping_path in class_mapping_paths:
-                if os.path.exists(mapping_path):
-                    try:
-                        with open(mapping_path, 'r', encoding='utf-8') as f:
-                            class_mapping = json.load(f)
-                        # Convert to list maintaining index order
-                        class_names = [class_mapping.get(str(i), f"Sign_{i}") for i in range(len(class_mapping))]
-                        logger.info(f"📊 Class mapping loaded: {class_names}")
-                        break
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not load class mapping from {mapping_path}: {e}")
-            
-            # Use default class names if no mapping found
-            if not class_names:
-                class_names = ['bye', 'hello', 'yes', 'no', 'thank_you', 'perfect']
-                logger.info(f"📊 Using default class names: {class_names}")
-            
-            logger.info(f"✅ Model loaded successfully: {model_candidate}")
-            logger.info(f"📐 Model input shape: {model.input_shape}")
-            logger.info(f"📐 Model output shape: {model.output_shape}")
-            logger.info(f"🎯 Available signs: {class_names}")
-            
-            model_loaded = True
-            return True
-            
-        except Exception as e:
-            error_msg = f"❌ Failed to load model {model_candidate}: {str(e)}"
-            model_errors.append(error_msg)
-            logger.error(error_msg)
-            continue
-    
-    # If we reach here, no model was loaded successfully
-    if not model_errors:
-        logger.error("❌ No model files found in any location")
-    else:
-        logger.error("💥 All model loading attempts failed")
-        for error in model_errors[-5:]:  # Show last 5 errors
-            logger.error(f"   - {error}")
-    
-    # Retry after delay if we haven't exceeded max attempts
-    if attempt < MAX_LOAD_ATTEMPTS:
-        retry_delay = 2 ** attempt  # Exponential backoff
-        logger.info(f"🔄 Retrying model load in {retry_delay} seconds... (attempt {attempt + 1}/{MAX_LOAD_ATTEMPTS})")
-        time.sleep(retry_delay)
-        return load_model_with_fallbacks(attempt + 1)
+# Per-stage latency histograms and counters, exported on /metrics
+metrics = PipelineMetrics()
+metrics_detection_skips = metrics.add_counter('detection_skips_total', 'Frames where the motion gate skipped MediaPipe')
+metrics_prediction_reuses = metrics.add_counter('prediction_reuses_total', 'Predictions reused for a steady hand')
+metrics_prediction_cache_hits = metrics.add_counter('prediction_cache_hits_total', 'Predictions served from the cache')
+# Gauges are read at scrape time, so they may refer to globals defined further down
+metrics.add_gauge('ready', 'Model loaded and warmed up (1) or not (0)', lambda: application_ready())
+metrics.add_gauge('model_version', 'Version of the model currently serving',
+                  lambda: model_slot.active.version if model_slot.active else 0)
+metrics.add_gauge('inference_queue_depth', 'Landmark vectors waiting for the batch scheduler',
+                  lambda: inference_scheduler.stats()['queue_depth'])
+
+def count_error(kind: str) -> int:
+    """Record a failed frame; returns the consecutive error count."""
+    metrics.errors.inc(label_value=kind)
+    with stats_lock:
+        performance_stats['consecutive_errors'] += 1
+        return performance_stats['consecutive_errors']
+
+def load_registered_model(model_name: Optional[str] = None):
+    """Load the registry's active model (or model_name) for INFERENCE_BACKEND; returns (model, record).
+
+    models/manifest.json names the artifact directly, so this is one lookup plus a
+    checksum/shape validation, however many files sit in the tree. A missing
+    manifest is rebuilt once from the models directory.
+    """
+    registry = ModelRegistry.locate()
+    if not registry.exists:
+        logger.warning(f"⚠️ No manifest in {registry.models_dir} - indexing it now")
+        registry.rebuild()
+        registry.save()
     
-    return False
+    new_model, record = registry.load(INFERENCE_BACKEND, model_name)
+    logger.info(f"📦 Loaded {record['name']} ({record['path']}, backend: {INFERENCE_BACKEND})")
+    logger.info(f"📐 Model input shape: {new_model.input_shape}, output shape: {new_model.output_shape}")
+    return new_model, record
+
+# Startup warm-up: classifier at every scheduler batch size, MediaPipe at camera resolution
+WARMUP_ENABLED = os.getenv('ASL_WARMUP', '1') != '0'
+WARMUP_FRAME_SIZE = parse_frame_size(os.getenv('ASL_WARMUP_FRAME_SIZE', '640x480'))
+WARMUP_FRAMES = int(os.getenv('ASL_WARMUP_FRAMES', str(DEFAULT_WARMUP_FRAMES)))
+WARMUP_VIDEO = os.getenv('ASL_WARMUP_VIDEO', DEFAULT_WARMUP_VIDEO)
+WARMUP_SPARE_TRACKERS = int(os.getenv('ASL_WARMUP_SPARE_TRACKERS', '1'))
+
+warmup_status = {
+    'state': 'pending',  # pending | running | ready | disabled
+    'classifier': None,
+    'mediapipe': None,
+    'duration_ms': None
+}
+
+def warm_up_model(loaded):
+    """Run the candidate at every batch size the scheduler forms before it serves requests."""
+    if not WARMUP_ENABLED:
+        return
+    result = warm_up_classifier(loaded.model, scheduler_batch_sizes(inference_scheduler.max_batch_size))
+    warmup_status['classifier'] = {'model': loaded.name, 'version': loaded.version, **result}
+    logger.info(f"🔥 Classifier warmed up for batch sizes {result['batch_sizes']} in {result['duration_ms']}ms")
+
+def warm_up_hand_trackers():
+    """Prepare warmed spare trackers so a new session never starts on a cold graph."""
+    frames = warmup_frames(WARMUP_FRAME_SIZE, WARMUP_FRAMES, WARMUP_VIDEO)
+    result = hand_tracker_pool.prewarm(WARMUP_SPARE_TRACKERS, lambda tracker: warm_up_hands(tracker, frames))
+    warmup_status['mediapipe'] = result
+    if result:
+        logger.info(f"🔥 MediaPipe warmed up at {WARMUP_FRAME_SIZE[0]}x{WARMUP_FRAME_SIZE[1]}: "
+                    f"first frame {result['first_frame_ms']}ms, last {result['last_frame_ms']}ms")
+
+def application_ready() -> bool:
+    """Model loaded and startup warm-up finished: first requests run at steady-state latency.
+
+    Web-only workers are ready as soon as they can serve pages.
+    """
+    if WEB_ONLY:
+        return True
+    return model_slot.active is not None and warmup_status['state'] in ('ready', 'disabled')
+
+def on_model_swap(loaded):
+    """Remembered and cached predictions came from the previous model."""
+    frame_gates.clear()
+    prediction_cache.clear()
+    prediction_smoothers.clear()
+    logger.info(f"🎯 Available signs: {loaded.class_names}")
+
+# Double-buffered model: request threads read model_slot.active without locking;
+# reloads load, warm up and validate in the background, then swap atomically
+model_slot = ModelSlot(load_registered_model, warmup=warm_up_model, on_swap=on_model_swap,
+                       default_class_names=DEFAULT_CLASS_NAMES)
+
+def current_class_names() -> List[str]:
+    loaded = model_slot.active
+    return loaded.class_names if loaded is not None else DEFAULT_CLASS_NAMES
 
 def process_frame_for_prediction(hand_landmarks) -> Optional[np.ndarray]:
     """Extract and preprocess hand landmarks for model prediction with validation."""
@@ -289,84 +400,37 @@ def draw_mediapipe_landmarks(frame, hand_landmarks):
         logger.error(f"❌ Error drawing MediaPipe landmarks: {e}")
         return frame
 
-def smooth_prediction(current_prediction: str, current_confidence: float, smoothing_frames: int = 3) -> Tuple[str, float]:
-    """Apply temporal smoothing to predictions EXACTLY like real_time_tester.py."""
-    global prediction_history, last_valid_prediction, last_valid_confidence
-    
-    # Add current prediction to history if valid (lowered threshold for better detection)
-    if current_prediction != "No hand detected" and current_confidence > 0.5:
-        prediction_history.append((current_prediction, current_confidence, time.time()))
-    
-    # Remove old entries (keep only last 2 seconds) - EXACTLY like standalone
-    current_time = time.time()
-    prediction_history = deque(
-        [entry for entry in prediction_history if current_time - entry[2] < 2.0],
-        maxlen=smoothing_frames
-    )
-    
-    # If no valid predictions in history, return current
-    if not prediction_history:
-        return current_prediction, current_confidence
-    
-    # Find the most common prediction in recent history (EXACT algorithm from standalone)
-    recent_predictions = list(prediction_history)
-    predictions = [pred for pred, conf, ts in recent_predictions]
-    
-    try:
-        most_common_pred = max(set(predictions), key=predictions.count)
-        
-        # Calculate weighted confidence for the most common prediction
-        relevant_confidences = [conf for pred, conf, ts in recent_predictions if pred == most_common_pred]
-        avg_confidence = np.mean(relevant_confidences) if relevant_confidences else current_confidence
-        
-        # Only update if we have enough evidence (reduced requirement for faster response)
-        if predictions.count(most_common_pred) >= max(1, len(recent_predictions) // 3):
-            last_valid_prediction = most_common_pred
-            last_valid_confidence = avg_confidence
-            return last_valid_prediction, last_valid_confidence
-        else:
-            # Not enough consensus, return current prediction
-            return current_prediction, current_confidence
-    
-    except Exception as e:
-        logger.warning(f"⚠️ Smoothing failed, using current prediction: {e}")
-        # Fallback to current prediction if smoothing fails
-        return current_prediction, current_confidence
+def smooth_prediction(session_id: str, class_names: List[str], class_index: int, confidence: float,
+                      probabilities: Optional[np.ndarray] = None, smoothing_frames: int = 3) -> Tuple[str, float]:
+    """Smooth one prediction over the session's recent predictions (see temporal_smoothing)."""
+    smoother = prediction_smoothers.get(session_id, len(class_names), max(1, smoothing_frames))
+    label, smoothed_confidence = smoother.update(class_index, confidence, probabilities)
+    return class_names[label], smoothed_confidence
 
-def cleanup_old_tts_requests():
-    """Clean up old TTS requests to prevent memory leaks."""
-    global last_tts_cleanup
-    current_time = time.time()
-    
-    # Only cleanup every 30 seconds to avoid performance impact
-    if current_time - last_tts_cleanup < 30:
-        return
-        
-    last_tts_cleanup = current_time
-    old_requests = []
-    
-    with tts_lock:
-        for req_id, timestamp in list(tts_requests.items()):
-            if current_time - timestamp > 30.0:  # 30 seconds
-                old_requests.append(req_id)
-        
-        for old_req in old_requests:
-            tts_requests.pop(old_req, None)
-            active_tts_requests.discard(old_req)
+def precompute_sign_speech():
+    """TTS job: queue every uncached class name for synthesis at low priority.
 
-def cleanup_audio_file(audio_file: str):
-    """Safely cleanup audio files with retries."""
-    max_retries = 3
-    for attempt in range(max_retries):
+    Runs on a TTS worker (checking availability imports the backends) and
+    uses the same job keys as user requests, so speaking a sign while its
+    clip is still queued shares that job.
+    """
+    if not speech_engine.available:
+        logger.warning("⚠️ No TTS backend available - speech is disabled")
+        return
+    class_names = current_class_names()
+    queued = 0
+    for name in class_names:
+        if speech_engine.cached(name) is not None:
+            continue
         try:
-            if os.path.exists(audio_file):
-                os.remove(audio_file)
-                logger.debug(f"✅ Cleaned up audio file: {audio_file}")
-                break
-        except Exception as e:
-            if attempt == max_retries - 1:
-                logger.error(f"❌ Failed to cleanup audio file {audio_file}: {e}")
-            time.sleep(0.1)
+            tts_jobs.submit(('synthesize', normalize_text(name)), speech_engine.synthesize, name,
+                            priority=LOW_PRIORITY)
+            queued += 1
+        except SpeechQueueFull:
+            logger.warning("⚠️ TTS queue is full - remaining signs are synthesized on first use")
+            break
+    logger.info(f"🔊 Queued speech precompute for {queued}/{len(class_names)} signs "
+                f"({len(class_names) - queued} already cached or skipped)")
 
 # Email Configuration and Functions
 try:
@@ -472,6 +536,15 @@ def send_contact_email(name, sender_email, subject, message):
         raise e
 
 # Routes
+def requires_inference_stack(view):
+    """Answer 503 on web-only workers, which never load MediaPipe, the model or TTS."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if WEB_ONLY:
+            return jsonify({'error': 'This worker serves the website only (ASL_WEB_ONLY=1)'}), 503
+        return view(*args, **kwargs)
+    return wrapper
+
 @app.route('/')
 def home():
     """Serve the home page."""
@@ -512,337 +585,775 @@ def serve_assets(filename):
     assets_dir = os.path.join(os.path.dirname(__file__), 'assets')
     return send_from_directory(assets_dir, filename)
 
-@app.route('/video_feed', methods=['POST'])
-@app.route('/api/process_frame', methods=['POST'])
-def process_frame():
-    """ULTRA ROBUST endpoint to process frames with EXACT same logic as real_time_tester.py"""
-    global performance_stats, prediction_history
-    
-    start_time = time.time()
-    processing_start = time.perf_counter()
-    
-    if request.method != 'POST':
-        return jsonify({'error': 'Method not allowed'}), 405
+# Content types accepted as a raw (non-base64) frame body
+BINARY_FRAME_CONTENT_TYPES = ('application/octet-stream', 'image/jpeg', 'image/webp')
 
-    data = request.get_json()
+# Headers carrying frame settings for binary uploads (JSON clients send them in the body),
+# with the type each value is parsed to so both paths hand classification the same settings
+FRAME_SETTING_HEADERS = {
+    'confidence_threshold': ('X-Confidence-Threshold', float),
+    'smoothing_frames': ('X-Smoothing-Frames', int),
+    'request_timestamp': ('X-Request-Timestamp', float),
+    'frame_id': ('X-Frame-Id', int),
+    'session_id': ('X-Session-Id', str),
+}
+
+def read_frame_payload() -> Tuple[Optional[np.ndarray], Dict, Optional[str]]:
+    """Read the encoded frame and its settings from the current request.
+
+    Three upload formats are accepted:
+      * raw JPEG/WebP bytes (application/octet-stream, image/jpeg, image/webp)
+        with settings in X-* headers,
+      * multipart/form-data with a 'frame' file and an optional 'settings' JSON field,
+      * the legacy JSON body with a base64 data URL in 'image'.
+
+    Returns (encoded_buffer, settings, error_message). The buffer is a zero-copy
+    uint8 view over the request bytes, ready for cv2.imdecode.
+    """
+    content_type = (request.mimetype or '').lower()
+
+    if content_type in BINARY_FRAME_CONTENT_TYPES:
+        # Read straight from the request stream - no JSON parse, no base64 round trip
+        raw_bytes = request.stream.read()
+        if not raw_bytes:
+            return None, {}, 'No image data received'
+        settings = {}
+        for key, (header, parse) in FRAME_SETTING_HEADERS.items():
+            if header in request.headers:
+                try:
+                    settings[key] = parse(request.headers[header])
+                except ValueError:
+                    return None, {}, f'Invalid {header} header: {request.headers[header]!r}'
+        return np.frombuffer(raw_bytes, np.uint8), settings, None
+
+    if content_type == 'multipart/form-data':
+        frame_file = request.files.get('frame')
+        if frame_file is None:
+            return None, {}, 'No image data received'
+        raw_bytes = frame_file.stream.read()
+        if not raw_bytes:
+            return None, {}, 'No image data received'
+        settings = {}
+        if request.form.get('settings'):
+            try:
+                settings = json.loads(request.form['settings'])
+            except ValueError:
+                return None, {}, 'Invalid settings JSON'
+        return np.frombuffer(raw_bytes, np.uint8), settings, None
+
+    # Legacy JSON path: base64 data URL inside the body
+    data = request.get_json(silent=True)
     if not data or 'image' not in data:
-        return jsonify({'error': 'No image data received'}), 400
+        return None, {}, 'No image data received'
 
+    image_data = data['image']
+    if ',' in image_data:
+        image_data = image_data.split(',')[1]
     try:
-        # Get settings from request
-        confidence_threshold = float(data.get('confidence_threshold', 0.6))  # Lowered for better detection
-        smoothing_frames = int(data.get('smoothing_frames', 3))  # EXACTLY like standalone
-        request_timestamp = data.get('request_timestamp', time.time())
-        
-        # Decode base64 image
-        image_data = data['image']
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
-        
-        nparr = np.frombuffer(base64.b64decode(image_data), np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        with metrics.stage('base64_decode'):
+            decoded = base64.b64decode(image_data)
+    except (ValueError, TypeError):
+        return None, {}, 'Invalid base64 image data'
+    return np.frombuffer(decoded, np.uint8), data, None
 
-        if frame is None:
-            performance_stats['consecutive_errors'] += 1
-            return jsonify({'error': 'Could not decode image'}), 400
+def request_session_fallback() -> str:
+    """Session key for clients that do not send a session id."""
+    try:
+        return f"addr-{request.remote_addr}"
+    except RuntimeError:  # Outside a request context
+        return "anonymous"
+
+def frame_session_id(settings: Dict) -> str:
+    """Session a frame belongs to; keys its tracker and frame gate."""
+    return str(settings.get('session_id') or request_session_fallback())
 
+def release_session(session_id: str):
+    """Free a finished session's tracker, frame gate and smoothing history right away."""
+    if hand_tracker_pool is not None:
+        hand_tracker_pool.release(session_id)
+    frame_gates.discard(session_id)
+    prediction_smoothers.discard(session_id)
+
+def translate_frame(frame: np.ndarray, settings: Dict, processing_start: float) -> Dict:
+    """Run the decoded BGR frame through MediaPipe, then classify_landmarks.
+
+    Returns the response payload shared by every frame ingest path.
+    """
+    # Each session gets its own warm tracker; fall back to the client address
+    session_id = frame_session_id(settings)
+
+    # Static scene and no hand last time: nothing for MediaPipe to find
+    gate = frame_gates.get(session_id) if FRAME_GATING else None
+    if gate is not None and not gate.should_detect(frame):
+        with stats_lock:
+            performance_stats['detection_skips'] += 1
+        metrics_detection_skips.inc()
+        return classify_landmarks(None, [], 0, settings, processing_start)
+
+    with metrics.stage('color_convert'):
         # CRITICAL FIX: Flip frame horizontally EXACTLY like real_time_tester.py for natural interaction
         # This creates the mirror effect that users expect
         frame = cv2.flip(frame, 1)
         
         # Convert BGR to RGB for MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
+    with hand_tracker_pool.checkout(session_id) as tracker:
+        with metrics.stage('hands_process'):
+            results = tracker.process(rgb_frame)
+    if gate is not None:
+        gate.record_detection(bool(results.multi_hand_landmarks))
+
+    hand_count = 0
+    processed_landmarks = None
+    landmark_data = []
+
+    if results.multi_hand_landmarks:
+        hand_count = len(results.multi_hand_landmarks)
         
-        # Process with MediaPipe
-        if hands is None:
-            return jsonify({'error': 'MediaPipe not initialized'}), 500
-            
-        results = hands.process(rgb_frame)
+        # Process only the first hand for prediction (EXACTLY like standalone version)
+        hand_landmarks = results.multi_hand_landmarks[0]
+        
+        # CRITICAL FIX: Extract landmark coordinates with MIRRORED x-coordinates
+        # This ensures keypoints match the mirrored video display
+        landmark_data = extract_landmark_coordinates(hand_landmarks, frame.shape)
+        
+        # Extract landmarks for prediction (using original coordinates for model)
+        processed_landmarks = process_frame_for_prediction(hand_landmarks)
 
-        prediction_text = "No hand detected"
-        confidence = 0.0
-        raw_confidence = 0.0
-        landmarks_detected = False
-        hand_count = 0
-        processed_landmarks = None
-        landmark_data = []
-        smoothed_prediction = None
-
-        if results.multi_hand_landmarks:
-            hand_count = len(results.multi_hand_landmarks)
-            landmarks_detected = True
-            
-            # Process only the first hand for prediction (EXACTLY like standalone version)
-            hand_landmarks = results.multi_hand_landmarks[0]
-            
-            # CRITICAL FIX: Extract landmark coordinates with MIRRORED x-coordinates
-            # This ensures keypoints match the mirrored video display
-            landmark_data = extract_landmark_coordinates(hand_landmarks, frame.shape)
-            
-            # Extract landmarks for prediction (using original coordinates for model)
-            processed_landmarks = process_frame_for_prediction(hand_landmarks)
-            
-            if processed_landmarks is not None and model_loaded:
-                try:
-                    # Make prediction
-                    with model_lock:
-                        predictions = model.predict(processed_landmarks, verbose=0)
-                    raw_confidence = float(np.max(predictions))
-                    predicted_class_index = np.argmax(predictions)
+    return classify_landmarks(processed_landmarks, landmark_data, hand_count, settings, processing_start)
+
+# Inference queue full, or a queued prediction not served in time: the server is busy, not broken
+INFERENCE_BUSY_ERRORS = (SchedulerOverloaded, FutureTimeoutError)
+
+def classify_landmarks(processed_landmarks: Optional[np.ndarray], landmark_data: List[Dict], hand_count: int,
+                       settings: Dict, processing_start: float, pending_prediction=None, loaded=None) -> Dict:
+    """Classify one hand's (1, 63) landmark row, smooth it and build the response payload.
+
+    hand_count == 0 means no hand was seen. pending_prediction may carry a
+    future already submitted to the inference scheduler (batched landmark uploads)
+    for the model snapshot `loaded`. Without one, the active model is used.
+    A full or stalled inference queue raises (INFERENCE_BUSY_ERRORS) so callers
+    can report backpressure instead of a prediction error.
+    """
+    global performance_stats
+
+    # One snapshot for the whole request: a concurrent swap never mixes models
+    if loaded is None:
+        loaded = model_slot.active
+
+    # Get settings from request
+    confidence_threshold = float(settings.get('confidence_threshold', 0.6))  # Lowered for better detection
+    smoothing_frames = int(settings.get('smoothing_frames', 3))  # EXACTLY like standalone
+
+    prediction_text = "No hand detected"
+    confidence = 0.0
+    raw_confidence = 0.0
+    landmarks_detected = hand_count > 0
+    smoothed_prediction = None
+
+    if landmarks_detected:
+        if processed_landmarks is not None and loaded is not None:
+            try:
+                # Hand held steady: reuse the last prediction instead of running the model
+                gate = frame_gates.get(frame_session_id(settings)) if FRAME_GATING and pending_prediction is None else None
+                predictions = gate.reused_prediction(processed_landmarks) if gate is not None else None
+
+                if predictions is not None:
+                    with stats_lock:
+                        performance_stats['prediction_reuses'] += 1
+                    metrics_prediction_reuses.inc()
+                else:
+                    # Same (quantized) landmarks seen before: skip inference entirely
+                    cache_key = (prediction_cache.make_key(processed_landmarks, loaded.version)
+                                 if prediction_cache.enabled else None)
+                    if cache_key is not None and pending_prediction is None:
+                        predictions = prediction_cache.get(cache_key)
+
+                    if predictions is not None:
+                        metrics_prediction_cache_hits.inc()
+                    else:
+                        with metrics.stage('predict'):
+                            if pending_prediction is not None:
+                                predictions = inference_scheduler.wait(pending_prediction, timeout=5.0).reshape(1, -1)
+                            else:
+                                # Make prediction (batched with other concurrent requests)
+                                predictions = inference_scheduler.predict(loaded.model, processed_landmarks)
+                        if cache_key is not None:
+                            prediction_cache.put(cache_key, predictions)
+
+                    if gate is not None and model_slot.active is loaded:
+                        gate.remember_prediction(processed_landmarks, predictions)
+                raw_confidence = float(np.max(predictions))
+                predicted_class_index = np.argmax(predictions)
+                
+                if predicted_class_index < len(loaded.class_names):
+                    predicted_class = loaded.class_names[predicted_class_index]
                     
-                    if predicted_class_index < len(class_names):
-                        predicted_class = class_names[predicted_class_index]
+                    # Apply confidence threshold (EXACTLY like standalone)
+                    if raw_confidence > confidence_threshold:
+                        prediction_text = predicted_class
+                        confidence = raw_confidence
                         
-                        # Apply confidence threshold (EXACTLY like standalone)
-                        if raw_confidence > confidence_threshold:
-                            prediction_text = predicted_class
-                            confidence = raw_confidence
-                            
-                            # Apply smoothing (EXACTLY like standalone)
+                        # Apply smoothing (EXACTLY like standalone)
+                        with metrics.stage('smoothing'):
                             smoothed_prediction, smoothed_confidence = smooth_prediction(
-                                prediction_text, confidence, smoothing_frames
+                                frame_session_id(settings), loaded.class_names, int(predicted_class_index),
+                                confidence, predictions, smoothing_frames
                             )
-                            prediction_text = smoothed_prediction
-                            confidence = smoothed_confidence
-                            
-                            # Add to translation history with thread safety
-                            translation_entry = {
-                                'timestamp': datetime.now().strftime("%H:%M:%S"),
-                                'text': prediction_text,
-                                'confidence': round(float(confidence), 3),
-                                'raw_confidence': round(float(raw_confidence), 3)
-                            }
-                            
-                            with history_lock:
-                                translation_history.append(translation_entry)
-                                # Keep only last 50 entries
-                                if len(translation_history) > 50:
-                                    translation_history.pop(0)
-                        else:
-                            prediction_text = "Low confidence"
-                            confidence = raw_confidence
+                        prediction_text = smoothed_prediction
+                        confidence = smoothed_confidence
+                        
+                        # Add to translation history with thread safety
+                        translation_entry = {
+                            'timestamp': datetime.now().strftime("%H:%M:%S"),
+                            'text': prediction_text,
+                            'confidence': round(float(confidence), 3),
+                            'raw_confidence': round(float(raw_confidence), 3)
+                        }
+                        
+                        with history_lock:
+                            translation_history.append(translation_entry)
+                            # Keep only last 50 entries
+                            if len(translation_history) > 50:
+                                translation_history.pop(0)
                     else:
-                        prediction_text = "Unknown sign"
+                        prediction_text = "Low confidence"
                         confidence = raw_confidence
-                        
-                except Exception as e:
-                    logger.error(f"❌ Prediction error: {e}")
-                    prediction_text = "Prediction error"
-                    performance_stats['consecutive_errors'] += 1
-            else:
-                if not model_loaded:
-                    prediction_text = "Model not loaded"
                 else:
-                    prediction_text = "Landmark processing failed"
+                    prediction_text = "Unknown sign"
+                    confidence = raw_confidence
+                    
+            except INFERENCE_BUSY_ERRORS:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Prediction error: {e}")
+                prediction_text = "Prediction error"
+                count_error('prediction')
         else:
-            # Reset prediction history when no hand is detected for too long (like standalone)
-            current_time = time.time()
-            if prediction_history:
-                last_pred_time = prediction_history[-1][2] if prediction_history else 0
-                if current_time - last_pred_time > 2.0:  # 2 seconds without hand (like standalone)
-                    prediction_history.clear()
-            prediction_text = "No hand detected"
-
-        # Calculate processing time
-        processing_time = round((time.time() - start_time) * 1000, 2)
-        perf_processing_time = round((time.perf_counter() - processing_start) * 1000, 2)
-        
-        # Update performance stats
+            if loaded is None:
+                prediction_text = "Model not loaded"
+            else:
+                prediction_text = "Landmark processing failed"
+    else:
+        # The session's smoothing history expires on its own after SMOOTHING_MAX_AGE without a hand
+        prediction_text = "No hand detected"
+
+    # Calculate processing time
+    perf_processing_time = round((time.perf_counter() - processing_start) * 1000, 2)
+    
+    metrics.frames.inc()
+    if landmarks_detected:
+        metrics.hands_detected.inc()
+    if prediction_text == "Low confidence":
+        metrics.low_confidence.inc()
+    
+    # Update performance stats
+    with stats_lock:
         performance_stats['total_frames_processed'] += 1
         performance_stats['last_processing_time'] = perf_processing_time
         performance_stats['average_processing_time'] = (
             (performance_stats['average_processing_time'] * (performance_stats['total_frames_processed'] - 1) + perf_processing_time) 
             / performance_stats['total_frames_processed']
         )
+        performance_stats['detection_skip_rate'] = round(
+            performance_stats['detection_skips'] / performance_stats['total_frames_processed'], 3
+        )
+        performance_stats['prediction_reuse_rate'] = round(
+            performance_stats['prediction_reuses'] / performance_stats['total_frames_processed'], 3
+        )
         
         # Reset error counter on success
         if prediction_text not in ["Prediction error", "Model not loaded", "Landmark processing failed"]:
             performance_stats['consecutive_errors'] = 0
             performance_stats['last_successful_frame'] = time.time()
         
-        response_data = {
-            'success': True,
-            'prediction': prediction_text,
-            'confidence': round(float(confidence), 3),
-            'raw_confidence': round(float(raw_confidence), 3),
-            'landmarks_detected': landmarks_detected,
-            'hand_count': hand_count,
-            'processing_time_ms': perf_processing_time,
-            'model_loaded': model_loaded,
-            'timestamp': datetime.now().isoformat(),
-            'landmarks': landmark_data,  # Now with MIRRORED x-coordinates
-            'smoothed_prediction': smoothed_prediction if smoothed_prediction else prediction_text,
-            'performance': {
-                'fps_estimate': round(1000 / perf_processing_time, 1) if perf_processing_time > 0 else 0,
-                'total_frames': performance_stats['total_frames_processed'],
-                'avg_processing_time': round(performance_stats['average_processing_time'], 2),
-                'consecutive_errors': performance_stats['consecutive_errors']
-            }
+        total_frames = performance_stats['total_frames_processed']
+        average_processing_time = performance_stats['average_processing_time']
+        consecutive_errors = performance_stats['consecutive_errors']
+    
+    response_data = {
+        'success': True,
+        'prediction': prediction_text,
+        'confidence': round(float(confidence), 3),
+        'raw_confidence': round(float(raw_confidence), 3),
+        'landmarks_detected': landmarks_detected,
+        'hand_count': hand_count,
+        'processing_time_ms': perf_processing_time,
+        'model_loaded': loaded is not None,
+        'model_version': loaded.version if loaded is not None else None,
+        'timestamp': datetime.now().isoformat(),
+        'landmarks': landmark_data,  # Now with MIRRORED x-coordinates
+        'smoothed_prediction': smoothed_prediction if smoothed_prediction else prediction_text,
+        'performance': {
+            'fps_estimate': round(1000 / perf_processing_time, 1) if perf_processing_time > 0 else 0,
+            'total_frames': total_frames,
+            'avg_processing_time': round(average_processing_time, 2),
+            'consecutive_errors': consecutive_errors
         }
+    }
+    if 'frame_id' in settings:
+        response_data['frame_id'] = settings['frame_id']
+
+    logger.debug(f"📊 Frame processed: {prediction_text} ({confidence:.1%}) in {perf_processing_time}ms")
+    return response_data
+
+@app.route('/video_feed', methods=['POST'])
+@app.route('/api/process_frame', methods=['POST'])
+@requires_inference_stack
+def process_frame():
+    """ULTRA ROBUST endpoint to process frames with EXACT same logic as real_time_tester.py
+
+    Accepts raw JPEG/WebP bodies (settings in X-* headers), multipart uploads or
+    the legacy JSON base64 payload - see read_frame_payload.
+    """
+    processing_start = time.perf_counter()
+    
+    if request.method != 'POST':
+        return jsonify({'error': 'Method not allowed'}), 405
+
+    with metrics.stage('parse'):
+        encoded_frame, settings, payload_error = read_frame_payload()
+    if payload_error:
+        metrics.errors.inc(label_value='bad_request')
+        return jsonify({'error': payload_error}), 400
+
+    try:
+        with metrics.stage('jpeg_decode'):
+            frame = cv2.imdecode(encoded_frame, cv2.IMREAD_COLOR)
+
+        if frame is None:
+            count_error('decode')
+            return jsonify({'error': 'Could not decode image'}), 400
+
+        # Process with MediaPipe
+        if hand_tracker_pool is None:
+            if inference_stack['state'] in ('pending', 'loading'):
+                return jsonify({'error': 'Translator is starting up, retry shortly'}), 503
+            return jsonify({'error': 'MediaPipe not initialized'}), 500
 
-        logger.debug(f"📊 Frame processed: {prediction_text} ({confidence:.1%}) in {perf_processing_time}ms")
-        return jsonify(response_data)
+        result = translate_frame(frame, settings, processing_start)
+        with metrics.stage('serialize'):
+            response = jsonify(result)
+        metrics.observe('total', time.perf_counter() - processing_start)
+        return response
+
+    except TrackerPoolExhausted as e:
+        logger.warning(f"⚠️ {e}")
+        metrics.errors.inc(label_value='overloaded')
+        return jsonify({'error': 'Server busy - too many concurrent translators, retry shortly'}), 429
+
+    except INFERENCE_BUSY_ERRORS as e:
+        logger.warning(f"⚠️ Inference busy: {str(e) or 'prediction timed out'}")
+        metrics.errors.inc(label_value='overloaded')
+        return jsonify({'error': 'Server busy - inference queue is full, retry shortly'}), 429
 
     except Exception as e:
         logger.error(f"❌ Error processing frame: {e}")
-        performance_stats['consecutive_errors'] += 1
+        consecutive_errors = count_error('processing')
         return jsonify({
             'success': False,
             'error': f'Processing error: {str(e)}',
-            'consecutive_errors': performance_stats['consecutive_errors']
+            'consecutive_errors': consecutive_errors
         }), 500
 
-@app.route('/text_to_speech', methods=['POST'])
-@app.route('/api/text_to_speech', methods=['POST'])
-def text_to_speech():
-    """ULTRA ROBUST TTS with professional error handling and request debouncing."""
-    data = request.get_json()
-    if not data:
+# Landmark ingest: clients running MediaPipe Hands themselves send 21 x (x, y, z)
+LANDMARK_POINTS = 21
+MAX_LANDMARK_BATCH = 32
+
+def parse_client_landmarks(values, flip_x: bool = False):
+    """Turn client landmarks into an object shaped like MediaPipe's hand_landmarks.
+
+    Accepts a flat list of 63 floats, 21 [x, y, z] lists or 21 {"x", "y", "z"}
+    dicts. Coordinates must come from the mirrored frame (what the server itself
+    tracks on); flip_x mirrors x for landmarks taken from the raw camera image.
+    Returns None if the payload is malformed.
+    """
+    try:
+        if isinstance(values, list) and len(values) == LANDMARK_POINTS * 3 and not isinstance(values[0], (list, dict)):
+            points = [values[i:i + 3] for i in range(0, len(values), 3)]
+        elif isinstance(values, list) and len(values) == LANDMARK_POINTS:
+            points = [(p['x'], p['y'], p.get('z', 0.0)) if isinstance(p, dict) else p for p in values]
+        else:
+            return None
+
+        landmark = []
+        for point in points:
+            x, y, z = (float(v) for v in point)
+            if not all(np.isfinite((x, y, z))):
+                return None
+            landmark.append(SimpleNamespace(x=1.0 - x if flip_x else x, y=y, z=z))
+        return SimpleNamespace(landmark=landmark)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def translate_client_landmarks(hand_landmarks, settings: Dict, processing_start: float,
+                               pending_prediction=None, loaded=None) -> Dict:
+    """Classify client-tracked landmarks; hand_landmarks None means no hand in the frame."""
+    if hand_landmarks is None:
+        return classify_landmarks(None, [], 0, settings, processing_start)
+
+    return classify_landmarks(
+        process_frame_for_prediction(hand_landmarks),
+        extract_landmark_coordinates(hand_landmarks, None),
+        1, settings, processing_start, pending_prediction, loaded
+    )
+
+def submit_landmark_prediction(hand_landmarks, loaded) -> Future:
+    """Future for one hand's prediction by the loaded model: resolved on a cache hit, else scheduled."""
+    processed_landmarks = process_frame_for_prediction(hand_landmarks)
+    if prediction_cache.enabled:
+        cached = prediction_cache.get(prediction_cache.make_key(processed_landmarks, loaded.version))
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+    return inference_scheduler.submit(loaded.model, processed_landmarks)
+
+@app.route('/api/process_landmarks', methods=['POST'])
+@requires_inference_stack
+def process_landmarks():
+    """Classify landmarks tracked in the browser - no image decode or MediaPipe on the server.
+
+    JSON body: {"landmarks": [...]} for one frame or {"batch": [{"landmarks": [...],
+    "frame_id": ...}, ...]} for up to MAX_LANDMARK_BATCH frames, plus the usual
+    confidence_threshold / smoothing_frames / session_id / flip_x settings.
+    "landmarks": null reports a frame without a hand. Each result has the same
+    shape as the /api/process_frame response.
+    """
+    processing_start = time.perf_counter()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({'error': 'No JSON data received'}), 400
-        
-    text = data.get('text', '').strip()
-    request_id = data.get('request_id', f"tts_{int(time.time()*1000)}")
-    
-    if not text:
-        return jsonify({'error': 'No text provided'}), 400
 
-    # Clean up old requests periodically
-    cleanup_old_tts_requests()
+    settings = {key: data[key] for key in ('confidence_threshold', 'smoothing_frames', 'session_id', 'frame_id')
+                if key in data}
+    flip_x = bool(data.get('flip_x', False))
 
-    # Check for duplicate requests with robust debouncing
-    current_time = time.time()
-    with tts_lock:
-        if request_id in tts_requests:
-            # If request was made less than 2 seconds ago, reject as duplicate (like standalone debouncing)
-            if current_time - tts_requests[request_id] < 2.0:
-                logger.warning(f"⚠️ Duplicate TTS request rejected: {request_id}")
-                return jsonify({'error': 'Duplicate TTS request - please wait before speaking again'}), 429
-        
-        # Store request timestamp
-        tts_requests[request_id] = current_time
-        active_tts_requests.add(request_id)
+    if 'batch' in data:
+        batch = data['batch']
+        if not isinstance(batch, list) or not batch:
+            return jsonify({'error': 'batch must be a non-empty list'}), 400
+        if len(batch) > MAX_LANDMARK_BATCH:
+            return jsonify({'error': f'batch is limited to {MAX_LANDMARK_BATCH} frames'}), 400
+        entries = [entry if isinstance(entry, dict) else {'landmarks': entry} for entry in batch]
+    elif 'landmarks' in data:
+        entries = [{'landmarks': data['landmarks']}]
+    else:
+        return jsonify({'error': 'No landmarks provided'}), 400
+
+    hands = []
+    for i, entry in enumerate(entries):
+        if entry.get('landmarks') is None:
+            hands.append(None)
+            continue
+        hand_landmarks = parse_client_landmarks(entry['landmarks'], flip_x)
+        if hand_landmarks is None:
+            return jsonify({'error': f'Invalid landmarks in frame {i}: expected 21 (x, y, z) points'}), 400
+        hands.append(hand_landmarks)
+    metrics.observe('parse', time.perf_counter() - processing_start)
+
+    try:
+        # Queue every uncached row up front so a batch shares one forward pass
+        loaded = model_slot.active
+        pending = [submit_landmark_prediction(hand, loaded) if hand is not None and loaded is not None else None
+                   for hand in hands]
+
+        results = []
+        for entry, hand, pending_prediction in zip(entries, hands, pending):
+            frame_settings = dict(settings)
+            if 'frame_id' in entry:
+                frame_settings['frame_id'] = entry['frame_id']
+            results.append(translate_client_landmarks(hand, frame_settings, processing_start, pending_prediction, loaded))
+
+        with metrics.stage('serialize'):
+            if 'batch' not in data:
+                response = jsonify(results[0])
+            else:
+                response = jsonify({'success': True, 'results': results, 'batch_size': len(results)})
+        metrics.observe('total', time.perf_counter() - processing_start)
+        return response
+
+    except INFERENCE_BUSY_ERRORS as e:
+        logger.warning(f"⚠️ Inference busy: {str(e) or 'prediction timed out'}")
+        metrics.errors.inc(label_value='overloaded')
+        return jsonify({'error': 'Server busy - inference queue is full, retry shortly'}), 429
+
+    except Exception as e:
+        logger.error(f"❌ Error processing landmarks: {e}")
+        consecutive_errors = count_error('processing')
+        return jsonify({
+            'success': False,
+            'error': f'Processing error: {str(e)}',
+            'consecutive_errors': consecutive_errors
+        }), 500
+
+# Streaming sessions: binary frame messages start with a 4-byte big-endian frame id
+STREAM_FRAME_HEADER_BYTES = 4
+
+def compact_prediction_message(response_data: Dict) -> Dict:
+    """Shrink a translate_frame response into a compact streaming message."""
+    flat_landmarks = []
+    for point in response_data['landmarks']:
+        flat_landmarks.extend((round(point['x'], 4), round(point['y'], 4), round(point['z'], 4)))
+
+    return {
+        'type': 'prediction',
+        'frame_id': response_data.get('frame_id'),
+        'prediction': response_data['prediction'],
+        'confidence': response_data['confidence'],
+        'raw_confidence': response_data['raw_confidence'],
+        'hand_count': response_data['hand_count'],
+        'landmarks': flat_landmarks,  # x, y, z triples with MIRRORED x
+        'processing_time_ms': response_data['processing_time_ms']
+    }
+
+def stream_landmarks_reply(message: Dict, session_settings: Dict) -> Dict:
+    """Answer a {"type": "landmarks", "frame_id": ..., "landmarks": [...]} stream message."""
+    processing_start = time.perf_counter()
+    frame_id = message.get('frame_id')
+
+    hand_landmarks = None
+    if message.get('landmarks') is not None:
+        hand_landmarks = parse_client_landmarks(message['landmarks'], bool(session_settings.get('flip_x', False)))
+        if hand_landmarks is None:
+            return {'type': 'error', 'frame_id': frame_id, 'error': 'Invalid landmarks: expected 21 (x, y, z) points'}
 
     try:
+        frame_settings = dict(session_settings, frame_id=frame_id)
+        return compact_prediction_message(translate_client_landmarks(hand_landmarks, frame_settings, processing_start))
+    except INFERENCE_BUSY_ERRORS as e:
+        logger.warning(f"⚠️ Inference busy: {str(e) or 'prediction timed out'}")
+        metrics.errors.inc(label_value='overloaded')
+        return {'type': 'error', 'frame_id': frame_id, 'error': 'Server busy - inference queue is full'}
+    except Exception as e:
+        logger.error(f"❌ Error processing streamed landmarks: {e}")
+        count_error('processing')
+        return {'type': 'error', 'frame_id': frame_id, 'error': f'Processing error: {str(e)}'}
+
+if sock is not None and not WEB_ONLY:
+    @sock.route('/ws/translate')
+    def translate_stream(ws):
+        """Persistent translation session running the same pipeline as /api/process_frame.
+
+        Binary messages carry one frame each: a 4-byte big-endian frame id followed
+        by JPEG/WebP bytes. Text messages are JSON; {"type": "config", ...} updates
+        confidence_threshold / smoothing_frames / flip_x for the rest of the session
+        (session_id is fixed per connection and cannot be set) and {"type": "landmarks", "frame_id": ..., "landmarks": [...]} classifies
+        landmarks tracked on the client (see /api/process_landmarks).
+        Every frame is answered with a compact JSON message tagged with its frame id,
+        so clients can keep several frames in flight.
+        """
+        # The connection is the session: it keeps one tracker for its lifetime and frees it on close
+        session_settings = {'session_id': f"ws-{uuid.uuid4().hex}"}
+        logger.info(f"🔌 Translation stream opened ({session_settings['session_id']})")
+
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    continue
+
+                if isinstance(message, str):
+                    try:
+                        control = json.loads(message)
+                    except ValueError:
+                        control = None
+                    if not isinstance(control, dict):
+                        ws.send(json.dumps({'type': 'error', 'error': 'Invalid JSON message'}))
+                        continue
+                    if control.get('type') == 'config':
+                        for key in ('confidence_threshold', 'smoothing_frames', 'flip_x'):
+                            if key in control:
+                                session_settings[key] = control[key]
+                    elif control.get('type') == 'landmarks':
+                        ws.send(json.dumps(stream_landmarks_reply(control, session_settings), separators=(',', ':')))
+                    continue
+
+                processing_start = time.perf_counter()
+                if len(message) <= STREAM_FRAME_HEADER_BYTES:
+                    ws.send(json.dumps({'type': 'error', 'frame_id': None, 'error': 'Empty frame message'}))
+                    continue
+
+                frame_id = int.from_bytes(message[:STREAM_FRAME_HEADER_BYTES], 'big')
+                try:
+                    with metrics.stage('jpeg_decode'):
+                        frame = cv2.imdecode(
+                            np.frombuffer(message, np.uint8, offset=STREAM_FRAME_HEADER_BYTES),
+                            cv2.IMREAD_COLOR
+                        )
+                    if frame is None:
+                        count_error('decode')
+                        reply = {'type': 'error', 'frame_id': frame_id, 'error': 'Could not decode image'}
+                    elif hand_tracker_pool is None:
+                        reply = {'type': 'error', 'frame_id': frame_id, 'error': 'MediaPipe not initialized'}
+                    else:
+                        frame_settings = dict(session_settings, frame_id=frame_id)
+                        reply = compact_prediction_message(translate_frame(frame, frame_settings, processing_start))
+                except TrackerPoolExhausted as e:
+                    logger.warning(f"⚠️ {e}")
+                    metrics.errors.inc(label_value='overloaded')
+                    reply = {'type': 'error', 'frame_id': frame_id, 'error': 'Server busy - too many concurrent translators'}
+                except INFERENCE_BUSY_ERRORS as e:
+                    logger.warning(f"⚠️ Inference busy: {str(e) or 'prediction timed out'}")
+                    metrics.errors.inc(label_value='overloaded')
+                    reply = {'type': 'error', 'frame_id': frame_id, 'error': 'Server busy - inference queue is full'}
+                except Exception as e:
+                    logger.error(f"❌ Error processing streamed frame: {e}")
+                    count_error('processing')
+                    reply = {'type': 'error', 'frame_id': frame_id, 'error': f'Processing error: {str(e)}'}
+
+                with metrics.stage('serialize'):
+                    payload = json.dumps(reply, separators=(',', ':'))
+                ws.send(payload)
+                metrics.observe('total', time.perf_counter() - processing_start)
+        finally:
+            release_session(session_settings['session_id'])
+            logger.info(f"🔌 Translation stream closed ({session_settings['session_id']})")
+
+def synthesize_speech(text: str) -> Tuple[str, bool]:
+    """Cached clip path for text; cache misses are synthesized on the TTS workers."""
+    audio_file = speech_engine.cached(text)
+    if audio_file is not None:
+        return audio_file, True
+    future, _ = tts_jobs.submit(('synthesize', normalize_text(text)), speech_engine.synthesize, text)
+    return future.result(timeout=TTS_JOB_TIMEOUT)
+
+def play_speech_on_server(audio_file: str) -> str:
+    """TTS job: start playing a synthesized clip on the server's sound card.
+
+    Playback is fire-and-forget; the cached clip stays on disk, so nothing has
+    to wait for it to finish.
+    """
+
+    with mixer_lock:
         # Initialize pygame mixer with robust error handling
         max_mixer_attempts = 3
-        mixer_initialized = False
-        
         for attempt in range(max_mixer_attempts):
             try:
                 if pygame.mixer.get_init() is None:
                     pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-                mixer_initialized = True
                 break
             except Exception as e:
                 logger.warning(f"⚠️ Pygame mixer init failed (attempt {attempt + 1}): {e}")
                 if attempt == max_mixer_attempts - 1:
-                    return jsonify({'error': 'Audio system initialization failed'}), 500
+                    raise RuntimeError('Audio system initialization failed')
                 time.sleep(0.5)
         
-        if not mixer_initialized:
-            return jsonify({'error': 'Audio system unavailable'}), 500
-        
         # Stop any currently playing audio
         try:
             if pygame.mixer.music.get_busy():
                 pygame.mixer.music.stop()
-                time.sleep(0.1)  # Brief pause to ensure clean stop
         except Exception as e:
             logger.warning(f"⚠️ Could not stop previous audio: {e}")
         
-        # Use gTTS for text-to-speech with error handling
-        max_tts_attempts = 2
-        audio_file = None
-        
-        for attempt in range(max_tts_attempts):
-            try:
-                tts = gTTS(text=text, lang='en', slow=False)
-                audio_file = f"temp_audio_{request_id}.mp3"
-                tts.save(audio_file)
-                break
-            except Exception as e:
-                if attempt == max_tts_attempts - 1:
-                    logger.error(f"❌ gTTS generation failed: {e}")
-                    with tts_lock:
-                        active_tts_requests.discard(request_id)
-                    return jsonify({'error': 'Speech generation failed'}), 500
-                time.sleep(1)
-        
         # Load and play audio with error handling
         max_playback_attempts = 2
-        playback_success = False
-        
         for attempt in range(max_playback_attempts):
             try:
                 pygame.mixer.music.load(audio_file)
                 pygame.mixer.music.play()
-                playback_success = True
                 break
             except Exception as e:
                 if attempt == max_playback_attempts - 1:
                     logger.error(f"❌ Audio playback failed: {e}")
-                    cleanup_audio_file(audio_file)
-                    with tts_lock:
-                        active_tts_requests.discard(request_id)
-                    return jsonify({'error': 'Audio playback failed'}), 500
+                    raise RuntimeError('Audio playback failed')
                 time.sleep(0.5)
+
+    return audio_file
+
+def speech_text_error(text: str) -> Optional[str]:
+    """Why text cannot be spoken (empty or too long), or None."""
+    if not text:
+        return 'No text provided'
+    if len(text) > TTS_MAX_TEXT_LENGTH:
+        return f'Text too long ({len(text)} characters, at most {TTS_MAX_TEXT_LENGTH})'
+    return None
+
+def speech_audio_response(text: str):
+    """Serve synthesized speech straight from the audio cache for the browser to play.
+
+    send_file streams the file and answers Range / conditional requests, so
+    <audio> elements can seek and re-use what they already downloaded.
+    """
+    try:
+        audio_file, from_cache = synthesize_speech(text)
+    except SpeechQueueFull as e:
+        logger.warning(f"⚠️ {e}")
+        return jsonify({'error': 'Too many speech requests - please retry shortly'}), 429, {'Retry-After': '1'}
+    except Exception as e:
+        logger.error(f"❌ {e}")
+        return jsonify({'error': 'Speech generation failed'}), 500
+
+    response = send_file(
+        os.path.abspath(audio_file),
+        mimetype=audio_mimetype(audio_file),
+        conditional=True,
+        etag=os.path.splitext(os.path.basename(audio_file))[0],  # Cache key: mtime changes on every cache hit
+        max_age=86400
+    )
+    response.headers['X-TTS-Cached'] = 'true' if from_cache else 'false'
+    return response
+
+@app.route('/api/tts_audio')
+@requires_inference_stack
+def tts_audio():
+    """GET /api/tts_audio?text=hello - audio for an <audio src=...> element."""
+    text = request.args.get('text', '').strip()
+    text_error = speech_text_error(text)
+    if text_error:
+        return jsonify({'error': text_error}), 400
+    return speech_audio_response(text)
+
+@app.route('/text_to_speech', methods=['POST'])
+@app.route('/api/text_to_speech', methods=['POST'])
+@requires_inference_stack
+def text_to_speech():
+    """ULTRA ROBUST TTS on a bounded worker pool; identical pending texts share one job.
+
+    "playback": "client" (or ASL_TTS_PLAYBACK=client) returns the audio bytes
+    instead of playing them on the server's sound card.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
         
-        # Background cleanup function
-        def wait_for_playback():
-            try:
-                start_time = time.time()
-                max_wait_time = 10.0  # Increased timeout for longer texts
-                
-                # Wait for playback to complete with timeout
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                    # Safety timeout
-                    if time.time() - start_time > max_wait_time:
-                        logger.warning(f"⚠️ TTS playback timeout for request: {request_id}")
-                        break
-                
-                # Stop and cleanup
-                try:
-                    pygame.mixer.music.stop()
-                except:
-                    pass
-                
-                # Cleanup audio file
-                cleanup_audio_file(audio_file)
-                
-                # Remove from active requests
-                with tts_lock:
-                    active_tts_requests.discard(request_id)
-                    
-                logger.info(f"✅ TTS playback completed: '{text}' (request: {request_id})")
-                
-            except Exception as e:
-                logger.error(f"❌ TTS cleanup error: {e}")
-                # Ensure cleanup happens even on error
-                cleanup_audio_file(audio_file)
-                with tts_lock:
-                    active_tts_requests.discard(request_id)
-        
-        # Run cleanup in background
-        cleanup_thread = threading.Thread(target=wait_for_playback)
-        cleanup_thread.daemon = True
-        cleanup_thread.start()
-        
-        logger.info(f"🎵 TTS playing: '{text}' (request: {request_id})")
-        return jsonify({
-            'status': 'success', 
-            'message': 'Audio playing',
-            'request_id': request_id,
-            'text_length': len(text)
-        })
+    text = data.get('text', '').strip()
+    request_id = data.get('request_id', f"tts_{int(time.time()*1000)}")
     
+    text_error = speech_text_error(text)
+    if text_error:
+        return jsonify({'error': text_error}), 400
+
+    # Client playback: no shared mixer, the browser plays the returned audio
+    if str(data.get('playback', TTS_PLAYBACK)).lower() == 'client':
+        return speech_audio_response(text)
+
+    try:
+        # Synthesis goes through the shared ('synthesize', ...) job, so it joins a queued or running precompute
+        audio_file, from_cache = synthesize_speech(text)
+        future, coalesced = tts_jobs.submit(('play', normalize_text(text)), play_speech_on_server, audio_file)
+        future.result(timeout=TTS_JOB_TIMEOUT)
+    except SpeechQueueFull as e:
+        logger.warning(f"⚠️ {e}")
+        return jsonify({'error': 'Too many speech requests - please wait before speaking again'}), 429, {'Retry-After': '1'}
+    except FutureTimeoutError:
+        logger.error(f"❌ TTS timed out: '{text}' (request: {request_id})")
+        return jsonify({'error': 'Speech generation timed out'}), 504
     except Exception as e:
         logger.error(f"❌ TTS system error: {e}")
-        # Clean up on error
-        with tts_lock:
-            active_tts_requests.discard(request_id)
-        cleanup_audio_file(audio_file)
-        return jsonify({'error': f'TTS system error: {str(e)}'}), 500
+        return jsonify({'error': str(e)}), 500
+
+    logger.info(f"🎵 TTS playing: '{text}' (request: {request_id})")
+    return jsonify({
+        'status': 'success', 
+        'message': 'Audio playing',
+        'request_id': request_id,
+        'text_length': len(text),
+        'cached': from_cache,
+        'coalesced': coalesced
+    })
 
 @app.route('/get_history')
 @app.route('/api/get_history')
@@ -922,17 +1433,41 @@ def health_check():
     health_status = 'healthy'
     if performance_stats['consecutive_errors'] > 10:
         health_status = 'degraded'
-    if not model_loaded:
+    loaded = model_slot.active
+    ready = application_ready()
+    if WEB_ONLY:
+        health_status = 'web_only'
+    elif inference_stack['state'] in ('pending', 'loading'):
+        health_status = 'starting'
+    elif loaded is None:
         health_status = 'unhealthy'
+    elif not ready:
+        health_status = 'warming_up'
     
+    reload_status = model_slot.status()
     return jsonify({
         'status': health_status,
-        'model_loaded': model_loaded,
-        'mediapipe_initialized': hands is not None,
+        'ready': ready,
+        'web_only': WEB_ONLY,
+        'inference_stack': inference_stack,
+        'model_loaded': loaded is not None,
+        'mediapipe_initialized': hand_tracker_pool is not None,
         'translation_history_count': len(translation_history),
-        'model_load_attempts': model_load_attempts,
+        'model_load_attempts': reload_status['reloads_started'],
+        'model': {
+            'name': loaded.name,
+            'version': loaded.version,
+            'backend': loaded.record['backend'],
+            'sha256': loaded.record['sha256'],
+            'created': loaded.record['created']
+        } if loaded else None,
+        'model_reload': {
+            'state': reload_status['state'],
+            'progress': reload_status['progress']
+        },
+        'warmup': warmup_status,
         'timestamp': datetime.now().isoformat(),
-        'class_names': class_names,
+        'class_names': loaded.class_names if loaded else DEFAULT_CLASS_NAMES,
         'version': '3.0.0',
         'performance': {
             'uptime_seconds': round(uptime, 2),
@@ -942,38 +1477,72 @@ def health_check():
             'consecutive_errors': performance_stats['consecutive_errors'],
             'seconds_since_last_success': round(current_time - performance_stats['last_successful_frame'], 2)
         },
+        'hand_trackers': hand_tracker_pool.stats() if hand_tracker_pool else None,
         'system': {
-            'active_tts_requests': len(active_tts_requests),
-            'prediction_history_size': len(prediction_history),
+            'active_tts_requests': tts_jobs.stats()['pending_jobs'],
+            'prediction_history_size': prediction_smoothers.total_votes(),
             'memory_usage_mb': round(os.sys.getsizeof(translation_history) / 1024 / 1024, 2)
         }
-    })
+    }), 200 if ready else 503
 
 @app.route('/api/clear_history', methods=['POST'])
 def clear_history():
     """Clear translation history."""
-    global translation_history, prediction_history
+    global translation_history
     with history_lock:
         translation_history.clear()
-    prediction_history.clear()
+    prediction_smoothers.clear()
     logger.info("🗑️ Translation history cleared")
     return jsonify({'status': 'success', 'message': 'History cleared'})
 
 @app.route('/api/model/reload', methods=['POST'])
+@requires_inference_stack
 def reload_model():
-    """Reload the model (useful for updates)."""
-    global model_loaded
-    model_loaded = load_model_with_fallbacks()
+    """Load a model in the background and swap it in without pausing translation.
+
+    JSON body (optional): {"model": name} switches to another registered model,
+    {"wait": true} answers only after the reload finished. Otherwise the reply is
+    202 and progress is available from GET /api/model/reload.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        status = model_slot.reload(data.get('model'), wait=bool(data.get('wait', False)))
+    except ModelReloadInProgress as e:
+        return jsonify({'status': 'error', 'error': str(e), 'reload': model_slot.status()}), 409
+    
+    if status['state'] == 'failed':
+        # The previous model keeps serving
+        return jsonify({'status': 'error', 'error': status['error'], 'reload': status}), 500
     return jsonify({
-        'status': 'success' if model_loaded else 'error',
-        'model_loaded': model_loaded,
-        'class_names': class_names
-    })
+        'status': 'success' if status['state'] == 'ready' else 'reloading',
+        'reload': status,
+        'class_names': current_class_names()
+    }), 200 if status['state'] == 'ready' else 202
+
+@app.route('/api/model/reload', methods=['GET'])
+@requires_inference_stack
+def reload_status():
+    """Progress of the current (or last) model reload."""
+    return jsonify(model_slot.status())
 
 @app.route('/api/performance')
 def get_performance():
     """Get performance statistics."""
-    return jsonify(performance_stats)
+    with stats_lock:
+        stats = dict(performance_stats)
+    return jsonify({
+        **stats,
+        'stages': metrics.stage_summaries(),
+        'inference_scheduler': inference_scheduler.stats(),
+        'prediction_cache': prediction_cache.stats(),
+        'tts_cache': speech_engine.cache.stats(),
+        'tts_jobs': tts_jobs.stats()
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Stage latency histograms and frame / error counters in the Prometheus text format."""
+    return Response(metrics.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 # Error handlers
 @app.errorhandler(404)
@@ -999,26 +1568,72 @@ def handle_unexpected_error(error):
     return jsonify({'error': 'An unexpected error occurred'}), 500
 
 # Application startup
+def initialize_inference_stack():
+    """Load MediaPipe, the model and TTS, then warm up; sets inference_stack['state']."""
+    global hand_tracker_pool, mp_drawing, mp_drawing_styles
+    
+    stack_started = time.perf_counter()
+    inference_stack['state'] = 'loading'
+    warmup_status['state'] = 'running' if WARMUP_ENABLED else 'disabled'
+    
+    # MediaPipe (the first mediapipe attribute access imports it, and TensorFlow with it)
+    phase_started = time.perf_counter()
+    hand_tracker_pool, mp_drawing, mp_drawing_styles = initialize_mediapipe()
+    record_phase('mediapipe init', phase_started)
+    if hand_tracker_pool is None:
+        print("❌ CRITICAL: MediaPipe initialization failed.")
+        print("   Hand detection will not work.")
+    else:
+        print("✅ MediaPipe initialized successfully!")
+    
+    # Load model with comprehensive error handling (warm-up runs before it goes live)
+    print("📦 Loading AI model from the model registry...")
+    phase_started = time.perf_counter()
+    if model_slot.reload(wait=True)['state'] != 'ready':
+        print("❌ CRITICAL: Failed to load model.")
+        print("   Some features will be disabled.")
+    else:
+        print("✅ Model loaded successfully!")
+    record_phase('model load + classifier warm-up', phase_started)
+    
+    if WARMUP_ENABLED:
+        phase_started = time.perf_counter()
+        if hand_tracker_pool is not None:
+            warm_up_hand_trackers()
+        record_phase('mediapipe warm-up', phase_started)
+        warmup_status['duration_ms'] = round((time.perf_counter() - stack_started) * 1000, 1)
+        warmup_status['state'] = 'ready'
+        print(f"🔥 Warm-up finished in {warmup_status['duration_ms']}ms")
+    
+    # Synthesize every sign name on the TTS workers (behind user requests) so speaking a sign is a cache lookup
+    try:
+        tts_jobs.submit(('precompute',), precompute_sign_speech, priority=LOW_PRIORITY)
+    except SpeechQueueFull:
+        logger.warning("⚠️ TTS queue is full - skipping speech precompute")
+    
+    inference_stack['duration_ms'] = round((time.perf_counter() - stack_started) * 1000, 1)
+    inference_stack['state'] = 'ready' if hand_tracker_pool is not None and model_slot.active else 'failed'
+    record_phase('inference stack', stack_started)
+    print(f"✅ Inference stack {inference_stack['state']} after {inference_stack['duration_ms']}ms")
+
 def initialize_application():
     """Initialize all application components with ULTRA ROBUST error handling."""
     print("\n" + "="*60)
     print("🚀 Starting ULTRA ROBUST HandsSpeak ASL Translator Server")
     print("="*60)
     
-    # Load model with comprehensive error handling
-    print("📦 Loading AI model with multiple fallback paths...")
-    if not load_model_with_fallbacks():
-        print("❌ CRITICAL: Failed to load model after multiple attempts.")
-        print("   Some features will be disabled.")
-    else:
-        print("✅ Model loaded successfully!")
-    
-    # Verify MediaPipe
-    if hands is None:
-        print("❌ CRITICAL: MediaPipe initialization failed.")
-        print("   Hand detection will not work.")
+    if not WEB_ONLY and TTS_PLAYBACK == 'server':
+        # Import pygame off the request path so the first spoken sign does not pay for it
+        preload([pygame])
+
+    if WEB_ONLY:
+        print("🌐 Web-only mode (ASL_WEB_ONLY=1): MediaPipe, the model and TTS are not loaded")
+    elif BACKGROUND_INIT:
+        # Pages are served immediately; /api/health turns ready once the stack is warm
+        print("📦 Loading MediaPipe and the AI model in the background...")
+        threading.Thread(target=initialize_inference_stack, name='inference-init', daemon=True).start()
     else:
-        print("✅ MediaPipe initialized successfully!")
+        initialize_inference_stack()
     
     print("✅ ULTRA ROBUST application initialization complete")
     print("🌐 Server will be available at: http://localhost:5000")
@@ -1030,14 +1645,20 @@ def initialize_application():
         "GET  /learn               -> Learning page",
         "GET  /about               -> About page",
         "GET  /contact             -> Contact page",
-        "POST /api/process_frame   -> Process ASL frame (ULTRA ROBUST)",
-        "POST /api/text_to_speech  -> Convert text to speech (DEBOUNCED)",
+        "POST /api/process_frame   -> Process ASL frame (binary JPEG/WebP or JSON)",
+        "POST /api/process_landmarks -> Classify client-tracked landmarks (single or batch)",
+        "WS   /ws/translate        -> Streaming translation session" + ("" if sock else " (flask-sock not installed)"),
+        "POST /api/text_to_speech  -> Convert text to speech (DEBOUNCED; playback=client returns audio)",
+        "GET  /api/tts_audio       -> Stream cached speech audio (?text=...)",
         "GET  /api/get_history     -> Get translation history",
         "POST /api/contact         -> Submit contact form",
         "GET  /api/health          -> Health check",
         "POST /api/clear_history   -> Clear history",
-        "POST /api/model/reload    -> Reload model",
-        "GET  /api/performance     -> Performance stats"
+        "POST /api/model/reload    -> Reload/switch model in the background (hot swap)",
+        "GET  /api/model/reload    -> Model reload status and progress",
+        "GET  /api/performance     -> Performance stats (per-stage p50/p95/p99)",
+        "GET  /metrics             -> Prometheus metrics (stage histograms, counters)",
+        "GET  /api/startup         -> Startup phases and lazy import timings"
     ]
     
     print("\n📡 Available routes:")
@@ -1050,36 +1671,44 @@ def initialize_application():
     print("   ✅ EXACT same prediction smoothing (3 frames)")
     print("   ✅ EXACT same confidence threshold (0.7)")
     print("   ✅ Professional error handling and recovery")
-    print("   ✅ Robust TTS with request debouncing")
+    print("   ✅ Cached TTS on a bounded worker pool")
     print("   ✅ REAL-TIME MediaPipe keypoints that MATCH video position")
     print("   ✅ MIRRORED landmark coordinates for perfect alignment")
     
     print("="*60 + "\n")
 
+@app.route('/api/startup')
+def startup_report():
+    """Where startup time went: recorded phases and lazily imported modules."""
+    return jsonify({
+        'web_only': WEB_ONLY,
+        'background_init': BACKGROUND_INIT,
+        'inference_stack': inference_stack,
+        'warmup': warmup_status,
+        **import_report()
+    })
+
 # Background cleanup task
 def background_cleanup():
     """Periodic cleanup of temporary files and old data."""
     while True:
         try:
-            cleanup_old_tts_requests()
+            # Release hand trackers of sessions that went away
+            if hand_tracker_pool is not None:
+                hand_tracker_pool.evict_idle()
+            frame_gates.evict_idle()
+            prediction_smoothers.evict_idle()
+            # Replace warmed spare trackers that new sessions took
+            if hand_tracker_pool is not None and WARMUP_ENABLED:
+                hand_tracker_pool.replenish()
             
-            # Cleanup old temporary audio files
-            current_time = time.time()
-            for filename in os.listdir('.'):
-                if filename.startswith('temp_audio_') and filename.endswith('.mp3'):
-                    file_time = os.path.getctime(filename)
-                    if current_time - file_time > 300:  # 5 minutes
-                        try:
-                            os.remove(filename)
-                            logger.info(f"🧹 Cleaned up old audio file: {filename}")
-                        except:
-                            pass
-                            
         except Exception as e:
             logger.error(f"❌ Background cleanup error: {e}")
         
         time.sleep(60)  # Run every minute
 
+record_phase('app import', APP_IMPORT_STARTED)
+
 if __name__ == '__main__':
     initialize_application()
     
@@ -1099,7 +1728,9 @@ if __name__ == '__main__':
     finally:
         # Cleanup on exit
         print("🧹 Cleaning up resources...")
-        if 'pygame' in globals():
+        if hand_tracker_pool is not None:
+            hand_tracker_pool.close_all()
+        if pygame.loaded:
             try:
                 pygame.mixer.quit()
             except:
@@ -0,0 +1,240 @@
+"""Bounded pool of MediaPipe Hands trackers, checked out per client session.
+
+MediaPipe's video mode (static_image_mode=False) keeps tracking state between
+frames. Sharing one tracker between users serializes them on a single object and
+mixes their frames into one tracking state, which forces the slow palm-detection
+path far more often. The pool gives every session its own warm tracker, caps how
+many trackers exist at once and evicts the ones that go idle.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TrackerPoolExhausted(RuntimeError):
+    """Raised when every tracker is busy and the pool is at capacity."""
+
+
+class _TrackerSlot:
+    """One tracker bound to one session."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.tracker = None
+        self.in_use = True
+        self.last_used = time.time()
+
+
+class HandTrackerPool:
+    """Hands out one MediaPipe tracker per session, bounded by max_trackers.
+
+    - A session always gets back the tracker it used last, so its tracking
+      state stays warm.
+    - A tracker is used by one thread at a time; concurrent frames from the
+      same session wait for it.
+    - When the pool is full, the least recently used idle tracker is closed
+      and its slot reused. If all trackers are busy, checkout waits up to
+      acquire_timeout seconds and then raises TrackerPoolExhausted.
+    - evict_idle() closes trackers unused for idle_timeout seconds.
+    - prewarm() keeps a few spare trackers that have already run warm-up
+      frames; a new session takes one of those instead of building a cold one.
+    """
+
+    def __init__(self, tracker_factory: Callable, max_trackers: int = 4,
+                 idle_timeout: float = 60.0, acquire_timeout: float = 2.0):
+        self.tracker_factory = tracker_factory
+        self.max_trackers = max(1, max_trackers)
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._slots: "OrderedDict[str, _TrackerSlot]" = OrderedDict()  # LRU order
+        self._condition = threading.Condition()
+        self._spares = []  # Warmed trackers not bound to a session yet
+        self._spare_target = 0
+        self._warm = None
+        self._stats = {
+            'trackers_created': 0,
+            'trackers_evicted': 0,
+            'trackers_released': 0,
+            'checkouts': 0,
+            'exhausted': 0,
+            'warm_checkouts': 0
+        }
+
+    @contextmanager
+    def checkout(self, session_id: str):
+        """Borrow the session's tracker for the duration of the with-block."""
+        slot = self._acquire(session_id)
+        try:
+            yield slot.tracker
+        finally:
+            self._release(slot)
+
+    def _acquire(self, session_id: str) -> _TrackerSlot:
+        deadline = time.time() + self.acquire_timeout
+        evicted = []
+
+        with self._condition:
+            while True:
+                slot = self._slots.get(session_id)
+                if slot is not None:
+                    if not slot.in_use and slot.tracker is not None:
+                        slot.in_use = True
+                        self._slots.move_to_end(session_id)
+                        self._stats['checkouts'] += 1
+                        break
+                else:
+                    if len(self._slots) >= self.max_trackers:
+                        victim = self._oldest_idle_slot()
+                        if victim is not None:
+                            del self._slots[victim.session_id]
+                            evicted.append(victim)
+                            self._stats['trackers_evicted'] += 1
+
+                    if len(self._slots) < self.max_trackers:
+                        # Reserve the slot now, build the tracker outside the lock
+                        slot = _TrackerSlot(session_id)
+                        self._slots[session_id] = slot
+                        self._stats['checkouts'] += 1
+                        break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._stats['exhausted'] += 1
+                    raise TrackerPoolExhausted(
+                        f"All {self.max_trackers} hand trackers are busy"
+                    )
+                self._condition.wait(remaining)
+
+        for victim in evicted:
+            self._close_tracker(victim)
+
+        if slot.tracker is None:
+            with self._condition:
+                spare = self._spares.pop() if self._spares else None
+                if spare is not None:
+                    self._stats['warm_checkouts'] += 1
+            try:
+                slot.tracker = spare if spare is not None else self.tracker_factory()
+            except Exception:
+                with self._condition:
+                    self._slots.pop(session_id, None)
+                    self._condition.notify_all()
+                raise
+            if spare is None:  # Spares were counted when replenish() built them
+                with self._condition:
+                    self._stats['trackers_created'] += 1
+            logger.info(f"🖐️ Created hand tracker for session {session_id} ({len(self._slots)}/{self.max_trackers})")
+
+        return slot
+
+    def _release(self, slot: _TrackerSlot):
+        with self._condition:
+            slot.in_use = False
+            slot.last_used = time.time()
+            self._condition.notify_all()
+
+    def _oldest_idle_slot(self) -> Optional[_TrackerSlot]:
+        for slot in self._slots.values():
+            if not slot.in_use:
+                return slot
+        return None
+
+    def _close_tracker(self, slot: _TrackerSlot):
+        try:
+            if slot.tracker is not None:
+                slot.tracker.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing hand tracker for session {slot.session_id}: {e}")
+
+    def prewarm(self, count: int, warm: Callable) -> Optional[Dict]:
+        """Keep `count` spare trackers, each passed through warm(tracker) once.
+
+        Returns what warm() returned for the first spare built (e.g. timings).
+        """
+        with self._condition:
+            self._spare_target = max(0, count)
+            self._warm = warm
+        return self.replenish()
+
+    def replenish(self) -> Optional[Dict]:
+        """Build warmed spares until the prewarm target is met again."""
+        result = None
+        while True:
+            with self._condition:
+                if len(self._spares) >= self._spare_target or self._warm is None:
+                    return result
+                warm = self._warm
+            tracker = self.tracker_factory()
+            try:
+                warm_result = warm(tracker)
+            except Exception as e:
+                logger.warning(f"⚠️ Hand tracker warm-up failed: {e}")
+                tracker.close()
+                return result
+            if result is None:
+                result = warm_result
+            with self._condition:
+                self._spares.append(tracker)
+                self._stats['trackers_created'] += 1
+
+    def release(self, session_id: str) -> bool:
+        """Close the session's tracker now (its client is gone) instead of waiting for evict_idle().
+
+        A tracker that is checked out right now is left to idle eviction.
+        """
+        with self._condition:
+            slot = self._slots.get(session_id)
+            if slot is None or slot.in_use:
+                return False
+            del self._slots[session_id]
+            self._stats['trackers_released'] += 1
+            self._condition.notify_all()
+        self._close_tracker(slot)
+        return True
+
+    def evict_idle(self) -> int:
+        """Close trackers that have been idle longer than idle_timeout."""
+        cutoff = time.time() - self.idle_timeout
+        with self._condition:
+            idle = [slot for slot in self._slots.values()
+                    if not slot.in_use and slot.last_used < cutoff]
+            for slot in idle:
+                del self._slots[slot.session_id]
+            self._stats['trackers_evicted'] += len(idle)
+            if idle:
+                self._condition.notify_all()
+
+        for slot in idle:
+            self._close_tracker(slot)
+        if idle:
+            logger.info(f"🧹 Evicted {len(idle)} idle hand tracker(s)")
+        return len(idle)
+
+    def close_all(self):
+        """Close every tracker (used on shutdown)."""
+        with self._condition:
+            slots = list(self._slots.values())
+            self._slots.clear()
+            spares, self._spares = self._spares, []
+            self._spare_target = 0
+            self._condition.notify_all()
+        for slot in slots:
+            self._close_tracker(slot)
+        for tracker in spares:
+            tracker.close()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                'active_trackers': len(self._slots),
+                'busy_trackers': sum(1 for slot in self._slots.values() if slot.in_use),
+                'spare_trackers': len(self._spares),
+                'max_trackers': self.max_trackers,
+                **self._stats
+            }
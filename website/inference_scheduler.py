@@ -0,0 +1,169 @@
+"""Micro-batching scheduler for the landmark classifier.
+
+Keras predict() has a large fixed cost per call, and a 1x63 row is almost all
+overhead. Instead of every request thread calling model.predict() behind a
+global lock, requests submit their landmark vector here. A single worker thread
+collects whatever is pending within a short window (or until max_batch_size
+rows are queued), runs one batched forward pass and hands each caller its row.
+A caller that gives up waiting cancels its request, so rows nobody is waiting
+for any more are dropped instead of predicted.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerOverloaded(RuntimeError):
+    """Raised when the pending-request queue is full."""
+
+
+class _PendingPrediction:
+    __slots__ = ('model', 'landmarks', 'future', 'enqueued_at')
+
+    def __init__(self, model, landmarks: np.ndarray):
+        self.model = model
+        self.landmarks = landmarks
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceScheduler:
+    """Batches concurrent single-row predictions into one forward pass.
+
+    max_batch_size: most rows per forward pass (1 disables batching).
+    max_wait_ms: how long the first row of a batch may wait for company.
+    max_queue_size: pending rows beyond this are rejected with SchedulerOverloaded.
+
+    Requests are only batched with others for the same model object, so a
+    request always runs on the model it was submitted with.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 4.0,
+                 max_queue_size: int = 1024):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[_PendingPrediction]" = queue.Queue(maxsize=max_queue_size)
+        self._carry_over = None  # First row of the next batch (different model)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'batches_run': 0,
+            'rows_predicted': 0,
+            'rejected': 0,
+            'abandoned': 0,
+            'max_queue_depth': 0,
+            'total_queue_wait_ms': 0.0,
+            'total_batch_time_ms': 0.0,
+            'batch_size_histogram': {}
+        }
+        self._worker = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._worker.start()
+
+    def submit(self, model, landmarks: np.ndarray) -> Future:
+        """Queue one landmark vector; the future resolves to its probability row."""
+        pending = _PendingPrediction(model, np.asarray(landmarks, dtype=np.float32).reshape(-1))
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['rejected'] += 1
+            raise SchedulerOverloaded("Inference queue is full")
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+        return pending.future
+
+    def predict(self, model, landmarks: np.ndarray, timeout: float = 5.0) -> np.ndarray:
+        """Blocking helper: returns a (1, num_classes) array like model.predict."""
+        return self.wait(self.submit(model, landmarks), timeout).reshape(1, -1)
+
+    @staticmethod
+    def wait(future: Future, timeout: float = 5.0) -> np.ndarray:
+        """future.result(timeout), cancelling the request if it is still queued when time runs out."""
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _next_batch(self):
+        first = self._carry_over if self._carry_over is not None else self._queue.get()
+        self._carry_over = None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending.model is not first.model:
+                # Model was swapped: finish this batch, start the next with this row
+                self._carry_over = pending
+                break
+            batch.append(pending)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            # Drop rows whose caller already timed out; the rest can no longer be cancelled
+            live = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+            if len(live) < len(batch):
+                with self._stats_lock:
+                    self._stats['abandoned'] += len(batch) - len(live)
+                batch = live
+                if not batch:
+                    continue
+            started = time.perf_counter()
+            try:
+                rows = np.stack([pending.landmarks for pending in batch])
+                predictions = batch[0].model.predict(rows, verbose=0)
+                for i, pending in enumerate(batch):
+                    pending.future.set_result(predictions[i])
+            except Exception as e:
+                logger.error(f"❌ Batched prediction failed ({len(batch)} rows): {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+            finished = time.perf_counter()
+            with self._stats_lock:
+                self._stats['batches_run'] += 1
+                self._stats['rows_predicted'] += len(batch)
+                self._stats['total_batch_time_ms'] += (finished - started) * 1000
+                self._stats['total_queue_wait_ms'] += sum(started - p.enqueued_at for p in batch) * 1000
+                histogram = self._stats['batch_size_histogram']
+                histogram[len(batch)] = histogram.get(len(batch), 0) + 1
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['batch_size_histogram'] = dict(sorted(self._stats['batch_size_histogram'].items()))
+
+        batches = stats['batches_run']
+        rows = stats['rows_predicted']
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': stats['max_queue_depth'],
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': round(self.max_wait * 1000, 2),
+            'batches_run': batches,
+            'rows_predicted': rows,
+            'rejected': stats['rejected'],
+            'abandoned': stats['abandoned'],
+            'average_batch_size': round(rows / batches, 2) if batches else 0,
+            'average_queue_wait_ms': round(stats['total_queue_wait_ms'] / rows, 3) if rows else 0,
+            'average_batch_time_ms': round(stats['total_batch_time_ms'] / batches, 3) if batches else 0,
+            'batch_size_histogram': stats['batch_size_histogram']
+        }
@@ -0,0 +1,151 @@
+"""Deferred imports for the heavy inference / audio stacks, plus an import-time report.
+
+Importing mediapipe pulls in TensorFlow and takes seconds and hundreds of MB;
+pygame, gTTS and pyttsx3 add more. The website pages need none of them, so the
+server binds those modules through lazy_import(): the real import happens on
+first attribute access (or in a background preload), once, under a lock, and
+its duration is recorded.
+
+import_report() lists the recorded startup phases and lazy imports.
+Running this file profiles a cold import of the server with -X importtime:
+
+    python lazy_imports.py [--module app] [--top 20]
+"""
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List
+
+_PROCESS_STARTED = time.time()
+
+_records_lock = threading.Lock()
+_lazy_modules: Dict[str, "LazyModule"] = {}
+_phases: List[Dict] = []
+
+
+class LazyModule:
+    """Module proxy that imports `name` the first time an attribute is used."""
+
+    def __init__(self, name: str, purpose: str = ''):
+        self._name = name
+        self._purpose = purpose
+        self._module = None
+        self._lock = threading.Lock()
+        self._import_ms = None
+        self._loaded_by = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    self._module = importlib.import_module(self._name)
+                    self._import_ms = round((time.perf_counter() - started) * 1000, 1)
+                    self._loaded_by = threading.current_thread().name
+                module = self._module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def describe(self) -> Dict:
+        return {
+            'module': self._name,
+            'purpose': self._purpose,
+            'loaded': self.loaded,
+            'import_ms': self._import_ms,
+            'loaded_by': self._loaded_by
+        }
+
+    def __repr__(self):
+        return f"<LazyModule {self._name} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str, purpose: str = '') -> LazyModule:
+    """Shared LazyModule for name (one per process)."""
+    with _records_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name, purpose)
+        return module
+
+
+def preload(modules: Iterable[LazyModule]) -> threading.Thread:
+    """Import modules on a background thread; failures surface on first real use."""
+    def run():
+        for module in modules:
+            try:
+                module.load()
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=run, name='lazy-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def record_phase(name: str, started: float, finished: float = None):
+    """Record a startup phase measured with time.perf_counter()."""
+    finished = time.perf_counter() if finished is None else finished
+    with _records_lock:
+        _phases.append({'phase': name, 'duration_ms': round((finished - started) * 1000, 1),
+                        'thread': threading.current_thread().name})
+
+
+def import_report() -> Dict:
+    with _records_lock:
+        phases = list(_phases)
+        modules = [module.describe() for module in _lazy_modules.values()]
+    return {
+        'process_started': _PROCESS_STARTED,
+        'phases': phases,
+        'lazy_modules': modules,
+        'modules_imported': len(sys.modules)
+    }
+
+
+def profile_cold_import(module: str, top: int = 20) -> List[Dict]:
+    """Import module in a fresh interpreter with -X importtime; heaviest packages first."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+    )
+
+    # Entries are "self | cumulative | <indent>name"; depth 1 = imported directly by module
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            packages[name.strip()] = int(cumulative_us)
+
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{'module': name, 'cumulative_ms': round(us / 1000, 1)} for name, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show where a cold import of the server spends its time")
+    parser.add_argument('--module', default='app', help="Module to import (run from website/)")
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ranked = profile_cold_import(args.module, args.top)
+    print(f"⏱️ Cold import of '{args.module}' took {(time.perf_counter() - started):.2f}s (including interpreter start)")
+    for entry in ranked:
+        print(f"   {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    main()
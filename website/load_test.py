@@ -0,0 +1,412 @@
+"""Load generator that replays real frames against a running translator server.
+
+Frames come from videos or image directories (by default the bundled
+assets/videos/alphabet/*.mp4). They are JPEG-encoded once up front, then N
+simulated clients send them at a target FPS, each with its own session:
+
+- http: POST raw JPEG bytes to /api/process_frame (X-Session-Id / X-Frame-Id headers)
+- ws:   one /ws/translate connection per client, a 4-byte frame id + JPEG per message
+
+A client that falls behind its schedule sends the next frame right away
+instead of bursting to catch up, as a real browser tab would. The report covers
+throughput, client-side latency percentiles, error / 429 / 503 rates and the
+server's per-stage timings, taken as the difference between two /metrics
+scrapes so earlier traffic does not leak in. Results are saved as JSON.
+
+    python load_test.py --url http://localhost:5000 --clients 1,4,8 --fps 15 --duration 30
+    python load_test.py --mode ws --clients 4 --output results/ws_4.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from metrics import parse_stage_histograms, summarize_histogram_delta
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    import simple_websocket
+except ImportError:
+    simple_websocket = None
+
+DEFAULT_SOURCES = (os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'assets', 'videos', 'alphabet', '*.mp4'),)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+STREAM_FRAME_HEADER_BYTES = 4  # Same framing as app.py's /ws/translate
+REQUEST_TIMEOUT = 10.0
+
+
+def _parse_size(value):
+    width, height = (int(part) for part in value.lower().split('x'))
+    return width, height
+
+
+def load_corpus(sources, frame_size=(640, 480), max_frames=300, frame_step=2, jpeg_quality=80) -> List[bytes]:
+    """JPEG-encoded frames from video files, image files or directories (glob patterns allowed)."""
+    paths = []
+    for source in sources:
+        matches = sorted(glob.glob(source)) or [source]
+        for path in matches:
+            if os.path.isdir(path):
+                paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.lower().endswith(IMAGE_EXTENSIONS)))
+            elif os.path.exists(path):
+                paths.append(path)
+
+    encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+    corpus = []
+
+    def add(frame):
+        frame = cv2.resize(frame, frame_size, interpolation=cv2.INTER_LINEAR)
+        ok, encoded = cv2.imencode('.jpg', frame, encode_params)
+        if ok:
+            corpus.append(encoded.tobytes())
+
+    # Spread the frame budget over all files so every sign is represented
+    per_file = max(1, max_frames // max(1, len(paths)))
+    for path in paths:
+        if len(corpus) >= max_frames:
+            break
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            frame = cv2.imread(path)
+            if frame is not None:
+                add(frame)
+            continue
+
+        cap = cv2.VideoCapture(path)
+        try:
+            index = taken = 0
+            while taken < per_file:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % frame_step == 0:
+                    add(frame)
+                    taken += 1
+                index += 1
+        finally:
+            cap.release()
+
+    return corpus[:max_frames]
+
+
+class ClientResult:
+    """Per-request records of one simulated client."""
+
+    def __init__(self, client_id: int):
+        self.client_id = client_id
+        self.latencies_ms: List[float] = []
+        self.ok_latencies_ms: List[float] = []
+        self.server_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.predictions: Dict[str, int] = {}
+        self.sent = 0
+        self.late_frames = 0
+        self.active_seconds = 0.0
+        self.error: Optional[str] = None
+
+    def record(self, status: str, latency_ms: float, reply: Optional[Dict] = None):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies_ms.append(latency_ms)
+        if status == 'ok':
+            self.ok_latencies_ms.append(latency_ms)
+        if reply and reply.get('prediction') is not None and status == 'ok':
+            self.predictions[reply['prediction']] = self.predictions.get(reply['prediction'], 0) + 1
+            if reply.get('processing_time_ms') is not None:
+                self.server_ms.append(float(reply['processing_time_ms']))
+
+
+class HttpClient:
+    def __init__(self, base_url: str, session_id: str):
+        if requests is None:
+            raise RuntimeError("requests is not installed (pip install requests)")
+        self.url = base_url.rstrip('/') + '/api/process_frame'
+        self.session_id = session_id
+        self.http = requests.Session()
+
+    def send(self, frame_id: int, jpeg: bytes):
+        response = self.http.post(self.url, data=jpeg, timeout=REQUEST_TIMEOUT, headers={
+            'Content-Type': 'image/jpeg',
+            'X-Session-Id': self.session_id,
+            'X-Frame-Id': str(frame_id)
+        })
+        if response.status_code == 200:
+            return 'ok', response.json()
+        return str(response.status_code), None
+
+    def close(self):
+        self.http.close()
+
+
+class WebSocketClient:
+    def __init__(self, base_url: str, session_id: str):
+        if simple_websocket is None:
+            raise RuntimeError("simple-websocket is not installed (pip install simple-websocket)")
+        url = base_url.rstrip('/').replace('https://', 'wss://').replace('http://', 'ws://') + '/ws/translate'
+        self.ws = simple_websocket.Client.connect(url)
+        self.ws.send(json.dumps({'type': 'config', 'session_id': session_id}))
+
+    def send(self, frame_id: int, jpeg: bytes):
+        self.ws.send(frame_id.to_bytes(STREAM_FRAME_HEADER_BYTES, 'big') + jpeg)
+        while True:
+            message = self.ws.receive(timeout=REQUEST_TIMEOUT)
+            if message is None:
+                return 'timeout', None
+            reply = json.loads(message)
+            if reply.get('frame_id') in (frame_id, None):
+                break
+        if reply.get('type') == 'prediction':
+            return 'ok', reply
+        if 'busy' in reply.get('error', '').lower():
+            return '429', reply  # Same condition the HTTP endpoint answers with 429
+        return 'error', reply
+
+    def close(self):
+        self.ws.close()
+
+
+CLIENT_TYPES = {'http': HttpClient, 'ws': WebSocketClient}
+
+
+def run_client(result: ClientResult, mode: str, base_url: str, corpus: List[bytes], fps: float,
+               start_at: float, stop_at: float, run_id: str):
+    """Send frames at fps until stop_at; the corpus is replayed from a per-client offset."""
+    time.sleep(max(0.0, start_at - time.perf_counter()))
+    try:
+        client = CLIENT_TYPES[mode](base_url, f"loadtest-{run_id}-{result.client_id}")
+    except Exception as e:
+        result.error = f"connect failed: {e}"
+        return
+
+    interval = 1.0 / fps if fps > 0 else 0.0
+    offset = (result.client_id * 7) % len(corpus)  # Clients do not move in lockstep through the corpus
+    started = next_send = time.perf_counter()
+    frame_id = 0
+    try:
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            if now < next_send:
+                time.sleep(min(next_send, stop_at) - now)
+                continue
+            if interval and now - next_send > interval:
+                result.late_frames += 1
+                next_send = now  # Do not burst to catch up
+
+            jpeg = corpus[(offset + frame_id) % len(corpus)]
+            sent_at = time.perf_counter()
+            try:
+                status, reply = client.send(frame_id, jpeg)
+            except Exception as e:
+                status, reply = ('timeout' if 'timed out' in str(e).lower() else 'error'), None
+            result.record(status, (time.perf_counter() - sent_at) * 1000, reply)
+            result.sent += 1
+            frame_id += 1
+            next_send += interval
+    finally:
+        result.active_seconds = time.perf_counter() - started
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def fetch_metrics(base_url: str) -> Optional[str]:
+    if requests is None:
+        return None
+    try:
+        response = requests.get(base_url.rstrip('/') + '/metrics', timeout=REQUEST_TIMEOUT)
+        return response.text if response.status_code == 200 else None
+    except Exception:
+        return None
+
+
+def parse_counters(text: str, prefix: str = 'asl') -> Dict[str, float]:
+    """Plain series (counters and gauges) from a /metrics scrape, keyed by name plus labels."""
+    values = {}
+    for line in text.splitlines():
+        if line.startswith('#') or line.startswith(f'{prefix}_stage_duration_seconds') or ' ' not in line:
+            continue
+        series, _, value = line.rpartition(' ')
+        try:
+            values[series] = float(value)
+        except ValueError:
+            pass
+    return values
+
+
+def percentiles(values: List[float]) -> Dict:
+    if not values:
+        return {'count': 0}
+    array = np.asarray(values)
+    return {
+        'count': int(array.size),
+        'mean_ms': round(float(array.mean()), 2),
+        'p50_ms': round(float(np.percentile(array, 50)), 2),
+        'p95_ms': round(float(np.percentile(array, 95)), 2),
+        'p99_ms': round(float(np.percentile(array, 99)), 2),
+        'max_ms': round(float(array.max()), 2)
+    }
+
+
+def run_step(mode: str, base_url: str, corpus: List[bytes], clients: int, fps: float,
+             duration: float, ramp_up: float) -> Dict:
+    """One load level: `clients` concurrent clients for `duration` seconds."""
+    metrics_before = fetch_metrics(base_url)
+    run_id = datetime.now().strftime('%H%M%S')
+    results = [ClientResult(i) for i in range(clients)]
+
+    step_start = time.perf_counter()
+    stop_at = step_start + ramp_up + duration
+    threads = []
+    for result in results:
+        start_at = step_start + (ramp_up * result.client_id / clients if clients else 0)
+        thread = threading.Thread(target=run_client, name=f'load-client-{result.client_id}', daemon=True,
+                                  args=(result, mode, base_url, corpus, fps, start_at, stop_at, run_id))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - step_start
+    metrics_after = fetch_metrics(base_url)
+
+    statuses: Dict[str, int] = {}
+    predictions: Dict[str, int] = {}
+    latencies, ok_latencies, server_ms = [], [], []
+    for result in results:
+        latencies.extend(result.latencies_ms)
+        ok_latencies.extend(result.ok_latencies_ms)
+        server_ms.extend(result.server_ms)
+        for key, count in result.statuses.items():
+            statuses[key] = statuses.get(key, 0) + count
+        for key, count in result.predictions.items():
+            predictions[key] = predictions.get(key, 0) + count
+
+    total = sum(statuses.values())
+    ok = statuses.get('ok', 0)
+    step = {
+        'clients': clients,
+        'target_fps_per_client': fps,
+        'duration_s': round(wall_seconds, 2),
+        'requests': total,
+        'ok': ok,
+        'throughput_fps': round(ok / wall_seconds, 2) if wall_seconds else 0,
+        'offered_fps': round(clients * fps, 2),
+        'per_client_fps': [round(r.sent / r.active_seconds, 2) if r.active_seconds else 0 for r in results],
+        'late_frames': sum(r.late_frames for r in results),
+        'statuses': statuses,
+        'error_rate': round((total - ok) / total, 4) if total else 0,
+        'rate_429': round(statuses.get('429', 0) / total, 4) if total else 0,
+        'rate_503': round(statuses.get('503', 0) / total, 4) if total else 0,
+        'client_errors': [r.error for r in results if r.error],
+        'latency': percentiles(ok_latencies),
+        'latency_all': percentiles(latencies),
+        'server_processing': percentiles(server_ms),
+        'predictions': dict(sorted(predictions.items(), key=lambda item: -item[1]))
+    }
+
+    if metrics_before and metrics_after:
+        before_stages = parse_stage_histograms(metrics_before)
+        step['server_stages'] = {
+            stage: summarize_histogram_delta(before_stages.get(stage), after)
+            for stage, after in sorted(parse_stage_histograms(metrics_after).items())
+        }
+        before_counters = parse_counters(metrics_before)
+        step['server_counters'] = {
+            series: value - before_counters.get(series, 0)
+            for series, value in parse_counters(metrics_after).items()
+            if '_total' in series
+        }
+    return step
+
+
+def print_step(step: Dict):
+    latency = step['latency']
+    print(f"\n👥 {step['clients']} client(s) @ {step['target_fps_per_client']} FPS "
+          f"(offered {step['offered_fps']} FPS) for {step['duration_s']}s")
+    print(f"   ✅ Throughput: {step['throughput_fps']} FPS ({step['ok']}/{step['requests']} ok, "
+          f"{step['late_frames']} late sends)")
+    if latency.get('count'):
+        print(f"   ⏱️ Latency: p50 {latency['p50_ms']} ms | p95 {latency['p95_ms']} ms | "
+              f"p99 {latency['p99_ms']} ms | max {latency['max_ms']} ms")
+    print(f"   ⚠️ Errors: {step['error_rate'] * 100:.1f}% (429: {step['rate_429'] * 100:.1f}%, "
+          f"503: {step['rate_503'] * 100:.1f}%) {step['statuses']}")
+    for error in step['client_errors'][:3]:
+        print(f"   ❌ {error}")
+    for stage, summary in step.get('server_stages', {}).items():
+        if summary['count']:
+            print(f"   🔬 {stage:<14} n={summary['count']:<6} p50 {summary['p50_ms']:>8} ms  "
+                  f"p95 {summary['p95_ms']:>8} ms  p99 {summary['p99_ms']:>8} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded frames against the translator server")
+    parser.add_argument('--url', default='http://localhost:5000', help="Server base URL")
+    parser.add_argument('--mode', choices=sorted(CLIENT_TYPES), default='http')
+    parser.add_argument('--clients', default='4', help="Concurrent clients; a comma list runs one step per value")
+    parser.add_argument('--fps', type=float, default=15.0, help="Target frames per second per client (0 = as fast as possible)")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds per step, after ramp-up")
+    parser.add_argument('--ramp-up', type=float, default=2.0, help="Seconds over which clients are started")
+    parser.add_argument('--source', action='append', help="Video/image file, directory or glob (repeatable)")
+    parser.add_argument('--frame-size', type=_parse_size, default=(640, 480), help="WIDTHxHEIGHT sent to the server")
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--jpeg-quality', type=int, default=80)
+    parser.add_argument('--output', help="Result JSON path (default: load_test_<timestamp>.json)")
+    args = parser.parse_args()
+
+    if requests is None:
+        parser.error("requests is not installed (pip install requests)")
+    client_counts = [int(value) for value in args.clients.split(',') if value.strip()]
+
+    print("🎞️ Loading frames...")
+    corpus = load_corpus(args.source or DEFAULT_SOURCES, args.frame_size, args.max_frames,
+                         jpeg_quality=args.jpeg_quality)
+    if not corpus:
+        parser.error("No frames found in the given sources")
+    print(f"✅ {len(corpus)} frames, {sum(map(len, corpus)) / len(corpus) / 1024:.1f} KB average JPEG")
+
+    steps = []
+    for clients in client_counts:
+        step = run_step(args.mode, args.url, corpus, clients, args.fps, args.duration, args.ramp_up)
+        print_step(step)
+        steps.append(step)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'url': args.url,
+            'mode': args.mode,
+            'fps': args.fps,
+            'duration_s': args.duration,
+            'ramp_up_s': args.ramp_up,
+            'frame_size': list(args.frame_size),
+            'jpeg_quality': args.jpeg_quality,
+            'corpus_frames': len(corpus),
+            'sources': args.source or list(DEFAULT_SOURCES)
+        },
+        'host': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'steps': steps
+    }
+    output = args.output or f"load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Thread-safe latency histograms and counters with a Prometheus text export.
+
+Every pipeline stage (parse, decode, colour convert, hands.process, predict,
+smoothing, serialization) records its duration into a fixed-bucket histogram,
+so percentiles stay cheap to compute and the memory use is constant no matter
+how many frames pass through. Percentiles are interpolated inside the bucket
+that holds the requested rank, the same estimate Prometheus' histogram_quantile
+makes.
+
+    with metrics.stage('jpeg_decode'):
+        frame = cv2.imdecode(...)
+    metrics.frames.inc()
+
+render_prometheus() returns the text exposition format (version 0.0.4).
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds in seconds: 50us .. 5s
+DEFAULT_LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+def bucket_quantile(buckets, counts, count, maximum, q) -> float:
+    """Estimate quantile q from per-bucket counts (one more count than bounds: the overflow bucket)."""
+    rank = q * count
+    cumulative = 0
+    lower = 0.0
+    for i, bucket_count in enumerate(counts):
+        upper = buckets[i] if i < len(buckets) else maximum
+        if bucket_count and cumulative + bucket_count >= rank:
+            fraction = (rank - cumulative) / bucket_count
+            return lower + (min(upper, maximum) - lower) * fraction
+        cumulative += bucket_count
+        lower = upper
+    return maximum
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot: above the largest bound
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+            if seconds > self._max:
+                self._max = seconds
+
+    def _state(self) -> Tuple[list, float, int, float]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count, self._max
+
+    def summary(self) -> Dict:
+        """count, mean, max and p50/p95/p99 in milliseconds."""
+        counts, total, count, maximum = self._state()
+        summary = {
+            'count': count,
+            'mean_ms': round(total / count * 1000, 3) if count else 0,
+            'max_ms': round(maximum * 1000, 3)
+        }
+        for q in PERCENTILES:
+            value = bucket_quantile(self.buckets, counts, count, maximum, q) if count else 0
+            summary[f'p{int(q * 100)}_ms'] = round(value * 1000, 3)
+        return summary
+
+    def render(self, name: str, labels: Dict[str, str]) -> Iterable[str]:
+        counts, total, count, _ = self._state()
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            yield f'{name}_bucket{_format_labels({**labels, "le": repr(bound)})} {cumulative}'
+        yield f'{name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}'
+        yield f'{name}_sum{_format_labels(labels)} {total}'
+        yield f'{name}_count{_format_labels(labels)} {count}'
+
+
+class Counter:
+    """Monotonic counter, optionally split by one label."""
+
+    def __init__(self, name: str, help_text: str, label: Optional[str] = None):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, label_value: str = ''):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value: Optional[str] = None) -> float:
+        with self._lock:
+            if label_value is None:
+                return sum(self._values.values())
+            return self._values.get(label_value, 0)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        if not values:
+            values = {'': 0}
+        for label_value, value in sorted(values.items()):
+            labels = {self.label: label_value} if self.label and label_value else {}
+            yield f'{self.name}{_format_labels(labels)} {value}'
+
+
+class PipelineMetrics:
+    """Per-stage latency histograms plus the frame / hand / error counters."""
+
+    def __init__(self, prefix: str = 'asl'):
+        self.prefix = prefix
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._stages_lock = threading.Lock()
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+        self.frames = Counter(f'{prefix}_frames_total', 'Frames (or landmark sets) classified')
+        self.hands_detected = Counter(f'{prefix}_hands_detected_total', 'Frames with at least one hand')
+        self.low_confidence = Counter(f'{prefix}_low_confidence_frames_total',
+                                      'Frames whose best class was below the confidence threshold')
+        self.errors = Counter(f'{prefix}_errors_total', 'Failed frames by kind', label='kind')
+        self.counters = [self.frames, self.hands_detected, self.low_confidence, self.errors]
+
+    def add_counter(self, name: str, help_text: str, label: Optional[str] = None) -> Counter:
+        counter = Counter(f'{self.prefix}_{name}', help_text, label)
+        self.counters.append(counter)
+        return counter
+
+    def add_gauge(self, name: str, help_text: str, read: Callable[[], float]):
+        """Gauge whose value is read(), evaluated at export time."""
+        self._gauges[f'{self.prefix}_{name}'] = (help_text, read)
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            with self._stages_lock:
+                histogram = self._stages.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def observe(self, stage: str, seconds: float):
+        self.histogram(stage).observe(seconds)
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time the with-block into the stage histogram (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def stage_summaries(self) -> Dict[str, Dict]:
+        with self._stages_lock:
+            stages = dict(self._stages)
+        return {stage: histogram.summary() for stage, histogram in stages.items()}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for counter in self.counters:
+            lines.extend(counter.render())
+
+        for name, (help_text, read) in self._gauges.items():
+            try:
+                value = float(read())
+            except Exception:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+
+        histogram_name = f'{self.prefix}_stage_duration_seconds'
+        lines.append(f'# HELP {histogram_name} Time spent in each pipeline stage')
+        lines.append(f'# TYPE {histogram_name} histogram')
+        with self._stages_lock:
+            stages = sorted(self._stages.items())
+        for stage, histogram in stages:
+            lines.extend(histogram.render(histogram_name, {'stage': stage}))
+        return '\n'.join(lines) + '\n'
+
+
+def parse_stage_histograms(text: str, prefix: str = 'asl') -> Dict[str, Dict]:
+    """Read the stage histograms back from render_prometheus() output.
+
+    Returns {stage: {'buckets': [...], 'cumulative': [...], 'sum': s, 'count': n}}
+    with the +Inf bucket left out of buckets/cumulative.
+    """
+    histogram_name = f'{prefix}_stage_duration_seconds'
+    stages: Dict[str, Dict] = {}
+    for line in text.splitlines():
+        if not line.startswith(histogram_name):
+            continue
+        series, _, value = line.rpartition(' ')
+        name, _, labels = series.partition('{')
+        label_values = dict(part.split('=', 1) for part in labels.rstrip('}').split(',') if '=' in part)
+        label_values = {key: raw.strip('"') for key, raw in label_values.items()}
+        stage = stages.setdefault(label_values.get('stage', ''),
+                                  {'buckets': [], 'cumulative': [], 'sum': 0.0, 'count': 0})
+
+        if name.endswith('_bucket'):
+            if label_values['le'] != '+Inf':
+                stage['buckets'].append(float(label_values['le']))
+                stage['cumulative'].append(int(float(value)))
+        elif name.endswith('_sum'):
+            stage['sum'] = float(value)
+        elif name.endswith('_count'):
+            stage['count'] = int(float(value))
+    return stages
+
+
+def summarize_histogram_delta(before: Dict, after: Dict) -> Dict:
+    """count, mean and p50/p95/p99 (ms) of the observations made between two parse_stage_histograms() snapshots."""
+    buckets = after['buckets']
+    previous = before['cumulative'] if before and before['buckets'] == buckets else [0] * len(buckets)
+    cumulative = [now - then for now, then in zip(after['cumulative'], previous)]
+    count = after['count'] - (before['count'] if before else 0)
+    total = after['sum'] - (before['sum'] if before else 0.0)
+
+    counts = [cumulative[0]] + [cumulative[i] - cumulative[i - 1] for i in range(1, len(cumulative))] if cumulative else []
+    counts.append(count - (cumulative[-1] if cumulative else 0))
+    # The true maximum is not exported; cap estimates at the highest non-empty bucket bound
+    non_empty = [i for i, bucket_count in enumerate(counts) if bucket_count]
+    maximum = buckets[min(non_empty[-1], len(buckets) - 1)] if non_empty and buckets else 0.0
+
+    summary = {'count': count, 'mean_ms': round(total / count * 1000, 3) if count else 0}
+    for q in PERCENTILES:
+        value = bucket_quantile(buckets, counts, count, maximum, q) if count else 0
+        summary[f'p{int(q * 100)}_ms'] = round(value * 1000, 3)
+    return summary
@@ -0,0 +1,182 @@
+"""Double-buffered model slot for zero-downtime reloads.
+
+Request threads read `slot.active` once and use that snapshot (model, class
+names, manifest record) for the whole request - a plain attribute read, no
+lock. A reload builds the next snapshot on a background thread:
+
+    loading -> warming_up -> validating -> swapping -> ready
+
+and only then publishes it with a single reference assignment. Requests that
+already hold the old snapshot finish on the old model; the old model is freed
+once the last of them drops it. A failed reload leaves the active model
+untouched.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Share of the reload each stage accounts for in the reported progress
+RELOAD_STAGES = (
+    ('loading', 0.0),
+    ('warming_up', 0.6),
+    ('validating', 0.8),
+    ('swapping', 0.95)
+)
+
+VALIDATION_BATCH_SIZE = 4
+
+
+class ModelReloadInProgress(RuntimeError):
+    """Raised when a reload is requested while another one is still running."""
+
+
+class LoadedModel:
+    """Immutable snapshot of one loaded model; never modified after publishing."""
+
+    __slots__ = ('model', 'record', 'class_names', 'version', 'loaded_at')
+
+    def __init__(self, model, record: Dict, class_names: List[str], version: int):
+        self.model = model
+        self.record = record
+        self.class_names = list(class_names)
+        self.version = version
+        self.loaded_at = time.time()
+
+    @property
+    def name(self) -> str:
+        return self.record.get('name', 'unknown')
+
+
+def validate_loaded_model(loaded: LoadedModel):
+    """Run a probe batch and check the output is a finite probability row per input."""
+    input_dim = loaded.model.input_shape[-1]
+    probe = np.random.default_rng(0).random((VALIDATION_BATCH_SIZE, input_dim), dtype=np.float32)
+    output = np.asarray(loaded.model.predict(probe, verbose=0))
+
+    if output.shape != (VALIDATION_BATCH_SIZE, len(loaded.class_names)):
+        raise ValueError(f"Probe output shape {output.shape}, expected "
+                         f"{(VALIDATION_BATCH_SIZE, len(loaded.class_names))}")
+    if not np.all(np.isfinite(output)):
+        raise ValueError("Probe output contains NaN/inf")
+    if not np.allclose(output.sum(axis=1), 1.0, atol=1e-2):
+        raise ValueError("Probe output rows are not probability distributions")
+
+
+class ModelSlot:
+    """Holds the active LoadedModel and swaps in reloaded ones atomically.
+
+    loader(model_name) -> (model, record) loads and checks one artifact.
+    warmup(loaded) runs representative inputs through a candidate before it goes live.
+    on_swap(loaded) runs right after a new model is published (e.g. to drop caches).
+    """
+
+    def __init__(self, loader: Callable[[Optional[str]], Tuple[object, Dict]],
+                 warmup: Optional[Callable[[LoadedModel], None]] = None,
+                 on_swap: Optional[Callable[[LoadedModel], None]] = None,
+                 default_class_names: Optional[List[str]] = None):
+        self.loader = loader
+        self.warmup = warmup
+        self.on_swap = on_swap
+        self.default_class_names = list(default_class_names or [])
+
+        self.active: Optional[LoadedModel] = None
+        self._version = 0
+        self._reload_lock = threading.Lock()  # Writers only
+        self._thread: Optional[threading.Thread] = None
+        self._status = {
+            'state': 'idle',
+            'stage': None,
+            'progress': 0.0,
+            'requested_model': None,
+            'started_at': None,
+            'finished_at': None,
+            'duration_ms': None,
+            'error': None,
+            'reloads_started': 0,
+            'reloads_succeeded': 0,
+            'reloads_failed': 0
+        }
+
+    @property
+    def reloading(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def reload(self, model_name: Optional[str] = None, wait: bool = False) -> Dict:
+        """Start loading model_name (None = registry's active model) in the background.
+
+        Raises ModelReloadInProgress if a reload is already running. With wait=True
+        the call returns once the reload has finished. Returns the reload status.
+        """
+        with self._reload_lock:
+            if self.reloading:
+                raise ModelReloadInProgress("A model reload is already in progress")
+            self._status.update({
+                'state': 'loading',
+                'stage': 'loading',
+                'progress': 0.0,
+                'requested_model': model_name,
+                'started_at': time.time(),
+                'finished_at': None,
+                'duration_ms': None,
+                'error': None
+            })
+            self._status['reloads_started'] += 1
+            self._thread = threading.Thread(target=self._reload, args=(model_name,),
+                                            name='model-reload', daemon=True)
+            self._thread.start()
+
+        if wait:
+            self._thread.join()
+        return self.status()
+
+    def _set_stage(self, stage: str):
+        self._status.update({'state': stage, 'stage': stage, 'progress': dict(RELOAD_STAGES)[stage]})
+        logger.info(f"🔄 Model reload: {stage.replace('_', ' ')}")
+
+    def _reload(self, model_name: Optional[str]):
+        started = time.perf_counter()
+        try:
+            self._set_stage('loading')
+            model, record = self.loader(model_name)
+            candidate = LoadedModel(model, record, record.get('class_names') or self.default_class_names,
+                                    self._version + 1)
+
+            self._set_stage('warming_up')
+            if self.warmup is not None:
+                self.warmup(candidate)
+
+            self._set_stage('validating')
+            validate_loaded_model(candidate)
+
+            self._set_stage('swapping')
+            self._version = candidate.version
+            self.active = candidate  # Atomic publish: readers see the old or the new snapshot
+            if self.on_swap is not None:
+                self.on_swap(candidate)
+
+            self._status.update({'state': 'ready', 'progress': 1.0})
+            self._status['reloads_succeeded'] += 1
+            logger.info(f"✅ Model v{candidate.version} ({candidate.name}) is live")
+        except Exception as e:
+            self._status.update({'state': 'failed', 'error': str(e)})
+            self._status['reloads_failed'] += 1
+            logger.error(f"❌ Model reload failed, keeping the current model: {e}")
+        finally:
+            self._status['finished_at'] = time.time()
+            self._status['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    def status(self) -> Dict:
+        loaded = self.active
+        status = dict(self._status)
+        status['active_model'] = {
+            'name': loaded.name,
+            'version': loaded.version,
+            'backend': loaded.record.get('backend'),
+            'loaded_at': loaded.loaded_at
+        } if loaded else None
+        return status
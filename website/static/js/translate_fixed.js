@@ -29,6 +29,17 @@ class ASLTranslator {
         this.maxConsecutiveErrors = 5;
         this.currentFrameController = null;
         
+        // Session id - the server keeps one warm hand tracker per session
+        this.sessionId = (window.crypto && crypto.randomUUID) ?
+            crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+        
+        // Streaming session state - frames pipelined over one WebSocket
+        this.streamSocket = null;
+        this.streamFrameId = 0;
+        this.streamInFlight = new Map();
+        this.maxStreamInFlight = 2;
+        this.streamTimeout = 5000;
+        
         // Prediction state - ENHANCED ACCURACY
         this.predictionHistory = [];
         this.lastValidPrediction = null;
@@ -363,6 +374,9 @@ class ASLTranslator {
         this.updateUI();
         this.updateStatus('Translating...', true);
         
+        // Prefer a streaming session; HTTP frames are used until (or unless) it opens
+        this.openStream();
+        
         // Start optimized frame processing
         this.processFramesOptimized();
     }
@@ -383,6 +397,7 @@ class ASLTranslator {
             this.currentFrameController = null;
         }
         
+        this.closeStream();
         this.clearCanvases();
         this.currentLandmarks = [];
         this.handDetected = false;
@@ -420,8 +435,13 @@ class ASLTranslator {
         if (elapsed > this.frameInterval) {
             this.lastFrameTime = now - (elapsed % this.frameInterval);
             
-            // Process frame only if not already processing and system is ready
-            if (!this.processingFrame && this.isSystemReady()) {
+            if (this.isStreamOpen()) {
+                // Pipeline frames over the stream instead of waiting a full round trip
+                if (this.hasStreamCapacity() && this.isSystemReady()) {
+                    this.sendStreamFrame();
+                }
+            } else if (!this.processingFrame && this.isSystemReady()) {
+                // Process frame only if not already processing and system is ready
                 this.processSingleFrame();
             }
             
@@ -470,23 +490,24 @@ class ASLTranslator {
             
             // Adaptive quality based on performance
             const quality = this.averageProcessingTime > 100 ? 0.5 : 0.7;
-            const imageData = this.outputCanvas.toDataURL('image/jpeg', quality);
+            const frameBlob = await this.encodeFrame(quality);
             
             // Send to backend with abort controller
             this.currentFrameController = new AbortController();
             const timeoutId = setTimeout(() => this.currentFrameController.abort(), 5000);
 
+            // Raw JPEG body with settings in headers - no base64/JSON overhead
             const response = await fetch('/api/process_frame', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    image: imageData,
-                    confidence_threshold: this.confidenceThreshold,
-                    smoothing_frames: this.smoothingFrames,
-                    enable_landmarks: true,
-                    request_timestamp: Date.now(),
-                    frame_id: this.frameCount++
-                }),
+                headers: {
+                    'Content-Type': 'image/jpeg',
+                    'X-Confidence-Threshold': String(this.confidenceThreshold),
+                    'X-Smoothing-Frames': String(this.smoothingFrames),
+                    'X-Request-Timestamp': String(Date.now()),
+                    'X-Frame-Id': String(this.frameCount++),
+                    'X-Session-Id': this.sessionId
+                },
+                body: frameBlob,
                 signal: this.currentFrameController.signal
             });
 
@@ -512,6 +533,149 @@ class ASLTranslator {
         }
     }
 
+    // STREAMING SESSION (WebSocket) - falls back to HTTP frames when unavailable
+    openStream() {
+        if (this.streamSocket || !('WebSocket' in window)) return;
+
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        let socket;
+        try {
+            socket = new WebSocket(`${protocol}//${window.location.host}/ws/translate`);
+        } catch (error) {
+            console.warn('Streaming unavailable, using HTTP frames:', error);
+            return;
+        }
+
+        socket.binaryType = 'arraybuffer';
+        socket.addEventListener('open', () => {
+            socket.send(JSON.stringify({
+                type: 'config',
+                confidence_threshold: this.confidenceThreshold,
+                smoothing_frames: this.smoothingFrames
+            }));
+            console.log('🔌 Streaming session open');
+        });
+        socket.addEventListener('message', event => this.handleStreamMessage(event));
+        socket.addEventListener('close', () => {
+            if (this.streamSocket === socket) {
+                this.streamSocket = null;
+                this.streamInFlight.clear();
+            }
+        });
+        this.streamSocket = socket;
+    }
+
+    closeStream() {
+        if (this.streamSocket) {
+            const socket = this.streamSocket;
+            this.streamSocket = null;
+            this.streamInFlight.clear();
+            try {
+                socket.close();
+            } catch (error) {
+                console.warn('Error closing stream:', error);
+            }
+        }
+    }
+
+    isStreamOpen() {
+        return this.streamSocket !== null && this.streamSocket.readyState === WebSocket.OPEN;
+    }
+
+    hasStreamCapacity() {
+        if (this.streamInFlight.size < this.maxStreamInFlight) return true;
+
+        // Forget frames the server never answered so the pipeline cannot stall
+        const now = performance.now();
+        for (const [frameId, sentAt] of this.streamInFlight) {
+            if (now - sentAt > this.streamTimeout) {
+                this.streamInFlight.delete(frameId);
+            }
+        }
+        return this.streamInFlight.size < this.maxStreamInFlight;
+    }
+
+    async sendStreamFrame() {
+        this.streamFrameId = (this.streamFrameId + 1) >>> 0;
+        const frameId = this.streamFrameId;
+        this.streamInFlight.set(frameId, performance.now());
+
+        try {
+            this.ctx.drawImage(this.videoElement, 0, 0, this.outputCanvas.width, this.outputCanvas.height);
+            const quality = this.averageProcessingTime > 100 ? 0.5 : 0.7;
+            const frameBlob = await this.encodeFrame(quality);
+
+            if (!this.isStreamOpen()) {
+                this.streamInFlight.delete(frameId);
+                return;
+            }
+
+            // 4-byte big-endian frame id followed by the JPEG bytes
+            const header = new DataView(new ArrayBuffer(4));
+            header.setUint32(0, frameId);
+            this.streamSocket.send(new Blob([header.buffer, frameBlob]));
+            this.frameCount++;
+        } catch (error) {
+            this.streamInFlight.delete(frameId);
+            this.handleProcessingError(error);
+        }
+    }
+
+    handleStreamMessage(event) {
+        let message;
+        try {
+            message = JSON.parse(event.data);
+        } catch (error) {
+            console.error('Invalid stream message:', error);
+            return;
+        }
+
+        const sentAt = this.streamInFlight.get(message.frame_id);
+        this.streamInFlight.delete(message.frame_id);
+
+        if (message.type === 'prediction') {
+            this.processPredictionResult(this.expandStreamResult(message));
+            if (sentAt !== undefined) {
+                this.updatePerformanceMetrics(performance.now() - sentAt);
+            }
+        } else if (message.type === 'error') {
+            this.handleProcessingError(new Error(message.error));
+        }
+    }
+
+    expandStreamResult(message) {
+        // Rebuild the /api/process_frame response shape from the compact message
+        const landmarks = [];
+        for (let i = 0; i + 2 < message.landmarks.length; i += 3) {
+            landmarks.push({ x: message.landmarks[i], y: message.landmarks[i + 1], z: message.landmarks[i + 2] });
+        }
+
+        return {
+            success: true,
+            frame_id: message.frame_id,
+            prediction: message.prediction,
+            confidence: message.confidence,
+            raw_confidence: message.raw_confidence,
+            hand_count: message.hand_count,
+            landmarks_detected: message.hand_count > 0,
+            landmarks: landmarks,
+            processing_time_ms: message.processing_time_ms
+        };
+    }
+
+    encodeFrame(quality) {
+        // Encode the current canvas as a binary JPEG blob
+        return new Promise((resolve, reject) => {
+            this.outputCanvas.toBlob(blob => {
+                if (blob) {
+                    resolve(blob);
+                } else {
+                    reject(new Error('Frame encoding failed'));
+                }
+            }, 'image/jpeg', quality);
+        });
+    }
+
     // ENHANCED PREDICTION PROCESSING WITH BETTER VALIDATION
     processPredictionResult(result) {
         if (!result.success) {
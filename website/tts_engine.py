@@ -0,0 +1,330 @@
+"""Text-to-speech backends with a content-addressed audio cache.
+
+The translator only ever speaks a handful of phrases (the class names), so
+synthesizing them on every request wastes seconds of network round trips. This
+module provides:
+
+- Pluggable synthesis backends: gTTS (online, mp3) and pyttsx3 (offline, wav;
+  SAPI5 / NSSpeechSynthesizer / eSpeak depending on the OS).
+- AudioCache: files named by sha256(text, voice, rate) with size-based LRU
+  eviction, so a known phrase is a single file lookup.
+- TextToSpeech: tries the backends in order and caches what they produce.
+  The server fills the cache with every class name at startup through its
+  TTS job pool (tts_jobs.py).
+
+gTTS and pyttsx3 are only imported when the first phrase has to be synthesized,
+so serving cached clips (or not using speech at all) never loads them.
+"""
+import hashlib
+import io
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'tts_cache'
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_VOICE = 'en'
+DEFAULT_RATE = 1.0
+
+
+def normalize_text(text: str) -> str:
+    """Canonical spoken form: class names like 'thank_you' become 'thank you'."""
+    return re.sub(r'\s+', ' ', text.replace('_', ' ')).strip()
+
+
+class TTSBackend:
+    """Turns text into encoded audio, in memory or written to a file."""
+
+    name = 'base'
+    extension = '.bin'
+    mimetype = 'application/octet-stream'
+
+    def synthesize(self, text: str, voice: str, rate: float) -> bytes:
+        raise NotImplementedError
+
+    def synthesize_to_file(self, text: str, voice: str, rate: float, path: str):
+        """Write the audio for text to path (the audio cache passes its own staging file)."""
+        with open(path, 'wb') as f:
+            f.write(self.synthesize(text, voice, rate))
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS (needs network access)."""
+
+    name = 'gtts'
+    extension = '.mp3'
+    mimetype = 'audio/mpeg'
+
+    def __init__(self):
+        try:
+            from gtts import gTTS
+        except ImportError:
+            raise RuntimeError("gTTS is not installed")
+        self._gtts = gTTS
+
+    def synthesize(self, text: str, voice: str, rate: float) -> bytes:
+        buffer = io.BytesIO()
+        # gTTS only knows normal and slow speed; voice is the language code
+        self._gtts(text=text, lang=voice or DEFAULT_VOICE, slow=rate < 0.75).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """Offline synthesis through the OS speech engine; works on air-gapped machines.
+
+    The engine is created and driven by one dedicated thread: SAPI5 (COM on
+    Windows) and NSSpeechSynthesizer objects must stay on the thread that
+    created them, so TTS workers hand their requests to it.
+
+    pyttsx3 can only synthesize to a file, so it writes straight into the
+    audio cache's staging file rather than returning bytes.
+    """
+
+    name = 'pyttsx3'
+    extension = '.wav'
+    mimetype = 'audio/wav'
+
+    # pyttsx3 reports rate in words per minute; 1.0 maps to its default
+    BASE_WORDS_PER_MINUTE = 175
+
+    def __init__(self):
+        try:
+            import pyttsx3
+        except ImportError:
+            raise RuntimeError("pyttsx3 is not installed")
+        self._requests: "queue.Queue[Tuple[str, str, float, str, Future]]" = queue.Queue()
+        ready = Future()
+        threading.Thread(target=self._run, args=(pyttsx3, ready), name='tts-pyttsx3', daemon=True).start()
+        ready.result()  # Re-raises an engine init failure here
+
+    def _run(self, pyttsx3, ready: Future):
+        try:
+            engine = pyttsx3.init()
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+
+        while True:
+            text, voice, rate, path, result = self._requests.get()
+            try:
+                self._select_voice(engine, voice)
+                engine.setProperty('rate', int(self.BASE_WORDS_PER_MINUTE * rate))
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+                result.set_result(path)
+            except Exception as e:
+                result.set_exception(e)
+
+    @staticmethod
+    def _select_voice(engine, voice: str):
+        for candidate in engine.getProperty('voices') or []:
+            languages = [str(lang).lower() for lang in (getattr(candidate, 'languages', None) or [])]
+            if voice and (voice == candidate.id or any(voice.lower() in lang for lang in languages)):
+                engine.setProperty('voice', candidate.id)
+                return
+
+    def synthesize_to_file(self, text: str, voice: str, rate: float, path: str):
+        result = Future()
+        self._requests.put((text, voice, rate, path, result))
+        result.result()
+
+
+TTS_BACKENDS = {
+    'gtts': GTTSBackend,
+    'pyttsx3': Pyttsx3Backend
+}
+
+AUDIO_MIMETYPES = {backend.extension: backend.mimetype for backend in TTS_BACKENDS.values()}
+
+
+class AudioCache:
+    """Directory of synthesized clips keyed by (text, voice, rate), capped at max_bytes.
+
+    Hits refresh a file's mtime, so eviction removes the least recently used clips.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(text: str, voice: str, rate: float) -> str:
+        return hashlib.sha256(f"{voice}\x00{rate:.3f}\x00{text}".encode('utf-8')).hexdigest()
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if os.path.splitext(filename)[1] in AUDIO_MIMETYPES:
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached clip for key, or None."""
+        for extension in AUDIO_MIMETYPES:
+            path = os.path.join(self.cache_dir, key + extension)
+            if os.path.exists(path):
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                with self._lock:
+                    self._stats['hits'] += 1
+                return path
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key: str, audio: bytes, extension: str) -> str:
+        """Store a clip atomically and evict old clips beyond max_bytes."""
+        def write(path):
+            with open(path, 'wb') as f:
+                f.write(audio)
+        return self.write(key, extension, write)
+
+    def write(self, key: str, extension: str, write_file) -> str:
+        """Store the clip write_file(path) produces; it writes a staging file in the cache directory.
+
+        The staging file is renamed over the final name once complete, so
+        readers never see a partial clip.
+        """
+        path = os.path.join(self.cache_dir, key + extension)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            write_file(temp_path)
+            size = os.path.getsize(temp_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        with self._lock:
+            # Re-synthesizing a cached key overwrites the clip: count only the size difference
+            try:
+                replaced_bytes = os.path.getsize(path)
+            except OSError:
+                replaced_bytes = 0
+            os.replace(temp_path, path)
+            self._total_bytes += size - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: str):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self._total_bytes -= size
+                self._stats['evictions'] += 1
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'cache_dir': self.cache_dir,
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                **self._stats,
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0
+            }
+
+
+class TextToSpeech:
+    """Cached synthesis over an ordered list of backends (first that works wins)."""
+
+    def __init__(self, backend_names: Iterable[str] = ('gtts', 'pyttsx3'), cache: Optional[AudioCache] = None,
+                 voice: str = DEFAULT_VOICE, rate: float = DEFAULT_RATE):
+        self.cache = cache or AudioCache()
+        self.voice = voice
+        self.rate = rate
+        self.backend_names = [name.strip().lower() for name in backend_names]
+        self._backends: Optional[List[TTSBackend]] = None  # Built on first use
+        self._backends_lock = threading.Lock()
+
+    @property
+    def backends(self) -> List[TTSBackend]:
+        if self._backends is None:
+            with self._backends_lock:
+                if self._backends is None:
+                    self._backends = self._create_backends()
+        return self._backends
+
+    def _create_backends(self) -> List[TTSBackend]:
+        backends = []
+        for name in self.backend_names:
+            if name not in TTS_BACKENDS:
+                logger.warning(f"⚠️ Unknown TTS backend '{name}' ignored")
+                continue
+            try:
+                backends.append(TTS_BACKENDS[name]())
+                logger.info(f"🔊 TTS backend available: {name}")
+            except Exception as e:
+                logger.warning(f"⚠️ TTS backend {name} unavailable: {e}")
+        return backends
+
+    @property
+    def available(self) -> bool:
+        return bool(self.backends)
+
+    def _cache_key(self, text: str, voice: Optional[str], rate: Optional[float]) -> Tuple[str, str, float, str]:
+        text = normalize_text(text)
+        voice = voice or self.voice
+        rate = self.rate if rate is None else float(rate)
+        return text, voice, rate, AudioCache.key(text, voice, rate)
+
+    def cached(self, text: str, voice: Optional[str] = None, rate: Optional[float] = None) -> Optional[str]:
+        """Path of the cached clip for text, or None - never synthesizes."""
+        return self.cache.get(self._cache_key(text, voice, rate)[3])
+
+    def synthesize(self, text: str, voice: Optional[str] = None, rate: Optional[float] = None) -> Tuple[str, bool]:
+        """Path of an audio file for text and whether it came from the cache.
+
+        Raises RuntimeError if no backend could synthesize it.
+        """
+        text, voice, rate, key = self._cache_key(text, voice, rate)
+        path = self.cache.get(key)
+        if path is not None:
+            return path, True
+
+        errors = []
+        for backend in self.backends:
+            try:
+                started = time.perf_counter()
+                path = self.cache.write(key, backend.extension,
+                                        lambda target: backend.synthesize_to_file(text, voice, rate, target))
+                logger.info(f"🔊 Synthesized '{text}' with {backend.name} in {(time.perf_counter() - started) * 1000:.0f}ms")
+                return path, False
+            except Exception as e:
+                errors.append(f"{backend.name}: {e}")
+                logger.warning(f"⚠️ TTS backend {backend.name} failed for '{text}': {e}")
+
+        raise RuntimeError("Speech generation failed (" + ("; ".join(errors) or "no TTS backend available") + ")")
+
+
+def audio_mimetype(path: str) -> str:
+    return AUDIO_MIMETYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
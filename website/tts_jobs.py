@@ -0,0 +1,139 @@
+"""Fixed-size worker pool for speech synthesis / playback jobs.
+
+Every TTS request used to start its own thread. Here a few long-lived workers
+drain a bounded queue instead:
+
+- Jobs carry a key (e.g. the normalized text). A request for a key that is
+  already queued or running shares that job's future instead of adding work.
+- When the queue is full, submit() raises SpeechQueueFull right away so the
+  endpoint can answer 429 instead of piling up threads.
+- Background work (startup precompute) is submitted at LOW_PRIORITY: workers
+  always take waiting user requests first. A user request that coalesces
+  with a queued low-priority job promotes it.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+NORMAL_PRIORITY = 0
+LOW_PRIORITY = 10
+
+
+class SpeechQueueFull(RuntimeError):
+    """Raised when the TTS job queue cannot take another job."""
+
+
+class _SpeechJob:
+    __slots__ = ('key', 'function', 'args', 'priority', 'future', 'enqueued_at', 'started')
+
+    def __init__(self, key: Hashable, function: Callable, args: Tuple, priority: int):
+        self.key = key
+        self.function = function
+        self.args = args
+        self.priority = priority
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.started = False  # A promoted job is queued twice; only the first pickup runs it
+
+
+class SpeechJobPool:
+    """Runs function(*args) jobs on `workers` threads, coalescing jobs by key."""
+
+    def __init__(self, workers: int = 2, max_queue_size: int = 32):
+        self.workers = max(1, workers)
+        # Entries are (priority, sequence, job): lower priority first, FIFO within a priority
+        self._queue: "queue.PriorityQueue[Tuple[int, int, _SpeechJob]]" = queue.PriorityQueue(
+            maxsize=max(1, max_queue_size))
+        self._sequence = itertools.count()
+        self._pending: Dict[Hashable, _SpeechJob] = {}  # Queued or running, by key
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0,
+            'max_queue_depth': 0,
+            'total_wait_ms': 0.0,
+            'total_job_ms': 0.0
+        }
+
+        for i in range(self.workers):
+            threading.Thread(target=self._run, name=f'tts-worker-{i}', daemon=True).start()
+
+    def submit(self, key: Hashable, function: Callable, *args, priority: int = NORMAL_PRIORITY) -> Tuple[Future, bool]:
+        """Queue function(*args) under key; returns (future, coalesced)."""
+        with self._lock:
+            job = self._pending.get(key)
+            if job is not None:
+                self._stats['coalesced'] += 1
+                if priority < job.priority and not job.started:
+                    # Someone is waiting for background work: queue it again at their priority
+                    job.priority = priority
+                    try:
+                        self._queue.put_nowait((priority, next(self._sequence), job))
+                    except queue.Full:
+                        pass  # Still runs from its original place in the queue
+                return job.future, True
+
+            job = _SpeechJob(key, function, args, priority)
+            try:
+                self._queue.put_nowait((priority, next(self._sequence), job))
+            except queue.Full:
+                self._stats['rejected'] += 1
+                raise SpeechQueueFull(f"TTS queue is full ({self._queue.maxsize} jobs)")
+
+            self._pending[key] = job
+            self._stats['submitted'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+            return job.future, False
+
+    def _run(self):
+        while True:
+            _, _, job = self._queue.get()
+            with self._lock:
+                if job.started:
+                    continue  # Second queue entry of a promoted job
+                job.started = True
+            started = time.perf_counter()
+            failed = False
+            try:
+                job.future.set_result(job.function(*job.args))
+            except Exception as e:
+                failed = True
+                logger.error(f"❌ TTS job {job.key!r} failed: {e}")
+                job.future.set_exception(e)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._pending.pop(job.key, None)
+                    self._stats['failed' if failed else 'completed'] += 1
+                    self._stats['total_wait_ms'] += (started - job.enqueued_at) * 1000
+                    self._stats['total_job_ms'] += (finished - started) * 1000
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            pending = len(self._pending)
+        finished = stats['completed'] + stats['failed']
+        return {
+            'workers': self.workers,
+            'queue_depth': self._queue.qsize(),
+            'max_queue_size': self._queue.maxsize,
+            'pending_jobs': pending,
+            'max_queue_depth': stats['max_queue_depth'],
+            'submitted': stats['submitted'],
+            'coalesced': stats['coalesced'],
+            'rejected': stats['rejected'],
+            'completed': stats['completed'],
+            'failed': stats['failed'],
+            'average_wait_ms': round(stats['total_wait_ms'] / finished, 2) if finished else 0,
+            'average_job_ms': round(stats['total_job_ms'] / finished, 2) if finished else 0
+        }